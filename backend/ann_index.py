@@ -0,0 +1,170 @@
+# backend/ann_index.py
+# Approximate nearest-neighbour (ANN) search over normalized job embeddings.
+# Uses an in-process HNSW graph (hnswlib) when it is installed, otherwise a pure NumPy
+# IVF index (k-means coarse clustering, probing only the closest clusters).
+# The exact brute-force search is kept alongside so recall can always be checked.
+
+import logging
+import os
+
+import numpy as np
+
+try:
+    import hnswlib
+except ImportError:  # Optional dependency: fall back to the NumPy IVF index
+    hnswlib = None
+
+logger = logging.getLogger(__name__)
+
+# Recall/latency knobs (higher = better recall, slower queries)
+ANN_HNSW_EF = int(os.environ.get('ANN_HNSW_EF', 64))
+ANN_IVF_NPROBE = int(os.environ.get('ANN_IVF_NPROBE', 8))
+# Below this many vectors an ANN index is not worth building; exact search is used instead
+ANN_MIN_VECTORS = int(os.environ.get('ANN_MIN_VECTORS', 1000))
+
+
+def _top_k(scores, top_k):
+    """
+    Returns (indices, scores) of the `top_k` highest scores, best first.
+    """
+    top_k = min(top_k, len(scores))
+    if top_k <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+    candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+    order = np.argsort(-scores[candidates], kind='stable')
+    best = candidates[order]
+    return best, scores[best]
+
+
+def exact_search(matrix, query, top_k):
+    """
+    Brute-force cosine search (rows and query are expected to be L2-normalized).
+
+    Returns:
+        tuple: (row indices, similarity scores), best first.
+    """
+    scores = np.asarray(matrix, dtype=np.float32) @ np.asarray(query, dtype=np.float32)
+    return _top_k(scores, top_k)
+
+
+def recall_at_k(approx_indices, exact_indices):
+    """
+    Fraction of the exact top-k results that the approximate search also returned.
+    """
+    exact = set(int(i) for i in exact_indices)
+    if not exact:
+        return 1.0
+    return len(exact & set(int(i) for i in approx_indices)) / len(exact)
+
+
+class IVFIndex:
+    """
+    Inverted-file index in pure NumPy.
+    Vectors are clustered with spherical k-means; a query is compared against the
+    centroids first and then only against the vectors of the `nprobe` closest clusters.
+    """
+
+    def __init__(self, matrix, n_lists=None, n_iter=10, seed=0):
+        self.matrix = np.asarray(matrix, dtype=np.float32)
+        n = self.matrix.shape[0]
+        self.n_lists = max(1, min(n, n_lists or int(np.sqrt(n))))
+        rng = np.random.default_rng(seed)
+        centroids = self.matrix[rng.choice(n, self.n_lists, replace=False)].copy()
+
+        for _ in range(n_iter):
+            assignment = np.argmax(self.matrix @ centroids.T, axis=1)
+            for c in range(self.n_lists):
+                members = self.matrix[assignment == c]
+                if len(members):
+                    centroid = members.mean(axis=0)
+                    norm = np.linalg.norm(centroid)
+                    centroids[c] = centroid / norm if norm else centroid
+
+        self.centroids = centroids
+        assignment = np.argmax(self.matrix @ centroids.T, axis=1)
+        self.lists = [np.flatnonzero(assignment == c) for c in range(self.n_lists)]
+
+    def search(self, query, top_k, nprobe=ANN_IVF_NPROBE):
+        query = np.asarray(query, dtype=np.float32)
+        nprobe = max(1, min(nprobe, self.n_lists))
+        closest_lists, _ = _top_k(self.centroids @ query, nprobe)
+        candidates = np.concatenate([self.lists[c] for c in closest_lists])
+        best, scores = _top_k(self.matrix[candidates] @ query, top_k)
+        return candidates[best], scores
+
+
+class HNSWIndex:
+    """
+    Thin wrapper around an hnswlib inner-product index.
+    """
+
+    def __init__(self, matrix, m=16, ef_construction=200):
+        matrix = np.asarray(matrix, dtype=np.float32)
+        self.size = matrix.shape[0]
+        self.index = hnswlib.Index(space='ip', dim=matrix.shape[1])
+        self.index.init_index(max_elements=self.size, ef_construction=ef_construction, M=m)
+        self.index.add_items(matrix, np.arange(self.size))
+
+    def search(self, query, top_k, ef=ANN_HNSW_EF):
+        top_k = min(top_k, self.size)
+        if top_k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        # ef must be at least top_k for hnswlib to return top_k results
+        self.index.set_ef(max(ef, top_k))
+        labels, distances = self.index.knn_query(np.asarray(query, dtype=np.float32), k=top_k)
+        # hnswlib's 'ip' distance is 1 - inner product
+        return labels[0].astype(np.int64), (1.0 - distances[0]).astype(np.float32)
+
+
+class JobAnnIndex:
+    """
+    Top-k search over a fixed set of job embeddings.
+
+    Args:
+        keys (list of str): Job keys, one per matrix row.
+        matrix (numpy.ndarray): (N, D) L2-normalized embeddings.
+        backend (str): 'auto' (HNSW if available, else IVF; exact for small sets),
+                       'hnsw', 'ivf' or 'exact'.
+    """
+
+    def __init__(self, keys, matrix, backend='auto'):
+        self.keys = list(keys)
+        self.matrix = np.asarray(matrix, dtype=np.float32)
+        if backend == 'auto':
+            if len(self.keys) < ANN_MIN_VECTORS:
+                backend = 'exact'
+            else:
+                backend = 'hnsw' if hnswlib is not None else 'ivf'
+        if backend == 'hnsw' and hnswlib is None:
+            logger.warning("hnswlib is not installed. Using the NumPy IVF index instead.")
+            backend = 'ivf'
+        self.backend = backend
+
+        self._index = None
+        if backend == 'hnsw':
+            self._index = HNSWIndex(self.matrix)
+        elif backend == 'ivf':
+            self._index = IVFIndex(self.matrix)
+
+    def search(self, query, top_k=10, ef=None, nprobe=None, exact=False):
+        """
+        Returns the `top_k` closest jobs to a normalized query vector.
+
+        Args:
+            ef (int, optional): HNSW search breadth (defaults to ANN_HNSW_EF).
+            nprobe (int, optional): IVF clusters to probe (defaults to ANN_IVF_NPROBE).
+            exact (bool): Force brute-force search, e.g. to measure recall.
+
+        Returns:
+            list of tuple: (key, cosine similarity), best first.
+        """
+        if exact or self._index is None:
+            rows, scores = exact_search(self.matrix, query, top_k)
+        elif self.backend == 'hnsw':
+            rows, scores = self._index.search(query, top_k, ef=ef or ANN_HNSW_EF)
+        else:
+            rows, scores = self._index.search(query, top_k, nprobe=nprobe or ANN_IVF_NPROBE)
+        return [(self.keys[row], float(score)) for row, score in zip(rows, scores)]
+
+    def __len__(self):
+        return len(self.keys)
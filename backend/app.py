@@ -3,27 +3,45 @@
 from flask import Flask, request, jsonify, send_from_directory
 from flask_cors import CORS
 import os
+import logging
+# Configure logging before the matcher modules are imported, so their load-time messages are kept
+from logging_config import configure_logging
+configure_logging()
 # Import both matching functions
-from match_percentage import calculate_semantic_match, calculate_skill_keyword_match
+from match_percentage import calculate_skill_keyword_match, calculate_skill_keyword_match_indexed, search_skill_keyword_match, preprocess_texts, warm_up
+from match_percentage import bulk_rank_jobs_semantic, bulk_semantic_match, get_stop_words, matching_keywords, resume_skill_sets, sync_catalogue_tfidf
+from job_index import JobIndex
+from bulk_match import BulkSkillMatcher
+from resume_pool import ResumeMatchPool, match_resume_file, extract_resume_file, MATCHER_PARALLEL_MIN_FILES
+from text_extraction import read_upload, ResumeTooLargeError
+from job_queue import JobQueue, QueueFullError
+from job_catalogue import JobCatalogue, default_job_source
+from response_utils import ndjson_response, parse_bool, parse_compact_options, shape_results
+from topjobs_scraper import TopJobsScraper
+from scraped_job_store import ScrapedJobStore, ScrapeScheduler, SCRAPE_INTERVAL_SECONDS
+from instrumentation import instrument_app, register_cache, render_metrics, stage, PROMETHEUS_CONTENT_TYPE
+from resume_cache import resume_cache
 from firebase_admin import credentials, db, initialize_app
 import firebase_admin
 from werkzeug.utils import secure_filename
-import docx2txt
-import PyPDF2
 from datetime import datetime
-import requests
-from bs4 import BeautifulSoup
+import multiprocessing
 import tempfile
-import traceback
+import threading
 import json # Import json for parsing the environment variable
 
+logger = logging.getLogger(__name__)
+
 app = Flask(__name__)
 # IMPORTANT: In production, replace 'http://localhost:3000' with your live frontend URL
 # For now, keep it flexible using an environment variable if you set one, or adjust later.
 # Ensure 'origins' correctly reflects your frontend's deployed URL for CORS.
 CORS(app, resources={r"/*": {"origins": os.environ.get("FRONTEND_URL", "http://localhost:3000")}}, supports_credentials=True)
+# Per-stage request timings (Server-Timing header) and metrics for /api/metrics.
+# INSTRUMENTATION=off disables them.
+instrument_app(app)
 
-UPLOAD_FOLDER = 'uploads/' # For temporary resume processing during matching
+UPLOAD_FOLDER = 'uploads/' # Spill directory for very large resumes during matching
 TEMP_FOLDER = 'temp_uploads/' # Not directly used in this flow, but kept for consistency
 # New folder for storing applied resumes locally
 LOCAL_RESUMES_FOLDER = 'local_resumes/'
@@ -37,7 +55,30 @@ os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 os.makedirs(TEMP_FOLDER, exist_ok=True)
 os.makedirs(LOCAL_RESUMES_FOLDER, exist_ok=True) # Create the new directory
 
-if not firebase_admin._apps:
+# Precomputed Required_Skills token sets for the Firebase job catalogue.
+# Jobs are only re-run through spaCy when their Required_Skills text changes.
+job_index = JobIndex()
+
+# Worker processes for bulk resume uploads to /api/matcher (started on first use)
+resume_match_pool = ResumeMatchPool()
+
+# Background queue for /api/matcher requests sent with async=true
+match_queue = JobQueue()
+
+# Upper bound on the number of resumes in one /api/match request
+BATCH_MATCH_MAX_RESUMES = int(os.environ.get('BATCH_MATCH_MAX_RESUMES', 500))
+
+# NLP models are loaded lazily. MATCHER_WARMUP controls loading them at startup:
+# 'background' (default) loads them in a thread so Flask can bind immediately,
+# 'blocking' loads them before serving, 'off' waits for the first request.
+MATCHER_WARMUP = os.environ.get('MATCHER_WARMUP', 'background').lower()
+
+def _init_firebase():
+    """
+    Initializes the Firebase Admin SDK (once per process).
+    """
+    if firebase_admin._apps:
+        return
     try:
         # Get Firebase Admin SDK config from environment variable for deployment
         firebase_config_json = os.environ.get('FIREBASE_ADMIN_SDK_CONFIG')
@@ -48,183 +89,98 @@ if not firebase_admin._apps:
             initialize_app(cred, {
                 'databaseURL': 'https://fyp-bbe4d-default-rtdb.asia-southeast1.firebasedatabase.app',
             })
-            print("Firebase Admin SDK initialized successfully from environment variable.")
+            logger.info("Firebase Admin SDK initialized successfully from environment variable.")
         else:
             # Fallback to local file for development if env var is not set
-            print("FIREBASE_ADMIN_SDK_CONFIG environment variable not found. Attempting to load from local file (for local dev only).")
+            logger.warning("FIREBASE_ADMIN_SDK_CONFIG environment variable not found. Attempting to load from local file (for local dev only).")
             # Ensure 'firebase-adminsdk.json' is in your .gitignore for production
             cred = credentials.Certificate("firebase-adminsdk.json")
             initialize_app(cred, {
                 'databaseURL': 'https://fyp-bbe4d-default-rtdb.asia-southeast1.firebasedatabase.app',
             })
-            print("Firebase Admin SDK initialized successfully from local file.")
+            logger.info("Firebase Admin SDK initialized successfully from local file.")
 
     except Exception as e:
-        print(f"Error initializing Firebase Admin SDK: {e}")
-        print("Please ensure 'firebase-adminsdk.json' exists locally or FIREBASE_ADMIN_SDK_CONFIG env var is set on your hosting platform.")
+        logger.error("Error initializing Firebase Admin SDK: %s", e)
+        logger.error("Please ensure 'firebase-adminsdk.json' exists locally or FIREBASE_ADMIN_SDK_CONFIG env var is set on your hosting platform.")
         # Depending on the severity, you might want to exit or handle gracefully
-        # For now, just print the error and let the app try to run.
+        # For now, just log the error and let the app try to run.
 
 # --- Helper Functions ---
 
-def extract_text(file_path):
-    """
-    Extracts text from PDF, DOCX, or TXT files.
-    """
-    if file_path.endswith('.pdf'):
-        try:
-            with open(file_path, 'rb') as f:
-                reader = PyPDF2.PdfReader(f)
-                text = ""
-                for page in reader.pages:
-                    text += page.extract_text() or ""
-                return text
-        except Exception as e:
-            print(f"Error extracting text from PDF {file_path}: {e}")
-            return ""
-    elif file_path.endswith('.docx'):
-        try:
-            return docx2txt.process(file_path)
-        except Exception as e:
-            print(f"Error extracting text from DOCX {file_path}: {e}")
-            return ""
-    elif file_path.endswith('.txt'):
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return f.read()
-        except Exception as e:
-            print(f"Error extracting text from TXT {file_path}: {e}")
-            return ""
-    return ""
+# Cached snapshot of the Firebase 'jobs' tree (or of JOBS_LOCAL_PATH when set),
+# refreshed in the background after JOBS_CACHE_TTL or kept current with JOBS_LISTEN
+job_catalogue = JobCatalogue(default_job_source())
 
 def get_all_jobs_from_firebase():
     """
     Retrieves all job vacancies from Firebase Realtime Database.
+    Served from `job_catalogue`, so the tree is not downloaded on every call. The jobs
+    are read-only and shared between requests; copy one (`dict(job)`) before changing it.
     """
-    try:
-        ref = db.reference('jobs')
-        jobs_data = ref.get()
-        job_list = []
-        if jobs_data:
-            for key, value in jobs_data.items():
-                value["Job_ID"] = key
-                job_list.append(value)
-        return job_list
-    except Exception as e:
-        print(f"Error retrieving jobs from Firebase: {e}")
-        return []
+    return job_catalogue.get_jobs()
 
-def scrape_topjobs(url="https://www.topjobs.lk/"):
+def _sync_catalogue_job(job_id):
+    """
+    Returns whether `job_id` is a catalogue Job_ID. If it is, the catalogue TF-IDF model
+    is synced first, so the semantic fallback can score the job without refitting.
     """
-    Scrapes IT-related job listings from TopJobs.lk.
-    NOTE: This is a basic example and highly dependent on the website's HTML structure.
+    jobs = get_all_jobs_from_firebase()
+    if not any(job.get("Job_ID") == job_id for job in jobs):
+        return False
+    sync_catalogue_tfidf(jobs)
+    return True
+
+# Pooled session, concurrent detail fetches, HTTP cache and per-host rate limit
+# (TOPJOBS_BASE_URL / SCRAPER_* settings, see topjobs_scraper.py)
+topjobs_scraper = TopJobsScraper()
+
+def scrape_topjobs(url=None):
+    """
+    Scrapes IT-related job listings from TopJobs.lk (TOPJOBS_BASE_URL by default).
+    NOTE: This is highly dependent on the website's HTML structure.
     It may break if the website changes.
     """
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    jobs = []
-    try:
-        # You might need a specific URL or search query for IT jobs on TopJobs.lk
-        # Example for IT jobs: url = "https://www.topjobs.lk/job-search/it-software-jobs" (hypothetical)
-        # Always check the actual URL for IT jobs on topjobs.lk
-        response = requests.get(url, headers=headers, timeout=15) # Increased timeout
-        response.raise_for_status() # Raise HTTPError for bad responses (4xx or 5xx)
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        # --- IMPORTANT: These selectors are examples. You MUST inspect TopJobs.lk's HTML ---
-        # Use more specific selectors if possible. Look for common patterns like:
-        # <div class="job-card">, <li class="job-listing">, <a class="job-title-link">
-
-        # Example: Try to find a common container for all job listings
-        # This is a generic search; replace with actual class/id from topjobs.lk
-        job_listings_container = soup.find('div', class_='job-list-container') # Hypothetical container class
-        if not job_listings_container:
-            job_listings_container = soup # Fallback to entire soup if container not found
-            print("Job listings container not found, searching entire page. This might be less accurate.")
-
-        # Look for individual job cards/elements within the container
-        # Example: div class="job-item" or article class="job-post"
-        # Adjust 'div' and class name based on actual HTML
-        job_cards = job_listings_container.find_all('div', class_=lambda x: x and 'job-card' in x.lower()) # Generic search for "job-card"
-
-        if not job_cards:
-            print("No specific job cards found. Trying broader search for common job elements.")
-            # Broader search if specific job-card class is not found
-            job_cards = soup.find_all(['div', 'li', 'article'], class_=lambda x: x and ('job' in x.lower() or 'listing' in x.lower() or 'post' in x.lower()))
-
-        if not job_cards:
-            print("Still no job cards found. Scraping might not be possible with current selectors.")
-            return []
-
-        for card in job_cards[:15]: # Limit to first 15 for demonstration/rate limiting
-            job_title = 'N/A'
-            company_name = 'N/A'
-            job_description = 'No description available.'
-            job_url = url # Default to base URL if no link found
-            required_skills = 'N/A' # Initialize required_skills for scraped jobs
-
-            # Attempt to find common elements for title, company, description, and link
-            # Adjust these selectors based on actual TopJobs.lk HTML structure
-            title_tag = card.find(['h2', 'h3', 'a'], class_=lambda x: x and ('title' in x.lower() or 'job-title' in x.lower()))
-            company_tag = card.find(['span', 'p', 'div'], class_=lambda x: x and ('company' in x.lower() or 'employer' in x.lower()))
-            description_tag = card.find(['div', 'p'], class_=lambda x: x and ('description' in x.lower() or 'summary' in x.lower()))
-            link_tag = card.find('a', href=True)
-            # Attempt to find skills (often in a specific div or list)
-            skills_tag = card.find(['div', 'ul', 'p'], class_=lambda x: x and ('skills' in x.lower() or 'requirements' in x.lower()))
-
-
-            if title_tag:
-                job_title = title_tag.get_text(strip=True)
-            if company_tag:
-                company_name = company_tag.get_text(strip=True)
-            if description_tag:
-                job_description = description_tag.get_text(separator=' ', strip=True)
-            if skills_tag:
-                required_skills = skills_tag.get_text(separator=', ', strip=True) # Extract skills
-            if link_tag:
-                job_url = link_tag['href']
-                if not job_url.startswith('http'): # Make sure URL is absolute
-                    job_url = requests.compat.urljoin(url, job_url) # Construct full URL
-
-            # Attempt to fetch full description if link is available and description is short
-            if job_url and len(job_description) < 100 and job_url.startswith('http'):
-                try:
-                    detail_response = requests.get(job_url, headers=headers, timeout=5)
-                    detail_response.raise_for_status()
-                    detail_soup = BeautifulSoup(detail_response.text, 'html.parser')
-                    # Find a common container for job details on the detail page
-                    full_desc_tag = detail_soup.find('div', class_=lambda x: x and ('job-details-content' in x.lower() or 'job-description-full' in x.lower()))
-                    if full_desc_tag:
-                        job_description = full_desc_tag.get_text(separator=' ', strip=True)
-                    # Also try to find more skills on the detail page
-                    full_skills_tag = detail_soup.find(['div', 'ul', 'p'], class_=lambda x: x and ('skills' in x.lower() or 'requirements' in x.lower()))
-                    if full_skills_tag and required_skills == 'N/A': # Only update if not found previously
-                        required_skills = full_skills_tag.get_text(separator=', ', strip=True)
-                except Exception as detail_e:
-                    print(f"Could not fetch full description for {job_url}: {detail_e}")
-
-            # Filter for IT-related jobs (basic keyword check on title/description/skills)
-            it_keywords = ['it', 'software', 'developer', 'engineer', 'programmer', 'analyst', 'data science', 'cybersecurity', 'network', 'cloud', 'devops', 'qa', 'ux', 'ui']
-            combined_job_text_for_filter = (job_title + " " + job_description + " " + required_skills).lower()
-            if any(keyword in combined_job_text_for_filter for keyword in it_keywords):
-                jobs.append({
-                    "Job_ID": f"topjobs_{hash(job_url)}", # Generate a unique ID based on URL
-                    "Job_Title": job_title,
-                    "Company_Name": company_name,
-                    "Job_Description": job_description,
-                    "Required_Skills": required_skills, # Include extracted skills
-                    "Job_URL": job_url,
-                    "Source": "TopJobs.lk"
-                })
-
-    except requests.exceptions.RequestException as e:
-        print(f"Error during web scraping (network/HTTP issue): {e}")
-        return []
-    except Exception as e:
-        print(f"An unexpected error occurred during scraping: {e}")
-        return []
-    return jobs
+    return topjobs_scraper.scrape(url)
+
+# Scraped jobs are stored (deduplicated by their stable Job_ID) and refreshed by a
+# background scheduler every SCRAPE_INTERVAL_SECONDS; requests only read the store
+scraped_job_store = ScrapedJobStore()
+scrape_scheduler = ScrapeScheduler(scrape_topjobs, scraped_job_store)
+
+# Hit rates reported on /api/metrics
+def _resume_cache_counts():
+    stats = resume_cache.stats()
+    return stats["hits"] + stats["disk_hits"], stats["misses"]
+
+register_cache('resume', _resume_cache_counts)
+register_cache('scraper_http', lambda: (topjobs_scraper.cache.hits, topjobs_scraper.cache.misses))
+
+_services_lock = threading.Lock()
+_services_started = False
+
+def start_background_services():
+    """
+    Initializes Firebase, starts loading the NLP models (see MATCHER_WARMUP) and starts
+    the scrape scheduler, once per process.
+    Does nothing in child processes: resume pool workers started with 'spawn' re-import
+    the main script (this file, with `python app.py`), and must not get their own
+    Firebase client, model warm-up thread or TopJobs scraper.
+    """
+    global _services_started
+    if multiprocessing.parent_process() is not None:
+        return
+    with _services_lock:
+        if _services_started:
+            return
+        _services_started = True
+    _init_firebase()
+    if MATCHER_WARMUP == 'blocking':
+        warm_up()
+    elif MATCHER_WARMUP == 'background':
+        threading.Thread(target=warm_up, name="matcher-warm-up", daemon=True).start()
+    if SCRAPE_INTERVAL_SECONDS > 0:
+        scrape_scheduler.start()
 
 # --- Routes ---
 
@@ -232,10 +188,19 @@ def scrape_topjobs(url="https://www.topjobs.lk/"):
 def get_jobs():
     """
     API endpoint to fetch all available job vacancies from Firebase.
+    Responses carry an ETag; clients sending it back in If-None-Match get
+    304 Not Modified while the catalogue is unchanged.
     """
     try:
-        jobs = get_all_jobs_from_firebase()
-        return jsonify(jobs)
+        jobs, etag = job_catalogue.snapshot()
+        if etag and request.if_none_match.contains(etag):
+            response = app.response_class(status=304)
+        else:
+            response = jsonify(jobs)
+        if etag:
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = 'no-cache'
+        return response
     except Exception as e:
         return jsonify({"message": f"Error fetching jobs: {str(e)}"}), 500
 
@@ -246,67 +211,176 @@ def match_resume():
     This endpoint is now updated to primarily use skill-based matching if
     'required_skills' is provided, otherwise falls back to semantic matching
     with the full job description.
+    With the form field 'async' set to "true", the files are queued and the response
+    is 202 with a job ID; progress and results are then polled from
+    /api/matcher/jobs/<job_id>.
+
+    Optional form fields to keep responses small:
+        include_text: "false" leaves the extracted resume text out of each result
+        top_k: only return the best `top_k` resumes (sorted by match_percentage)
+        offset / limit: return one page of the results
+        fields: comma-separated result fields to return, e.g. "filename,match_percentage"
+        format: "ndjson" streams one {"type": "result", "data": ...} line per result, then one
+                {"type": "error", "data": ...} line per failed file
+                (also chosen by Accept: application/x-ndjson)
     """
     resumes = request.files.getlist("resumes")
     job_description = request.form.get("job_description", "")
     job_required_skills = request.form.get("required_skills", "") # New field for specific skills
+    job_id = request.form.get("job_id") or None # Optional, lets the job's embedding (or catalogue TF-IDF vector) be reused across requests
+    run_async = request.form.get("async", "").lower() in ("true", "1", "yes")
+    include_text = parse_bool(request.form.get("include_text"), default=True)
+    try:
+        options = parse_compact_options(request.form, request)
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+    try:
+        top_k = request.form.get("top_k")
+        top_k = int(top_k) if top_k else None
+    except ValueError:
+        return jsonify({"message": "top_k must be an integer"}), 400
+    if top_k is not None and top_k < 0:
+        return jsonify({"message": "top_k must not be negative"}), 400
 
     if not resumes:
         return jsonify({"message": "No resume files provided"}), 400
 
+    # Bulk uploads fan out over the worker pool; small ones stay in the request thread.
+    # The form field 'parallel' ("true"/"false") overrides the automatic choice.
+    parallel_flag = request.form.get("parallel", "").lower()
+    if parallel_flag in ("true", "1", "yes"):
+        use_pool = True
+    elif parallel_flag in ("false", "0", "no"):
+        use_pool = False
+    else:
+        use_pool = len(resumes) >= MATCHER_PARALLEL_MIN_FILES and resume_match_pool.workers > 1
+
     results = []
+    errors = []
+    uploads = [] # UploadedResume for every file that was read successfully
+    queued = False # Once queued, the background job owns (and cleans up) the uploads
 
-    for file in resumes:
-        filename = secure_filename(file.filename)
-        save_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        resume_text = "" # Initialize resume_text
-        
+    try:
+        # 1. Read the files straight from the request (only very large ones are spilled to disk)
+        for file in resumes:
+            filename = secure_filename(file.filename)
+            try:
+                uploads.append(read_upload(file.stream, filename, spool_dir=app.config['UPLOAD_FOLDER']))
+            except ResumeTooLargeError as e:
+                logger.warning("Rejected file %s: %s", filename, e)
+                errors.append({"filename": filename, "error": str(e)})
+            except Exception as e:
+                logger.exception("Error reading file %s: %s", filename, e)
+                errors.append({"filename": filename, "error": f"Could not read file: {e}"})
+
+        # A catalogue job is scored with the catalogue TF-IDF model when the fallback runs
+        catalogue = bool(job_id and job_description and not job_required_skills) and _sync_catalogue_job(job_id)
+        tasks = [(upload.filename, upload.source, job_description, job_required_skills, job_id, catalogue) for upload in uploads]
+
+        if run_async:
+            def run_matching(job):
+                try:
+                    for task, outcome in _iter_match_outcomes(tasks, use_pool, chunk_size=resume_match_pool.workers):
+                        result, error = outcome
+                        if result is not None:
+                            if not include_text:
+                                result.pop("text", None)
+                            job.add_result(result)
+                        else:
+                            job.add_error({"filename": task[0], "error": error or "Could not extract text"})
+                finally:
+                    for upload in uploads:
+                        upload.cleanup()
+
+            try:
+                job = match_queue.submit(run_matching, total=len(resumes))
+            except QueueFullError as e:
+                return jsonify({"message": f"Matching queue is full, try again later ({e})"}), 503
+            queued = True
+            for error in errors:
+                job.add_error(error)
+            return jsonify({
+                "job_id": job.id,
+                "status": job.status,
+                "status_url": f"/api/matcher/jobs/{job.id}",
+            }), 202
+
+        # 2. Extract text and perform matching
+        for task, (result, error) in _iter_match_outcomes(tasks, use_pool):
+            if result is not None:
+                results.append(result)
+            elif error:
+                errors.append({"filename": task[0], "error": error})
+    finally:
+        # Remove any spill files
+        if not queued:
+            for upload in uploads:
+                upload.cleanup()
+
+    if not include_text:
+        for result in results:
+            result.pop("text", None)
+    if top_k is not None:
+        results = sorted(results, key=lambda x: x["match_percentage"], reverse=True)[:top_k]
+    return _list_response({}, results, options, errors=errors)
+
+def _list_response(body, results, options, errors=None):
+    """
+    Builds a list response: `body` plus the paginated and projected `results`
+    (and `errors`), either as one JSON document or streamed as NDJSON.
+    """
+    page = shape_results(results, options)
+    if options["ndjson"]:
+        return ndjson_response(page, errors=errors)
+    response = dict(body)
+    response["results"] = page
+    if options["offset"] or options["limit"] is not None:
+        response["total"] = len(results)
+        response["offset"] = options["offset"]
+    if errors:
+        response["errors"] = errors
+    return jsonify(response)
+
+def _iter_match_outcomes(tasks, use_pool, chunk_size=None):
+    """
+    Yields (task, (result, error)) for every /api/matcher task, in order.
+    With the pool, `chunk_size` files are sent at a time (all at once if None), so a
+    queued job can report progress while its batch is running.
+    """
+    if use_pool:
+        chunk_size = chunk_size or len(tasks) or 1
+        for start in range(0, len(tasks), chunk_size):
+            chunk = tasks[start:start + chunk_size]
+            yield from zip(chunk, resume_match_pool.match_files(chunk))
+        return
+    for task in tasks:
         try:
-            # 1. Save the file
-            file.save(save_path)
-            print(f"File '{filename}' saved to '{save_path}'")
-
-            # 2. Extract text
-            resume_text = extract_text(save_path)
-
-            if not resume_text:
-                print(f"Warning: Could not extract text from {filename}. Skipping matching for this file.")
-            else:
-                # 3. Perform matching
-                percentage = 0
-                keywords = []
-
-                if job_required_skills:
-                    percentages, matched_keywords = calculate_skill_keyword_match(resume_text, [job_required_skills])
-                    percentage = percentages[0] if percentages else 0
-                    keywords = matched_keywords[0] if matched_keywords else []
-                elif job_description:
-                    percentages, matched_keywords = calculate_semantic_match(resume_text, [job_description])
-                    percentage = percentages[0] if percentages else 0
-                    keywords = matched_keywords[0] if matched_keywords else []
-                else:
-                    print(f"Warning: No job description or required skills provided for matching {filename}.")
-
-                results.append({
-                    "filename": filename,
-                    "text": resume_text,
-                    "match_percentage": round(percentage, 2),
-                    "matched_keywords": keywords
-                })
+            outcome = (match_resume_file(*task), None)
         except Exception as e:
-            print(f"Error processing file {filename}: {e}")
-            traceback.print_exc() # Print full traceback for debugging
-        finally:
-            # Always attempt to remove the file, but check if it exists first
-            if os.path.exists(save_path):
-                try:
-                    os.remove(save_path)
-                    print(f"File '{save_path}' removed successfully.")
-                except Exception as e:
-                    print(f"Error removing file {save_path}: {e}")
-                    traceback.print_exc() # Print full traceback for debugging
+            logger.exception("Error processing file %s: %s", task[0], e)
+            outcome = (None, str(e))
+        yield task, outcome
 
-    return jsonify({"results": results})
+@app.route('/api/matcher/jobs/<job_id>', methods=['GET'])
+def get_matcher_job(job_id):
+    """
+    API endpoint to poll a queued /api/matcher job.
+    Returns its status ('queued', 'running', 'done' or 'failed'), progress and the
+    results finished so far. Pass ?include_results=false to only get the status;
+    offset, limit and fields page through and project the results.
+    """
+    job = match_queue.get(job_id)
+    if job is None:
+        return jsonify({"message": "Matching job not found or expired"}), 404
+    try:
+        options = parse_compact_options(request.args)
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+    include_results = parse_bool(request.args.get("include_results"), default=True)
+    status = job.to_dict(include_results=include_results)
+    if include_results:
+        status["results"] = shape_results(status["results"], options)
+    return jsonify(status)
 
 @app.route('/api/get_all_matched_jobs', methods=['POST'])
 def get_all_matched_jobs():
@@ -314,17 +388,47 @@ def get_all_matched_jobs():
     API endpoint to match a single resume text against a list of job vacancies.
     This endpoint now specifically uses `calculate_skill_keyword_match`
     referring only to the 'Required_Skills' section of jobs.
+
+    Optional JSON fields to keep responses small:
+        top_k / min_score: shortlist the best jobs (jobs sharing no skill score 0% and are
+                           only left out when min_score is above 0, whatever the job source)
+        offset / limit: return one page of the ranked results
+        fields: result fields to return, e.g. ["Job_ID", "Job_Title", "match_percentage"]
+        format: "ndjson" streams one {"type": "result", "data": <job>} line per job
+                (also chosen by Accept: application/x-ndjson)
+
+    Scraped jobs can be referenced by ID ("scraped_job_ids") instead of being sent in "jobList".
     """
     resume_text = request.json.get("resume_text", "")
     job_list_from_frontend = request.json.get("jobList", []) # Accept job list from frontend
+    scraped_job_ids = request.json.get("scraped_job_ids") # Jobs from the scraped job store
 
     if not resume_text:
         return jsonify({"message": "No resume text provided"}), 400
 
+    # Optional shortlist parameters: only the best `top_k` jobs / jobs scoring at least `min_score`
+    try:
+        top_k = request.json.get("top_k")
+        top_k = int(top_k) if top_k is not None else None
+        min_score = request.json.get("min_score")
+        min_score = float(min_score) if min_score is not None else None
+    except (TypeError, ValueError):
+        return jsonify({"message": "top_k must be an integer and min_score a number"}), 400
+    if top_k is not None and top_k < 0:
+        return jsonify({"message": "top_k must not be negative"}), 400
+    if scraped_job_ids is not None and not isinstance(scraped_job_ids, list):
+        return jsonify({"message": "scraped_job_ids must be a list"}), 400
+    # Optional response shaping: offset/limit, fields projection and NDJSON streaming
+    try:
+        options = parse_compact_options(request.json, request)
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    ad_hoc_jobs = bool(job_list_from_frontend or scraped_job_ids)
     jobs_to_match = []
-    if job_list_from_frontend:
+    if ad_hoc_jobs:
         # If jobs are provided by frontend (e.g., scraped jobs), use them
-        jobs_to_match = job_list_from_frontend
+        jobs_to_match = list(job_list_from_frontend) + scraped_job_store.get_many(scraped_job_ids or [])
     else:
         # Otherwise, fetch from Firebase (for resume-matcher page)
         jobs_to_match = get_all_jobs_from_firebase()
@@ -332,42 +436,295 @@ def get_all_matched_jobs():
     if not jobs_to_match:
         return jsonify({"message": "No job vacancies found to match against."}), 200
 
-    # Extract ONLY 'Required_Skills' text for matching
-    job_required_skills_texts = []
-    for job in jobs_to_match:
-        required_skills = job.get("Required_Skills", "")
-        job_required_skills_texts.append(required_skills)
+    matched_jobs_results = []
+    if ad_hoc_jobs:
+        # Ad-hoc job lists are not indexed: extract ONLY 'Required_Skills' text and preprocess it here
+        job_required_skills_texts = [job.get("Required_Skills", "") for job in jobs_to_match]
+        percentages, matching_words = calculate_skill_keyword_match(resume_text, job_required_skills_texts)
+
+        for i, job in enumerate(jobs_to_match):
+            current_percentage = percentages[i] if i < len(percentages) else 0
+            current_keywords = matching_words[i] if i < len(matching_words) else []
+            matched_jobs_results.append(_matched_job_result(job, current_percentage, current_keywords))
+
+        matched_jobs_results = sorted(matched_jobs_results, key=lambda x: x["match_percentage"], reverse=True)
+        if min_score is not None:
+            matched_jobs_results = [r for r in matched_jobs_results if r["match_percentage"] >= min_score]
+        if top_k is not None:
+            matched_jobs_results = matched_jobs_results[:top_k]
+    else:
+        # Firebase catalogue: only new or changed jobs get preprocessed, the rest is read from the index
+        job_index.sync(jobs_to_match, preprocess_texts)
+
+        if top_k is not None or min_score is not None:
+            # Shortlist straight from the inverted index; jobs with no shared skill are only
+            # walked when they are needed to fill top_k
+            jobs_by_id = {job.get("Job_ID", ""): job for job in jobs_to_match}
+            for job_id, percentage, keywords in search_skill_keyword_match(resume_text, job_index, top_k=top_k, min_score=min_score):
+                if job_id in jobs_by_id:
+                    matched_jobs_results.append(_matched_job_result(jobs_by_id[job_id], percentage, keywords))
+        else:
+            job_ids = [job.get("Job_ID", "") for job in jobs_to_match]
+            percentages, matching_words = calculate_skill_keyword_match_indexed(resume_text, job_index, job_ids)
+            for i, job in enumerate(jobs_to_match):
+                matched_jobs_results.append(_matched_job_result(job, percentages[i], matching_words[i]))
+            matched_jobs_results = sorted(matched_jobs_results, key=lambda x: x["match_percentage"], reverse=True)
 
-    # Perform skill-based matching
-    percentages, matching_words = calculate_skill_keyword_match(resume_text, job_required_skills_texts)
+    return _list_response({"message": "Matching jobs fetched successfully"}, matched_jobs_results, options)
 
-    matched_jobs_results = []
-    for i, job in enumerate(jobs_to_match):
-        current_percentage = percentages[i] if i < len(percentages) else 0
-        current_keywords = matching_words[i] if i < len(matching_words) else []
-
-        matched_jobs_results.append({
-            "Job_ID": job.get("Job_ID", ""),
-            "Job_Title": job.get("Job_Title", ""),
-            "Company_Name": job.get("Company_Name", ""),
-            "Job_Description": job.get("Job_Description", ""),
-            "Required_Skills": job.get("Required_Skills", ""),
-            "Education_Level": job.get("Education_Level", ""),
-            "Experience_Required": job.get("Experience_Required", ""),
-            "Location": job.get("Location", ""),
-            "Job_URL": job.get("Job_URL", ""), # Include Job_URL for scraped jobs
-            "Source": job.get("Source", "Firebase"), # Indicate source
-            "match_percentage": round(current_percentage, 2),
-            "matching_words": current_keywords,
-            "companyUserId": job.get("companyUserId", "") # Ensure this is passed for Firebase jobs
-        })
+def _matched_job_result(job, percentage, keywords):
+    """
+    Builds the response entry for one job in /api/get_all_matched_jobs.
+    """
+    return {
+        "Job_ID": job.get("Job_ID", ""),
+        "Job_Title": job.get("Job_Title", ""),
+        "Company_Name": job.get("Company_Name", ""),
+        "Job_Description": job.get("Job_Description", ""),
+        "Required_Skills": job.get("Required_Skills", ""),
+        "Education_Level": job.get("Education_Level", ""),
+        "Experience_Required": job.get("Experience_Required", ""),
+        "Location": job.get("Location", ""),
+        "Job_URL": job.get("Job_URL", ""), # Include Job_URL for scraped jobs
+        "Source": job.get("Source", "Firebase"), # Indicate source
+        "match_percentage": round(percentage, 2),
+        "matching_words": keywords,
+        "companyUserId": job.get("companyUserId", "") # Ensure this is passed for Firebase jobs
+    }
 
-    matched_jobs_results = sorted(matched_jobs_results, key=lambda x: x["match_percentage"], reverse=True)
+@app.route('/api/match', methods=['POST'])
+def batch_match():
+    """
+    API endpoint to match many resumes against many jobs in one request.
+    Resumes can be uploaded files ('resumes') and/or plain texts, given as a JSON body
+    {"resumes": [{"id": "...", "text": "..."}, ...]} or, in a multipart form, as a
+    'resume_texts' field holding the same JSON list.
+
+    Options (JSON fields, or form fields for multipart requests):
+        jobs: ad-hoc list of job dicts (JSON only); the Firebase catalogue is used otherwise
+        scraped_job_ids: Job_IDs from the scraped job store to match against (with or instead of 'jobs')
+        job_ids: only match these Job_IDs (a list, or comma-separated in a form)
+        mode: 'skills' (Required_Skills overlap, default) or 'semantic' (Job_Description embeddings)
+        search: for semantic 'top_k' output, 'exact' (brute force, default) or 'ann'
+                (approximate nearest-neighbour index over the job embeddings)
+        ef / nprobe: for search 'ann', the HNSW search breadth / IVF clusters to probe
+                     (higher is slower but closer to exact; server defaults if not given)
+        output: 'top_k' (best jobs per resume, default) or 'matrix' (every resume x job score)
+        top_k: jobs per resume for 'top_k' output (default 10)
+        min_score: minimum match percentage for 'top_k' output. In both modes, jobs scoring
+                   0 (no shared skill) are only left out when min_score is above 0
+    """
+    payload = request.get_json(silent=True) if request.is_json else request.form
+    payload = payload or {}
+    try:
+        options = _batch_match_options(payload)
+        resume_entries = _batch_resume_texts(payload)
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    files = request.files.getlist("resumes")
+    if not files and not resume_entries:
+        return jsonify({"message": "No resumes provided"}), 400
+    if len(files) + len(resume_entries) > BATCH_MATCH_MAX_RESUMES:
+        return jsonify({"message": f"At most {BATCH_MATCH_MAX_RESUMES} resumes can be matched per request"}), 400
+
+    errors = []
+    uploads = []
+    try:
+        for file in files:
+            filename = secure_filename(file.filename)
+            try:
+                uploads.append(read_upload(file.stream, filename, spool_dir=app.config['UPLOAD_FOLDER']))
+            except ResumeTooLargeError as e:
+                errors.append({"filename": filename, "error": str(e)})
+            except Exception as e:
+                logger.exception("Error reading file %s: %s", filename, e)
+                errors.append({"filename": filename, "error": f"Could not read file: {e}"})
+
+        # Text extraction fans out over the worker pool for bulk uploads
+        tasks = [(upload.filename, upload.source) for upload in uploads]
+        if len(tasks) >= MATCHER_PARALLEL_MIN_FILES and resume_match_pool.workers > 1:
+            outcomes = resume_match_pool.extract_files(tasks)
+        else:
+            outcomes = []
+            for task in tasks:
+                try:
+                    outcomes.append((extract_resume_file(*task), None))
+                except Exception as e:
+                    logger.exception("Error extracting text from %s: %s", task[0], e)
+                    outcomes.append((None, str(e)))
+    finally:
+        for upload in uploads:
+            upload.cleanup()
+
+    for upload, (text, error) in zip(uploads, outcomes):
+        if text:
+            resume_entries.append((upload.filename, text))
+        else:
+            errors.append({"filename": upload.filename, "error": error or "Could not extract text"})
 
-    return jsonify({
-        "message": "Matching jobs fetched successfully",
-        "results": matched_jobs_results
-    })
+    if options["jobs"] is not None or options["scraped_job_ids"] is not None:
+        jobs = (options["jobs"] or []) + scraped_job_store.get_many(options["scraped_job_ids"] or [])
+        indexed = False
+    else:
+        jobs = get_all_jobs_from_firebase()
+        indexed = True
+        # Sync the whole catalogue (before filtering) so no indexed job gets pruned
+        if options["mode"] == "skills":
+            job_index.sync(jobs, preprocess_texts)
+        else:
+            sync_catalogue_tfidf(jobs)
+    if options["job_ids"] is not None:
+        wanted = set(options["job_ids"])
+        jobs = [job for job in jobs if job.get("Job_ID") in wanted]
+    if not jobs:
+        return jsonify({"message": "No job vacancies found to match against."}), 200
+
+    response = _run_batch_match(resume_entries, jobs, indexed, options)
+    if errors:
+        response["errors"] = errors
+    return jsonify(response)
+
+def _batch_match_options(payload):
+    """
+    Reads and validates the /api/match options from a JSON body or form.
+    Raises ValueError with a message for the client on invalid input.
+    """
+    def field(name, default=None):
+        value = payload.get(name, default)
+        return default if value in (None, "") else value
+
+    mode = str(field("mode", "skills")).lower()
+    if mode not in ("skills", "semantic"):
+        raise ValueError("mode must be 'skills' or 'semantic'")
+    output = str(field("output", "top_k")).lower()
+    if output not in ("top_k", "matrix"):
+        raise ValueError("output must be 'top_k' or 'matrix'")
+    search = str(field("search", "exact")).lower()
+    if search not in ("exact", "ann"):
+        raise ValueError("search must be 'exact' or 'ann'")
+    try:
+        top_k = int(field("top_k", 10))
+        min_score = field("min_score")
+        min_score = float(min_score) if min_score is not None else None
+    except (TypeError, ValueError):
+        raise ValueError("top_k must be an integer and min_score a number")
+    if top_k < 0:
+        raise ValueError("top_k must not be negative")
+    try:
+        ann_knobs = {name: int(field(name)) if field(name) is not None else None for name in ("ef", "nprobe")}
+    except (TypeError, ValueError):
+        raise ValueError("ef and nprobe must be integers")
+    if any(value is not None and value < 1 for value in ann_knobs.values()):
+        raise ValueError("ef and nprobe must be at least 1")
+
+    jobs = payload.get("jobs") if request.is_json else None
+    if jobs is not None and not isinstance(jobs, list):
+        raise ValueError("jobs must be a list of job objects")
+
+    def id_list(name):
+        ids = field(name)
+        if isinstance(ids, str):
+            ids = [job_id.strip() for job_id in ids.split(",") if job_id.strip()]
+        if ids is not None and not isinstance(ids, list):
+            raise ValueError(f"{name} must be a list")
+        return ids
+
+    return {
+        "mode": mode, "output": output, "search": search, "top_k": top_k, "min_score": min_score, **ann_knobs,
+        "jobs": jobs, "job_ids": id_list("job_ids"), "scraped_job_ids": id_list("scraped_job_ids"),
+    }
+
+def _batch_resume_texts(payload):
+    """
+    Returns [(resume_id, text)] for the plain-text resumes of an /api/match request.
+    """
+    entries = payload.get("resumes") if request.is_json else payload.get("resume_texts")
+    if not entries:
+        return []
+    if isinstance(entries, str):
+        try:
+            entries = json.loads(entries)
+        except ValueError:
+            raise ValueError("resume_texts must be a JSON list")
+    if not isinstance(entries, list):
+        raise ValueError("resumes must be a list")
+
+    resume_texts = []
+    for i, entry in enumerate(entries):
+        if isinstance(entry, dict):
+            resume_id, text = entry.get("id") or f"text_{i}", entry.get("text", "")
+        else:
+            resume_id, text = f"text_{i}", entry
+        if not isinstance(text, str):
+            raise ValueError("Every resume text must be a string")
+        resume_texts.append((str(resume_id), text))
+    return resume_texts
+
+def _run_batch_match(resume_entries, jobs, indexed, options):
+    """
+    Scores every resume against every job for /api/match.
+    Skill matching uses one sparse matrix product over the whole batch (the catalogue's
+    matrix is cached by the job index); semantic matching encodes all resumes at once
+    against the stored job embeddings (ranked by brute force, or through the ANN index
+    with search='ann').
+
+    Args:
+        resume_entries (list of tuple): (resume_id, text) for each resume.
+        jobs (list of dict): The jobs to match against.
+        indexed (bool): Whether `jobs` come from the synced Firebase catalogue (job_index).
+        options (dict): As returned by `_batch_match_options`.
+
+    Returns:
+        dict: The response body.
+    """
+    resume_ids = [resume_id for resume_id, _ in resume_entries]
+    resume_texts = [text for _, text in resume_entries]
+    job_keys = [job.get("Job_ID") or f"job_{i}" for i, job in enumerate(jobs)]
+    jobs_by_key = dict(zip(job_keys, jobs))
+    top_k = options["top_k"]
+
+    if options["mode"] == "skills":
+        if indexed:
+            matcher = job_index.bulk_matcher([job.get("Job_ID") for job in jobs])
+        else:
+            job_skills_texts = [job.get("Required_Skills", "") for job in jobs]
+            matcher = BulkSkillMatcher([set(text.split()) for text in preprocess_texts(job_skills_texts)], job_keys)
+        resume_sets = resume_skill_sets(resume_texts)
+        if options["output"] == "matrix":
+            scores = matcher.score_matrix(resume_sets)
+            return {"mode": "skills", "resumes": resume_ids, "jobs": list(matcher.job_ids), "scores": scores.tolist()}
+        per_resume = matcher.top_k(resume_sets, top_k=top_k, min_score=options["min_score"], stop_words=get_stop_words())
+    else:
+        job_descriptions = [job.get("Job_Description", "") for job in jobs]
+        job_ids = [job.get("Job_ID") for job in jobs]
+        if options["output"] == "matrix":
+            scores = bulk_semantic_match(resume_texts, job_descriptions, job_ids, catalogue=indexed)
+            return {"mode": "semantic", "resumes": resume_ids, "jobs": job_keys, "scores": scores.tolist()}
+        ranked = bulk_rank_jobs_semantic(
+            resume_texts, job_descriptions, job_ids, top_k=top_k, min_score=options["min_score"], mode=options["search"],
+            ef=options["ef"], nprobe=options["nprobe"], catalogue=indexed,
+        )
+        per_resume = []
+        for text, row in zip(resume_texts, ranked):
+            keywords = matching_keywords(text, [job_descriptions[column] for column, _ in row])
+            per_resume.append([(job_keys[column], score, words) for (column, score), words in zip(row, keywords)])
+
+    results = []
+    for resume_id, matches in zip(resume_ids, per_resume):
+        results.append({
+            "resume_id": resume_id,
+            "matches": [
+                {
+                    "Job_ID": job_key,
+                    "Job_Title": jobs_by_key.get(job_key, {}).get("Job_Title", ""),
+                    "match_percentage": percentage,
+                    "matching_words": keywords,
+                }
+                for job_key, percentage, keywords in matches
+            ],
+        })
+    return {"mode": options["mode"], "results": results}
 
 @app.route('/api/apply', methods=['POST'])
 def apply_for_job():
@@ -406,11 +763,12 @@ def apply_for_job():
 
         # Save the file to the local directory
         resume_file.save(local_file_path)
-        print(f"Resume saved locally at: {local_file_path}")
+        logger.info("Resume saved locally at: %s", local_file_path)
 
         # 2. Save application data to Realtime Database
         applications_ref = db.reference('applications')
-        new_application_ref = applications_ref.push()
+        with stage('firebase'):
+            new_application_ref = applications_ref.push()
 
         application_data = {
             "jobId": job_id,
@@ -425,11 +783,11 @@ def apply_for_job():
             "resumeFileName": original_filename,
             "appliedAt": datetime.now().isoformat()
         }
-        new_application_ref.set(application_data)
+        with stage('firebase'):
+            new_application_ref.set(application_data)
         return jsonify({"message": "Application submitted successfully!", "applicationId": new_application_ref.key}), 200
     except Exception as e:
-        print(f"Error submitting application: {e}")
-        traceback.print_exc()
+        logger.exception("Error submitting application: %s", e)
         return jsonify({"message": f"Failed to submit application: {str(e)}"}), 500
 
 # New endpoint to serve locally stored resumes (optional, for viewing/downloading)
@@ -444,24 +802,50 @@ def serve_resume(filename):
     except FileNotFoundError:
         return jsonify({"message": "Resume file not found"}), 404
     except Exception as e:
-        print(f"Error serving resume file: {e}")
+        logger.error("Error serving resume file: %s", e)
         return jsonify({"message": f"Error serving file: {str(e)}"}), 500
 
 
 @app.route('/api/scrape-topjobs', methods=['GET'])
 def get_topjobs_listings():
     """
-    API endpoint to scrape IT job listings from TopJobs.lk.
+    API endpoint to get the IT job listings scraped from TopJobs.lk.
+    Jobs are served from the scraped job store, which the background scheduler keeps
+    up to date. '?refresh=true' asks for a new scrape (in the background) as well.
+    The response always has "jobs" (empty until the first scrape has finished) and
+    "refreshing", which stays true while a scrape is running; clients poll until it is false.
     """
     try:
-        jobs = scrape_topjobs()
+        refreshing = parse_bool(request.args.get("refresh"))
+        jobs = scraped_job_store.all_jobs()
+        if not jobs:
+            refreshing = True # Nothing stored yet: scrape now instead of waiting for the schedule
+        if refreshing:
+            scrape_scheduler.trigger()
         if jobs:
-            return jsonify({"message": "TopJobs listings scraped successfully", "jobs": jobs}), 200
+            message = "TopJobs listings scraped successfully"
         else:
-            return jsonify({"message": "Could not scrape TopJobs listings or no IT jobs found."}), 200
+            message = "No TopJobs listings scraped yet. A scrape is running, try again shortly."
+        return jsonify({
+            "message": message,
+            "jobs": jobs,
+            "scraped_at": scraped_job_store.get_meta('last_scrape_at'),
+            "refreshing": refreshing or scrape_scheduler.running,
+        }), 200
     except Exception as e:
-        print(f"Error in /api/scrape-topjobs endpoint: {e}")
-        return jsonify({"message": f"Failed to scrape TopJobs listings: {str(e)}"}), 500
+        logger.error("Error in /api/scrape-topjobs endpoint: %s", e)
+        return jsonify({"message": f"Failed to get TopJobs listings: {str(e)}"}), 500
+
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """
+    API endpoint exposing per-stage and per-endpoint latency histograms and cache
+    hit rates in the Prometheus text format (for this worker process).
+    """
+    return app.response_class(render_metrics(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+# Runs both for `python app.py` and when a WSGI server imports app:app
+start_background_services()
 
 if __name__ == '__main__':
     app.run(debug=True, port=5000)
@@ -0,0 +1,312 @@
+# backend/benchmarks/bench_matching.py
+# Benchmark harness for the matching pipeline on synthetic corpora (benchmarks/corpus.py).
+# Per-resume stages (text extraction, PII filtering, preprocessing, key information) run
+# once; matching stages run against catalogues of each requested size (100, 1k, 10k jobs
+# by default). Every stage reports latency percentiles, throughput and the tracemalloc
+# peak of one call, and the results are saved as JSON so runs on different commits can
+# be compared with --compare (exit code 1 when a stage got slower than the threshold).
+#
+# Usage (from backend/):
+#     python benchmarks/bench_matching.py                      # all stages, 100/1k/10k jobs
+#     python benchmarks/bench_matching.py --scales 100,1000 --stages skill_keyword_match
+#     python benchmarks/bench_matching.py --compare old.json   # run, then compare with old.json
+#     python benchmarks/bench_matching.py --compare old.json new.json   # only compare
+#
+# The NLP models used are whatever the environment provides (spaCy/NLTK, the sentence
+# model or the TF-IDF fallback); they are recorded in the results' "meta" section.
+# The embedding store, TF-IDF model, job index and resume cache are pointed at a temporary
+# directory (removed at exit), so a run neither reads nor writes the app's caches.
+
+import argparse
+import atexit
+import datetime
+import json
+import logging
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Must be set before the backend modules are imported, as they read them at import time
+STORE_DIR = tempfile.mkdtemp(prefix='bench_matching-')
+atexit.register(shutil.rmtree, STORE_DIR, ignore_errors=True)
+os.environ['EMBEDDING_STORE_DIR'] = os.path.join(STORE_DIR, 'embeddings')
+os.environ['TFIDF_MODEL_PATH'] = os.path.join(STORE_DIR, 'tfidf_model.pkl')
+os.environ['JOB_INDEX_PATH'] = os.path.join(STORE_DIR, 'job_index.json')
+os.environ['RESUME_CACHE_DIR'] = os.path.join(STORE_DIR, 'resume_cache')
+
+import numpy as np
+
+import corpus
+import match_percentage
+from job_index import JobIndex
+from resume_cache import resume_cache
+from text_extraction import extract_text
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BENCHMARKS_DIR, 'results')
+RESULTS_FORMAT_VERSION = 1
+
+# Stages that only depend on the resume, and stages that match against a job catalogue
+RESUME_STAGES = ['extract_text', 'filter_pii', 'preprocess_text', 'extract_key_information']
+MATCH_STAGES = ['skill_keyword_match', 'skill_keyword_match_indexed', 'bulk_skill_keyword_match', 'semantic_match', 'tfidf_fallback']
+
+
+def percentile(values, q):
+    return float(np.percentile(values, q)) if values else 0.0
+
+
+def max_rss_kib():
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage // 1024 if sys.platform == 'darwin' else usage  # bytes on macOS, KiB on Linux
+
+
+def run_stage(name, jobs, function, inputs, warm_up_input, peak_input, items_per_call=1, setup=None):
+    """
+    Times `function(input)` for every input.
+    The resume cache (memory and disk) is cleared first, then one warm-up call loads the
+    models and fills the catalogue-side caches (job analyses, embeddings, TF-IDF fit). The timed inputs
+    have not been seen before, so every timed call does the full per-resume work.
+
+    Args:
+        name (str): Stage name.
+        jobs (int or None): Catalogue size (None for per-resume stages).
+        function (callable): Runs one call of the stage for an input.
+        inputs (list): One timed call per input.
+        warm_up_input, peak_input: Inputs for the warm-up call and the tracemalloc call.
+        items_per_call (int): Resumes processed per call, for the throughput.
+        setup (callable, optional): Run once before the warm-up (not timed).
+
+    Returns:
+        dict: The stage's result record.
+    """
+    resume_cache.clear(disk=True)
+    if setup is not None:
+        setup()
+    started = time.perf_counter()
+    function(warm_up_input)
+    warm_up_ms = (time.perf_counter() - started) * 1000
+
+    timings = []
+    for item in inputs:
+        started = time.perf_counter()
+        function(item)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    tracemalloc.start()
+    function(peak_input)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    total_seconds = sum(timings) / 1000
+    record = {
+        "stage": name,
+        "jobs": jobs,
+        "calls": len(timings),
+        "items_per_call": items_per_call,
+        "warm_up_ms": round(warm_up_ms, 3),
+        "mean_ms": round(sum(timings) / len(timings), 3),
+        "p50_ms": round(percentile(timings, 50), 3),
+        "p90_ms": round(percentile(timings, 90), 3),
+        "p95_ms": round(percentile(timings, 95), 3),
+        "p99_ms": round(percentile(timings, 99), 3),
+        "max_ms": round(max(timings), 3),
+        "throughput_per_s": round(len(timings) * items_per_call / total_seconds, 2) if total_seconds else None,
+        "peak_tracemalloc_kib": round(peak / 1024, 1),
+        "max_rss_kib": max_rss_kib(),
+    }
+    scale = f"{jobs} jobs" if jobs is not None else "per resume"
+    print(f"  {name:<28} {scale:>12}  p50 {record['p50_ms']:>10.2f} ms  p95 {record['p95_ms']:>10.2f} ms  "
+          f"{record['throughput_per_s'] or 0:>10.1f}/s  peak {record['peak_tracemalloc_kib']:>9.1f} KiB", flush=True)
+    return record
+
+
+def resume_stages(stages, resumes, extra):
+    """
+    Runs the per-resume stages. `extra` holds two resumes for the warm-up and peak calls.
+    """
+    results = []
+    if 'extract_text' in stages:
+        files = corpus.resume_files(resumes)
+        extra_files = corpus.resume_files(extra[:2])
+        results.append(run_stage('extract_text', None, lambda f: extract_text(f[1], f[0]), files, extra_files[0], extra_files[1]))
+    per_resume = {
+        'filter_pii': match_percentage.filter_pii,
+        'preprocess_text': match_percentage.preprocess_text,
+        'extract_key_information': match_percentage.extract_key_information,
+    }
+    for name, function in per_resume.items():
+        if name in stages:
+            results.append(run_stage(name, None, function, resumes, extra[0], extra[1]))
+    return results
+
+
+def match_stages(stages, resumes, extra, jobs, batch_size):
+    """
+    Runs the matching stages against `jobs`. `extra` holds 2 * batch_size resumes
+    for the warm-up and peak calls.
+    """
+    results = []
+    count = len(jobs)
+    job_ids = [job["Job_ID"] for job in jobs]
+    skills = [job["Required_Skills"] for job in jobs]
+    descriptions = [job["Job_Description"] for job in jobs]
+
+    def per_resume(name, function, setup=None):
+        if name in stages:
+            results.append(run_stage(name, count, function, resumes, extra[0], extra[1], setup=setup))
+
+    per_resume('skill_keyword_match', lambda text: match_percentage.calculate_skill_keyword_match(text, skills))
+    index = JobIndex(path='')
+    per_resume(
+        'skill_keyword_match_indexed', lambda text: match_percentage.calculate_skill_keyword_match_indexed(text, index, job_ids),
+        setup=lambda: index.sync(jobs, match_percentage.preprocess_texts),
+    )
+    if 'bulk_skill_keyword_match' in stages:
+        batches = [resumes[i:i + batch_size] for i in range(0, len(resumes), batch_size)]
+        results.append(run_stage(
+            'bulk_skill_keyword_match', count, lambda batch: match_percentage.bulk_skill_keyword_match(batch, skills, job_ids),
+            batches, extra[:batch_size], extra[batch_size:], items_per_call=len(resumes) / len(batches),
+        ))
+    per_resume('semantic_match', lambda text: match_percentage.calculate_semantic_match(text, descriptions, job_ids))
+    per_resume(
+        'tfidf_fallback', lambda text: match_percentage._tfidf_match_percentage_fallback(text, descriptions, job_ids, catalogue=True),
+        setup=lambda: match_percentage.catalogue_tfidf_model.sync(
+            job_ids, [analysis.preprocessed_text for analysis in match_percentage.analyze_documents(descriptions)], prune=True,
+        ),
+    )
+    return results
+
+
+def environment_meta(args):
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, cwd=BENCHMARKS_DIR, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "format_version": RESULTS_FORMAT_VERSION,
+        "commit": commit,
+        "created_at": datetime.datetime.now().isoformat(timespec='seconds'),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "nlp": "spacy" if match_percentage.get_nlp() is not None else "nltk",
+        "sentence_model": match_percentage.get_model() is not None,
+        "scales": args.scales,
+        "resumes": args.resumes,
+        "batch_size": args.batch_size,
+        "seed": args.seed,
+    }
+
+
+def run(args):
+    stages = args.stages
+    print(f"Generating {args.resumes} resumes (seed {args.seed})...", flush=True)
+    resumes = corpus.generate_resumes(args.resumes, seed=args.seed)
+    meta = environment_meta(args)
+    print(f"NLP: {meta['nlp']}, sentence model: {'yes' if meta['sentence_model'] else 'no (TF-IDF fallback)'}", flush=True)
+
+    # Resumes for the warm-up and tracemalloc calls, never part of the timed set
+    extra = corpus.generate_resumes(max(2, 2 * args.batch_size), seed=args.seed + 1)
+
+    results = resume_stages(stages, resumes, extra)
+    for scale in args.scales:
+        if not any(stage in MATCH_STAGES for stage in stages):
+            break
+        print(f"Matching against {scale} jobs...", flush=True)
+        jobs = corpus.generate_jobs(scale, seed=args.seed)
+        results.extend(match_stages(stages, resumes, extra, jobs, args.batch_size))
+    return {"meta": meta, "results": results}
+
+
+def compare(old, new, threshold, min_delta_ms):
+    """
+    Prints the p50/p95 change of every stage found in both result sets.
+
+    Returns:
+        list of str: The stages whose p50 got slower by more than `threshold` (a fraction)
+        and `min_delta_ms`.
+    """
+    old_records = {(r["stage"], r["jobs"]): r for r in old["results"]}
+    print(f"Comparing {old['meta'].get('commit')} ({old['meta'].get('created_at')}) -> {new['meta'].get('commit')} ({new['meta'].get('created_at')})")
+    print(f"{'stage':<28} {'jobs':>7} {'old p50':>10} {'new p50':>10} {'change':>8} {'old p95':>10} {'new p95':>10}")
+    regressions = []
+    for record in new["results"]:
+        key = (record["stage"], record["jobs"])
+        if key not in old_records:
+            continue
+        before = old_records[key]
+        change = (record["p50_ms"] - before["p50_ms"]) / before["p50_ms"] if before["p50_ms"] else 0.0
+        regressed = change > threshold and record["p50_ms"] - before["p50_ms"] > min_delta_ms
+        if regressed:
+            regressions.append(f"{record['stage']} ({record['jobs']} jobs)" if record["jobs"] is not None else record["stage"])
+        print(f"{record['stage']:<28} {record['jobs'] if record['jobs'] is not None else '-':>7} {before['p50_ms']:>10.2f} {record['p50_ms']:>10.2f} "
+              f"{change:>+7.1%} {before['p95_ms']:>10.2f} {record['p95_ms']:>10.2f}{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def _csv(value, cast=str):
+    return [cast(item.strip()) for item in value.split(',') if item.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the matching pipeline on synthetic corpora.")
+    parser.add_argument('--scales', type=lambda v: _csv(v, int), default=[100, 1000, 10000], help='job catalogue sizes (default 100,1000,10000)')
+    parser.add_argument('--resumes', type=int, default=20, help='resumes in the corpus; one timed call per resume (default 20)')
+    parser.add_argument('--batch-size', type=int, default=10, help='resumes per bulk_skill_keyword_match call (default 10)')
+    parser.add_argument('--stages', type=_csv, default=RESUME_STAGES + MATCH_STAGES, help='comma-separated stages (default: all)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='results file (default benchmarks/results/matching-<commit>-<time>.json)')
+    parser.add_argument('--compare', nargs='+', metavar='RESULTS', help='OLD [NEW]: compare with OLD (after running, unless NEW is given)')
+    parser.add_argument('--threshold', type=float, default=0.15, help='p50 slowdown counted as a regression (default 0.15 = 15%%)')
+    parser.add_argument('--min-delta-ms', type=float, default=1.0, help='ignore slowdowns smaller than this (default 1 ms)')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)  # Fallback warnings would repeat on every call
+
+    unknown = [stage for stage in args.stages if stage not in RESUME_STAGES + MATCH_STAGES]
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(unknown)}")
+    if args.compare and len(args.compare) > 2:
+        parser.error("--compare takes OLD [NEW]")
+
+    if args.compare and len(args.compare) == 2:
+        with open(args.compare[0], encoding='utf-8') as f:
+            old = json.load(f)
+        with open(args.compare[1], encoding='utf-8') as f:
+            new = json.load(f)
+    else:
+        new = run(args)
+        output = args.output
+        if not output:
+            os.makedirs(RESULTS_DIR, exist_ok=True)
+            stamp = datetime.datetime.now().strftime('%Y%m%d-%H%M%S')
+            output = os.path.join(RESULTS_DIR, f"matching-{new['meta']['commit'] or 'unknown'}-{stamp}.json")
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(new, f, indent=2)
+        print(f"Results written to {output}")
+        if not args.compare:
+            return 0
+        with open(args.compare[0], encoding='utf-8') as f:
+            old = json.load(f)
+
+    regressions = compare(old, new, args.threshold, args.min_delta_ms)
+    if regressions:
+        print(f"Slower than the {args.threshold:.0%} threshold: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
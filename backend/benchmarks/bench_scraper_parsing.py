@@ -0,0 +1,149 @@
+# backend/benchmarks/bench_scraper_parsing.py
+# Compares the scraper's HTML parsing paths on saved TopJobs-style fixture pages:
+# the original BeautifulSoup parser with lambda class predicates ('legacy'), the
+# SoupStrainer/precompiled-regex path ('html.parser') and the lxml/XPath path ('lxml').
+# Reports the median parse time and the tracemalloc peak of one parse, and checks that
+# every path extracts the same jobs as the legacy parser.
+# Note that tracemalloc only sees Python allocations: lxml's tree lives in C memory.
+# The fixtures are hand-built pages in the markup the scraper's selectors target.
+#
+# Usage (from backend/):
+#     python benchmarks/bench_scraper_parsing.py [--repeat 50] [--json results.json]
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from urllib.parse import urljoin
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+import topjobs_scraper
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+FIXTURE_URL = 'https://www.topjobs.lk/'
+
+
+def legacy_parse_listing(html, url):
+    """
+    The listing parser as it was before the selector-compiled paths (kept as the baseline).
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    job_listings_container = soup.find('div', class_='job-list-container')
+    if not job_listings_container:
+        job_listings_container = soup
+    job_cards = job_listings_container.find_all('div', class_=lambda x: x and 'job-card' in x.lower())
+    if not job_cards:
+        job_cards = soup.find_all(['div', 'li', 'article'], class_=lambda x: x and ('job' in x.lower() or 'listing' in x.lower() or 'post' in x.lower()))
+    cards = []
+    for card in job_cards[:topjobs_scraper.SCRAPER_MAX_CARDS]:
+        title_tag = card.find(['h2', 'h3', 'a'], class_=lambda x: x and ('title' in x.lower() or 'job-title' in x.lower()))
+        company_tag = card.find(['span', 'p', 'div'], class_=lambda x: x and ('company' in x.lower() or 'employer' in x.lower()))
+        description_tag = card.find(['div', 'p'], class_=lambda x: x and ('description' in x.lower() or 'summary' in x.lower()))
+        link_tag = card.find('a', href=True)
+        skills_tag = card.find(['div', 'ul', 'p'], class_=lambda x: x and ('skills' in x.lower() or 'requirements' in x.lower()))
+        job_url = url
+        if link_tag:
+            job_url = link_tag['href']
+            if not job_url.startswith('http'):
+                job_url = urljoin(url, job_url)
+        cards.append({
+            "Job_Title": title_tag.get_text(strip=True) if title_tag else 'N/A',
+            "Company_Name": company_tag.get_text(strip=True) if company_tag else 'N/A',
+            "Job_Description": description_tag.get_text(separator=' ', strip=True) if description_tag else 'No description available.',
+            "Required_Skills": skills_tag.get_text(separator=', ', strip=True) if skills_tag else 'N/A',
+            "Job_URL": job_url,
+        })
+    return cards
+
+
+def legacy_parse_detail(html):
+    detail_soup = BeautifulSoup(html, 'html.parser')
+    full_desc_tag = detail_soup.find('div', class_=lambda x: x and ('job-details-content' in x.lower() or 'job-description-full' in x.lower()))
+    full_skills_tag = detail_soup.find(['div', 'ul', 'p'], class_=lambda x: x and ('skills' in x.lower() or 'requirements' in x.lower()))
+    return (
+        full_desc_tag.get_text(separator=' ', strip=True) if full_desc_tag else None,
+        full_skills_tag.get_text(separator=', ', strip=True) if full_skills_tag else None,
+    )
+
+
+def _with_parser(parser, function):
+    def run(*args):
+        previous = topjobs_scraper.SCRAPER_PARSER
+        topjobs_scraper.SCRAPER_PARSER = parser
+        try:
+            return function(*args)
+        finally:
+            topjobs_scraper.SCRAPER_PARSER = previous
+    return run
+
+
+def measure(function, args, repeat):
+    """
+    Returns (median milliseconds, tracemalloc peak in KiB, result) for `function(*args)`.
+    """
+    result = function(*args)  # Warm-up (and the result to compare)
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(*args)
+        timings.append((time.perf_counter() - started) * 1000)
+    tracemalloc.start()
+    function(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(timings), peak / 1024, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=50, help='timed runs per parser and page')
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    with open(os.path.join(FIXTURES_DIR, 'topjobs_listing.html'), encoding='utf-8') as f:
+        listing_html = f.read()
+    with open(os.path.join(FIXTURES_DIR, 'topjobs_detail.html'), encoding='utf-8') as f:
+        detail_html = f.read()
+
+    parsers = {
+        'legacy': (legacy_parse_listing, legacy_parse_detail),
+        'html.parser': (_with_parser('html.parser', topjobs_scraper.parse_listing), _with_parser('html.parser', topjobs_scraper.parse_detail)),
+    }
+    if topjobs_scraper.lxml_html is not None:
+        parsers['lxml'] = (_with_parser('lxml', topjobs_scraper.parse_listing), _with_parser('lxml', topjobs_scraper.parse_detail))
+    else:
+        print("lxml is not installed; skipping the lxml parser.")
+
+    results = []
+    baseline = {}
+    for name, (parse_listing, parse_detail) in parsers.items():
+        for page, function, page_args in (('listing', parse_listing, (listing_html, FIXTURE_URL)), ('detail', parse_detail, (detail_html,))):
+            median_ms, peak_kib, output = measure(function, page_args, args.repeat)
+            baseline.setdefault(page, output)
+            results.append({
+                "parser": name, "page": page, "median_ms": round(median_ms, 3),
+                "peak_kib": round(peak_kib, 1), "same_output": output == baseline[page],
+            })
+
+    print(f"{'parser':<12} {'page':<8} {'median ms':>10} {'peak KiB':>10} {'speedup':>8}  same output")
+    legacy_ms = {r["page"]: r["median_ms"] for r in results if r["parser"] == 'legacy'}
+    for r in results:
+        speedup = legacy_ms[r["page"]] / r["median_ms"] if r["median_ms"] else float('inf')
+        print(f"{r['parser']:<12} {r['page']:<8} {r['median_ms']:>10.3f} {r['peak_kib']:>10.1f} {speedup:>7.2f}x  {'yes' if r['same_output'] else 'NO'}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({"repeat": args.repeat, "results": results}, f, indent=2)
+    return 0 if all(r["same_output"] for r in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,185 @@
+# backend/benchmarks/corpus.py
+# Deterministic synthetic resume and job corpora for the benchmarks.
+# Resumes have the sections the matcher looks for (summary, skills, experience, ...)
+# plus contact details for the PII filter; jobs look like the Firebase catalogue entries.
+# The same seed always produces the same corpus, so results are comparable between commits.
+
+import io
+import random
+import zipfile
+
+SKILLS = [
+    'Python', 'Java', 'JavaScript', 'TypeScript', 'C#', 'C++', 'Go', 'Kotlin', 'Swift', 'PHP',
+    'SQL', 'PostgreSQL', 'MySQL', 'MongoDB', 'Redis', 'Elasticsearch', 'Kafka', 'Spark', 'Hadoop', 'Airflow',
+    'Django', 'Flask', 'FastAPI', 'Spring Boot', 'Node.js', 'Express', 'React', 'Angular', 'Vue', 'Next.js',
+    'Docker', 'Kubernetes', 'Terraform', 'Ansible', 'Jenkins', 'GitHub Actions', 'AWS', 'Azure', 'GCP', 'Linux',
+    'Pandas', 'NumPy', 'scikit-learn', 'TensorFlow', 'PyTorch', 'NLP', 'Computer Vision', 'Power BI', 'Tableau', 'Excel',
+    'Selenium', 'Cypress', 'JUnit', 'pytest', 'REST APIs', 'GraphQL', 'Microservices', 'Agile', 'Scrum', 'Jira',
+    'Figma', 'UX Research', 'Networking', 'Cisco', 'Firewalls', 'SIEM', 'Penetration Testing', 'Git', 'CI/CD', 'OOP',
+]
+TITLES = [
+    'Software Engineer', 'Senior Software Engineer', 'Backend Developer', 'Frontend Developer', 'Full Stack Developer',
+    'Data Scientist', 'Data Engineer', 'Machine Learning Engineer', 'DevOps Engineer', 'Cloud Engineer',
+    'QA Engineer', 'Automation Tester', 'Business Analyst', 'UI/UX Designer', 'Network Engineer',
+    'Cybersecurity Analyst', 'Mobile Developer', 'Database Administrator', 'Technical Lead', 'Intern Software Engineer',
+]
+COMPANIES = ['Ceylon Soft', 'Island Tech', 'Kandy Systems', 'Serendib Solutions', 'Colombo Digital', 'Lanka Analytics', 'Pearl Cloud', 'Galle Labs']
+LOCATIONS = ['Colombo', 'Kandy', 'Galle', 'Negombo', 'Remote', 'Hybrid - Colombo']
+DEGREES = ['BSc in Computer Science', 'BSc in Software Engineering', 'BSc in Information Technology', 'MSc in Data Science', 'HND in Computing']
+FILLER = [
+    'Designed and implemented features used by thousands of customers.',
+    'Worked closely with product owners and designers in an agile team.',
+    'Improved performance of critical services and reduced infrastructure costs.',
+    'Mentored junior engineers and took part in code reviews.',
+    'Wrote automated tests and maintained the continuous integration pipeline.',
+    'Collaborated with stakeholders to gather requirements and plan releases.',
+    'Monitored production systems and handled incident response.',
+    'Documented APIs and internal processes for other teams.',
+]
+FIRST_NAMES = ['Nimal', 'Kamal', 'Sunil', 'Dilini', 'Ishara', 'Tharindu', 'Chamari', 'Ruwan', 'Sanduni', 'Kasun']
+LAST_NAMES = ['Perera', 'Fernando', 'Silva', 'Jayasinghe', 'Bandara', 'Wickramasinghe', 'Gunawardena', 'Dissanayake']
+
+
+def generate_jobs(count, seed=0):
+    """
+    Returns `count` job dicts with Job_ID, Job_Title, Company_Name, Job_Description,
+    Required_Skills and the other catalogue fields.
+    """
+    rng = random.Random(seed)
+    jobs = []
+    for i in range(count):
+        title = rng.choice(TITLES)
+        skills = rng.sample(SKILLS, rng.randint(3, 9))
+        description = " ".join(
+            [f"We are hiring a {title} to join {rng.choice(COMPANIES)}."]
+            + rng.sample(FILLER, rng.randint(2, 5))
+            + [f"You will work with {', '.join(rng.sample(skills, min(3, len(skills))))} every day."]
+        )
+        jobs.append({
+            "Job_ID": f"job_{seed}_{i:06d}",
+            "Job_Title": title,
+            "Company_Name": rng.choice(COMPANIES),
+            "Job_Description": description,
+            "Required_Skills": ", ".join(skills),
+            "Education_Level": rng.choice(DEGREES),
+            "Experience_Required": f"{rng.randint(0, 8)} years",
+            "Location": rng.choice(LOCATIONS),
+        })
+    return jobs
+
+
+def generate_resumes(count, seed=0):
+    """
+    Returns `count` resume texts with section headers and contact details.
+    """
+    rng = random.Random(seed + 1_000_003)
+    resumes = []
+    for i in range(count):
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        skills = rng.sample(SKILLS, rng.randint(5, 15))
+        lines = [
+            name,
+            f"{name.split()[0].lower()}.{i}@example.com | +94 77 {rng.randint(100, 999)} {rng.randint(1000, 9999)} | https://github.com/user{i}",
+            "",
+            "Summary",
+            f"{rng.choice(TITLES)} with {rng.randint(1, 12)} years of experience. " + rng.choice(FILLER),
+            "",
+            "Technical Skills",
+            ", ".join(skills),
+            "",
+            "Work Experience",
+        ]
+        for _ in range(rng.randint(1, 4)):
+            lines.append(f"{rng.choice(TITLES)} - {rng.choice(COMPANIES)} ({rng.randint(2012, 2023)} - Present)")
+            lines.extend(f"- {sentence} Used {rng.choice(skills)}." for sentence in rng.sample(FILLER, rng.randint(2, 4)))
+        lines += ["", "Projects"]
+        for _ in range(rng.randint(1, 3)):
+            lines.append(f"- Built a {rng.choice(['web', 'mobile', 'data', 'cloud'])} application with {', '.join(rng.sample(skills, 2))}.")
+        lines += ["", "Education", rng.choice(DEGREES), "", "Certifications", f"{rng.choice(['AWS', 'Azure', 'Scrum', 'Cisco'])} certified"]
+        resumes.append("\n".join(lines))
+    return resumes
+
+
+def make_txt(text):
+    return text.encode('utf-8')
+
+
+def make_docx(text):
+    """
+    Returns the bytes of a minimal DOCX document with one paragraph per line.
+    """
+    paragraphs = "".join(
+        f'<w:p><w:r><w:t xml:space="preserve">{_xml_escape(line)}</w:t></w:r></w:p>' for line in text.split("\n")
+    )
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f'<w:body>{paragraphs}</w:body></w:document>'
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as docx:
+        docx.writestr('[Content_Types].xml', (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+            '</Types>'
+        ))
+        docx.writestr('_rels/.rels', (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>'
+            '</Relationships>'
+        ))
+        docx.writestr('word/document.xml', document)
+    return buffer.getvalue()
+
+
+def make_pdf(text, lines_per_page=45):
+    """
+    Returns the bytes of a minimal text PDF (Helvetica, one text line per resume line).
+    """
+    lines = text.split("\n")
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for page_lines in pages:
+        commands = ["BT", "/F1 10 Tf", "12 TL", "50 780 Td"]
+        for line in page_lines:
+            escaped = line.encode('latin-1', 'replace').decode('latin-1').replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+            commands.append(f"({escaped}) Tj T*")
+        commands.append("ET")
+        stream = "\n".join(commands).encode('latin-1')
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] /Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects))
+        page_ids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (" ".join(f"{n} 0 R" for n in page_ids).encode(), len(page_ids))
+
+    output = io.BytesIO()
+    output.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(output.tell())
+        output.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref = output.tell()
+    output.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    output.writelines(b"%010d 00000 n \n" % offset for offset in offsets)
+    output.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return output.getvalue()
+
+
+def resume_files(texts):
+    """
+    Returns [(filename, bytes)] with the resumes spread over the TXT, DOCX and PDF formats.
+    """
+    makers = [('.txt', make_txt), ('.docx', make_docx), ('.pdf', make_pdf)]
+    files = []
+    for i, text in enumerate(texts):
+        extension, make = makers[i % len(makers)]
+        files.append((f"resume_{i:05d}{extension}", make(text)))
+    return files
+
+
+def _xml_escape(text):
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
@@ -0,0 +1,206 @@
+# backend/bulk_match.py
+# Vectorized skill-overlap scoring of many resumes against many jobs.
+# Job token sets define a shared vocabulary; resumes and jobs become binary CSR
+# matrices R (resumes x vocabulary) and J (jobs x vocabulary), so R @ J.T gives the
+# number of shared tokens |R ∩ J| for every pair in one sparse matrix product.
+# Scores are |R ∩ J| / |J| * 100 rounded to 2 decimals, looked up from a table that is
+# filled with Python's own `round`, so they are identical to `calculate_skill_keyword_match`.
+
+import logging
+import os
+import time
+
+import numpy as np
+from scipy import sparse
+
+from instrumentation import timed
+
+logger = logging.getLogger(__name__)
+
+# Resumes scored per sparse product (bounds the size of the intermediate count matrix)
+BULK_MATCH_CHUNK_SIZE = int(os.environ.get('BULK_MATCH_CHUNK_SIZE', 512))
+
+
+def build_vocabulary(token_sets):
+    """
+    Maps every token that appears in `token_sets` to a column number.
+    """
+    vocabulary = {}
+    for tokens in token_sets:
+        for token in tokens:
+            if token not in vocabulary:
+                vocabulary[token] = len(vocabulary)
+    return vocabulary
+
+
+def binary_matrix(token_sets, vocabulary):
+    """
+    Builds a (len(token_sets), len(vocabulary)) binary CSR matrix.
+    Tokens missing from the vocabulary are ignored.
+    """
+    indptr = [0]
+    indices = []
+    for tokens in token_sets:
+        indices.extend(vocabulary[token] for token in set(tokens) if token in vocabulary)
+        indptr.append(len(indices))
+    data = np.ones(len(indices), dtype=np.int32)
+    return sparse.csr_matrix(
+        (data, np.asarray(indices, dtype=np.int64), np.asarray(indptr, dtype=np.int64)),
+        shape=(len(token_sets), len(vocabulary)),
+    )
+
+
+def _score_table(job_lengths):
+    """
+    Precomputes round(count / length * 100, 2) for every job length present and
+    every possible count, with the same Python arithmetic as the per-pair matcher.
+
+    Returns:
+        tuple: (offsets, table) so that the score of `count` shared tokens with a job
+               of `length` tokens is table[offsets[length] + count].
+    """
+    max_length = int(job_lengths.max()) if len(job_lengths) else 0
+    offsets = np.zeros(max_length + 1, dtype=np.int64)
+    values = []
+    for length in sorted(set(int(n) for n in job_lengths)):
+        offsets[length] = len(values)
+        if length == 0:
+            values.append(0.0)  # Jobs without skills always score 0
+        else:
+            values.extend(round((count / length) * 100, 2) for count in range(length + 1))
+    return offsets, np.asarray(values, dtype=np.float64)
+
+
+def select_top_k(columns, scores, top_k=None, min_score=None):
+    """
+    Picks the best entries of one row of scores.
+
+    Args:
+        columns (numpy.ndarray): Column (job) number of each score.
+        scores (numpy.ndarray): The scores.
+        top_k (int, optional): Entries to keep (all if None).
+        min_score (float, optional): Drop entries scoring below this.
+
+    Returns:
+        tuple: (columns, scores) as Python ints and floats, best first, ties broken by column.
+    """
+    if min_score is not None:
+        keep = scores >= min_score
+        columns, scores = columns[keep], scores[keep]
+    if top_k is not None and 0 < top_k < len(scores):
+        # Keep everything tied with the k-th best score, then order exactly
+        threshold = np.partition(scores, len(scores) - top_k)[len(scores) - top_k]
+        keep = scores >= threshold
+        columns, scores = columns[keep], scores[keep]
+    order = np.lexsort((columns, -scores))
+    if top_k is not None:
+        order = order[:top_k]
+    return [int(column) for column in columns[order]], [float(score) for score in scores[order]]
+
+
+def top_k_rows(score_matrix, top_k=None, min_score=None):
+    """
+    Applies `select_top_k` to every row of a dense (resumes x jobs) score matrix.
+
+    Returns:
+        list of list of tuple: For each row, (column, score), best first.
+    """
+    score_matrix = np.asarray(score_matrix)
+    columns = np.arange(score_matrix.shape[1]) if score_matrix.ndim == 2 else np.empty(0, dtype=np.int64)
+    return [list(zip(*select_top_k(columns, row, top_k, min_score))) for row in score_matrix]
+
+
+class BulkSkillMatcher:
+    """
+    Scores resume token sets against a fixed list of job token sets.
+    Build it once per job catalogue and reuse it for any number of resume batches.
+
+    Args:
+        job_token_sets (list of set): Preprocessed Required_Skills tokens, one set per job.
+        job_ids (list, optional): Keys returned with the scores (defaults to job positions).
+    """
+
+    def __init__(self, job_token_sets, job_ids=None):
+        self.job_token_sets = [set(tokens) for tokens in job_token_sets]
+        self.job_ids = list(job_ids) if job_ids is not None else list(range(len(self.job_token_sets)))
+        # Resume tokens that no job uses can't add to any overlap, so the jobs define the vocabulary
+        self.vocabulary = build_vocabulary(self.job_token_sets)
+        self._job_matrix_t = binary_matrix(self.job_token_sets, self.vocabulary).T.tocsr()
+        self.job_lengths = np.asarray([len(tokens) for tokens in self.job_token_sets], dtype=np.int64)
+        offsets, self._table = _score_table(self.job_lengths)
+        self._job_offsets = offsets[self.job_lengths] if len(self.job_lengths) else self.job_lengths
+
+    def overlap_counts(self, resume_token_sets):
+        """
+        Returns the sparse (resumes x jobs) matrix of shared token counts.
+        """
+        resume_matrix = binary_matrix(resume_token_sets, self.vocabulary)
+        return (resume_matrix @ self._job_matrix_t).tocsr()
+
+    @timed('scoring')
+    def score_matrix(self, resume_token_sets):
+        """
+        Returns the dense (resumes x jobs) matrix of match percentages.
+        Entry [i, j] equals calculate_skill_keyword_match's score for resume i and job j.
+        """
+        resume_token_sets = list(resume_token_sets)
+        scores = np.zeros((len(resume_token_sets), len(self.job_token_sets)), dtype=np.float64)
+        for start in range(0, len(resume_token_sets), BULK_MATCH_CHUNK_SIZE):
+            counts = self.overlap_counts(resume_token_sets[start:start + BULK_MATCH_CHUNK_SIZE]).toarray()
+            scores[start:start + len(counts)] = self._table[self._job_offsets[np.newaxis, :] + counts]
+        return scores
+
+    @timed('scoring')
+    def top_k(self, resume_token_sets, top_k=10, min_score=None, stop_words=None):
+        """
+        Returns the best jobs for every resume.
+
+        Args:
+            resume_token_sets (list of set): Preprocessed resume tokens, one set per resume.
+            top_k (int, optional): Jobs to return per resume (all jobs if None).
+            min_score (float, optional): Drop jobs scoring below this percentage.
+            stop_words (set, optional): Words left out of the displayed matching keywords.
+
+        Returns:
+            list of list of tuple: For each resume, (job_id, percentage, matching_words),
+                                   best first. Ties are broken by job position.
+                                   Jobs with no overlap score 0.0 and, as with `top_k_rows`,
+                                   are only dropped when `min_score` is above 0.
+        """
+        started = time.perf_counter()
+        resume_token_sets = [set(tokens) for tokens in resume_token_sets]
+        stop_words = stop_words or set()
+        include_unmatched = min_score is None or min_score <= 0
+        all_jobs = np.arange(len(self.job_token_sets))
+        results = []
+
+        for start in range(0, len(resume_token_sets), BULK_MATCH_CHUNK_SIZE):
+            chunk = resume_token_sets[start:start + BULK_MATCH_CHUNK_SIZE]
+            counts = self.overlap_counts(chunk)
+            for row, resume_tokens in enumerate(chunk):
+                begin, end = counts.indptr[row], counts.indptr[row + 1]
+                jobs = counts.indices[begin:end]
+                scores = self._table[self._job_offsets[jobs] + counts.data[begin:end]]
+                selected = select_top_k(jobs, scores, top_k, min_score)
+                if include_unmatched and (top_k is None or len(selected[0]) < top_k) and len(jobs) < len(all_jobs):
+                    # Too few overlapping jobs: rank the full row, where the others score 0.0
+                    row_scores = np.zeros(len(all_jobs), dtype=np.float64)
+                    row_scores[jobs] = scores
+                    selected = select_top_k(all_jobs, row_scores, top_k, min_score)
+                jobs, scores = selected
+
+                matches = []
+                for job, score in zip(jobs, scores):
+                    common_skills = resume_tokens & self.job_token_sets[job]
+                    display_common_skills = sorted(word for word in common_skills if word not in stop_words)
+                    matches.append((self.job_ids[job], float(score), display_common_skills[:15]))
+                results.append(matches)
+
+        logger.info(
+            "BulkSkillMatcher.top_k: %d resumes x %d jobs in %.1f ms",
+            len(resume_token_sets), len(self.job_token_sets), (time.perf_counter() - started) * 1000,
+        )
+        return results
+
+    def __len__(self):
+        return len(self.job_token_sets)
@@ -0,0 +1,329 @@
+# backend/embedding_store.py
+# Persistent store of job description embeddings.
+# Embeddings are kept L2-normalized in a .npy matrix (memory-mapped when loaded). A JSON
+# manifest names the matrix file and maps each row to a Job_ID and the hash of the text
+# it was computed from. Every save writes a new, uniquely named matrix file and then
+# replaces the manifest, so the matrix and the key map always change together.
+# A request then only needs to encode the resume and take one matrix-vector dot
+# product against the stored rows.
+# Texts without a Job_ID (ad-hoc descriptions) are only kept in a bounded in-memory LRU.
+# New rows are written at most every EMBEDDING_STORE_SAVE_INTERVAL seconds, and a
+# read-only store (used by the resume pool's worker processes) never writes: it keeps its
+# own new rows in memory and reloads the manifest when the writing process updated it.
+
+import atexit
+import glob
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_STORE_DIR = os.environ.get('EMBEDDING_STORE_DIR', 'cache/embeddings')
+# Embeddings of texts without a Job_ID (or computed by a read-only store) kept in memory
+EMBEDDING_TEXT_CACHE_SIZE = int(os.environ.get('EMBEDDING_TEXT_CACHE_SIZE', 2048))
+# Seconds between two writes of the store; new rows in between are saved together
+EMBEDDING_STORE_SAVE_INTERVAL = float(os.environ.get('EMBEDDING_STORE_SAVE_INTERVAL', 30))
+# Old matrix files are deleted once they are this many seconds old and no longer referenced
+EMBEDDING_STORE_GRACE_SECONDS = 60
+# Bump this whenever the stored format changes, so old stores are discarded
+EMBEDDING_STORE_FORMAT_VERSION = 2
+
+
+def text_hash(text):
+    """
+    Returns a stable SHA-256 hex digest for a piece of text.
+    """
+    return hashlib.sha256((text or "").encode('utf-8')).hexdigest()
+
+
+def normalize_rows(matrix):
+    """
+    L2-normalizes each row of a matrix, leaving all-zero rows untouched.
+    """
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class JobEmbeddingStore:
+    """
+    Maps keys (normally Job_IDs) to normalized embedding rows.
+    A row is recomputed only when the key is new or the hash of its text changed.
+
+    Args:
+        directory (str): Directory of the store ('' keeps everything in memory).
+        model_name (str, optional): Model the embeddings come from (a store built with
+                                    another model is discarded).
+        read_only (bool): Never write to disk (for processes that are not the store's writer).
+        text_cache_size (int): Entries of the in-memory LRU for texts without a Job_ID.
+        save_interval (float): Minimum seconds between two writes.
+    """
+
+    def __init__(self, directory=EMBEDDING_STORE_DIR, model_name=None, read_only=False,
+                 text_cache_size=EMBEDDING_TEXT_CACHE_SIZE, save_interval=EMBEDDING_STORE_SAVE_INTERVAL):
+        self.directory = directory
+        self.model_name = model_name
+        self.read_only = read_only
+        self.text_cache_size = text_cache_size
+        self.save_interval = save_interval
+        self.manifest_path = os.path.join(directory, 'manifest.json') if directory else None
+        self._matrix = None  # (N, D) float32, possibly a read-only memmap
+        self._keys = []
+        self._hashes = []
+        self._row_of = {}  # key -> row number
+        self._memory = OrderedDict()  # key -> (hash, row) of rows that are not persisted
+        self._manifest_mtime = None
+        self._dirty = False
+        self._last_saved = 0.0
+        self._save_timer = None
+        self._atexit_registered = False
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.load()
+
+    def load(self):
+        """
+        Loads the store from disk. A missing, unreadable or mismatched store starts empty.
+        """
+        if not self.manifest_path or not os.path.exists(self.manifest_path):
+            return
+        try:
+            mtime = os.stat(self.manifest_path).st_mtime_ns
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get("version") != EMBEDDING_STORE_FORMAT_VERSION:
+                logger.warning("Embedding store at '%s' has an old format. Rebuilding it.", self.directory)
+                return
+            if self.model_name and manifest.get("model") != self.model_name:
+                logger.warning("Embedding store at '%s' was built with model '%s'. Rebuilding it.", self.directory, manifest.get('model'))
+                return
+            matrix = np.load(os.path.join(self.directory, manifest["matrix"]), mmap_mode='r')
+            if matrix.shape[0] != len(manifest["keys"]):
+                logger.warning("Embedding store at '%s' is inconsistent. Rebuilding it.", self.directory)
+                return
+            with self._lock:
+                self._matrix = matrix
+                self._keys = list(manifest["keys"])
+                self._hashes = list(manifest["hashes"])
+                self._row_of = {key: i for i, key in enumerate(self._keys)}
+                self._manifest_mtime = mtime
+                self._dirty = False
+            logger.info("Embedding store loaded from '%s' (%s jobs).", self.directory, len(self._keys))
+        except Exception as e:
+            logger.error("Error loading embedding store from %s: %s. Starting with an empty store.", self.directory, e)
+
+    def _reload_if_changed(self):
+        """
+        Reloads the store if another process replaced the manifest since it was read.
+
+        Returns:
+            bool: Whether the store was reloaded.
+        """
+        if not self.manifest_path:
+            return False
+        try:
+            mtime = os.stat(self.manifest_path).st_mtime_ns
+        except FileNotFoundError:
+            return False
+        if mtime == self._manifest_mtime:
+            return False
+        self.load()
+        return True
+
+    def save(self):
+        """
+        Writes the matrix to a new file, then atomically replaces the manifest that
+        points at it, and re-opens the matrix as a read-only memmap.
+        """
+        if not self.manifest_path or self.read_only or self._matrix is None:
+            return
+        with self._lock:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                matrix_name = f"embeddings-{uuid.uuid4().hex}.npy"
+                matrix_path = os.path.join(self.directory, matrix_name)
+                np.save(matrix_path, np.ascontiguousarray(self._matrix, dtype=np.float32))
+                tmp_manifest_path = f"{self.manifest_path}.{os.getpid()}.{uuid.uuid4().hex}.tmp"
+                with open(tmp_manifest_path, 'w', encoding='utf-8') as f:
+                    json.dump({
+                        "version": EMBEDDING_STORE_FORMAT_VERSION,
+                        "model": self.model_name,
+                        "matrix": matrix_name,
+                        "keys": self._keys,
+                        "hashes": self._hashes,
+                    }, f)
+                os.replace(tmp_manifest_path, self.manifest_path)
+                self._manifest_mtime = os.stat(self.manifest_path).st_mtime_ns
+                self._matrix = np.load(matrix_path, mmap_mode='r')
+                self._dirty = False
+                self._last_saved = time.monotonic()
+                self._remove_old_matrices(matrix_name)
+            except Exception as e:
+                logger.error("Error saving embedding store to %s: %s", self.directory, e)
+
+    def _remove_old_matrices(self, current_name):
+        """
+        Deletes matrix files no manifest should still point at. Files younger than the
+        grace period are kept, as another process may be about to reference them.
+        """
+        cutoff = time.time() - EMBEDDING_STORE_GRACE_SECONDS
+        for path in glob.glob(os.path.join(self.directory, 'embeddings-*.npy')):
+            if os.path.basename(path) == current_name:
+                continue
+            try:
+                if os.stat(path).st_mtime < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass  # Already removed, or still mapped on platforms that forbid it
+
+    def flush(self):
+        """
+        Writes pending rows to disk now.
+        """
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if self._dirty:
+                self.save()
+
+    def _schedule_save(self):
+        """
+        Saves now if the last save is older than `save_interval`, otherwise once it is.
+        """
+        self._dirty = True
+        if not self.manifest_path or self.read_only:
+            return
+        if not self._atexit_registered:
+            atexit.register(self.flush)
+            self._atexit_registered = True
+        delay = self._last_saved + self.save_interval - time.monotonic()
+        if delay <= 0:
+            self.save()
+        elif self._save_timer is None:
+            self._save_timer = threading.Timer(delay, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def _cached_row(self, key, digest):
+        """
+        Returns ('matrix', row number) or ('memory', vector) for an up-to-date entry, or None.
+        """
+        row = self._row_of.get(key)
+        if row is not None and self._hashes[row] == digest:
+            return 'matrix', row
+        entry = self._memory.get(key)
+        if entry is not None and entry[0] == digest:
+            self._memory.move_to_end(key)
+            return 'memory', entry[1]
+        return None
+
+    def _remember(self, key, digest, row):
+        self._memory[key] = (digest, row)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.text_cache_size:
+            self._memory.popitem(last=False)
+
+    def get_embeddings(self, keys, texts, encode_batch):
+        """
+        Returns the normalized embedding rows for `keys`, encoding only the
+        texts that are not stored yet or whose content changed.
+
+        Args:
+            keys (list of str): One key per text (Job_ID, or None to key by text hash).
+                                Texts without a Job_ID are only cached in memory.
+            texts (list of str): The raw texts the embeddings are computed from.
+            encode_batch (callable): Takes a list of texts and returns a (n, D) array of embeddings.
+
+        Returns:
+            numpy.ndarray: A (len(keys), D) float32 matrix of normalized embeddings.
+        """
+        hashes = [text_hash(text) for text in texts]
+        keys = [key if key else f"text:{digest}" for key, digest in zip(keys, hashes)]
+
+        with self._lock:
+            def lookup():
+                found = [self._cached_row(key, digest) for key, digest in zip(keys, hashes)]
+                missing = {}  # key -> (hash, text), de-duplicated
+                for key, digest, text, hit in zip(keys, hashes, texts, found):
+                    if hit is None:
+                        missing[key] = (digest, text)
+                return found, missing
+
+            found, missing = lookup()
+            if missing and self.read_only and self._reload_if_changed():
+                found, missing = lookup()
+
+            fresh = {}  # key -> row computed by this call
+            if missing:
+                missing_keys = list(missing)
+                new_rows = normalize_rows(encode_batch([missing[key][1] for key in missing_keys]))
+                fresh = dict(zip(missing_keys, new_rows))
+                persisted = []
+                for key in missing_keys:
+                    if key.startswith('text:') or self.read_only:
+                        self._remember(key, missing[key][0], fresh[key])
+                    else:
+                        persisted.append(key)
+                if persisted:
+                    self._upsert(persisted, [missing[key][0] for key in persisted], np.asarray([fresh[key] for key in persisted]))
+                    logger.info("Embedding store updated: %s job embeddings computed.", len(persisted))
+                    self._schedule_save()
+            self.hits += len(keys) - len(missing)
+            self.misses += len(missing)
+
+            if not keys:
+                dim = self._matrix.shape[1] if self._matrix is not None else 0
+                return np.empty((0, dim), dtype=np.float32)
+
+            # Rows from the matrix are gathered with one fancy-indexing read
+            positions, rows, result = [], [], [None] * len(keys)
+            for i, (key, hit) in enumerate(zip(keys, found)):
+                if hit is None:
+                    result[i] = fresh[key]
+                elif hit[0] == 'matrix':
+                    positions.append(i)
+                    rows.append(hit[1])
+                else:
+                    result[i] = hit[1]
+            if rows:
+                for i, row in zip(positions, np.asarray(self._matrix[rows], dtype=np.float32)):
+                    result[i] = row
+            return np.asarray(result, dtype=np.float32)
+
+    def _upsert(self, keys, hashes, rows):
+        """
+        Replaces existing rows and appends new ones (in memory).
+        """
+        if self._matrix is None:
+            matrix = np.empty((0, rows.shape[1]), dtype=np.float32)
+        else:
+            matrix = np.array(self._matrix, dtype=np.float32)  # copy out of the read-only memmap
+
+        appended = []
+        for key, digest, row in zip(keys, hashes, rows):
+            index = self._row_of.get(key)
+            if index is None:
+                self._row_of[key] = len(self._keys)
+                self._keys.append(key)
+                self._hashes.append(digest)
+                appended.append(row)
+            else:
+                matrix[index] = row
+                self._hashes[index] = digest
+        if appended:
+            matrix = np.vstack([matrix, np.asarray(appended, dtype=np.float32)])
+        self._matrix = matrix
+
+    def __len__(self):
+        return len(self._keys)
@@ -0,0 +1,314 @@
+# backend/instrumentation.py
+# Lightweight per-stage timing for the matching pipeline.
+# Code marks its stages (extraction, pii, preprocess, embedding, scoring, firebase,
+# serialization) with `stage(name)` or `@timed(name)`. Every timed stage is added to a
+# process-wide histogram, and, inside a Flask request, to the request's timings, which
+# are returned in a Server-Timing header. `render_metrics()` produces the Prometheus text
+# exposition served on /api/metrics (stage and request histograms plus cache hit rates).
+# A stage entered again while it is already running (e.g. filter_pii inside
+# filter_pii_batch) is only counted once. Different stages may still nest, so their
+# durations don't have to add up to the request total.
+# Work done in pool worker processes is timed there with `collect_stage_timings()`; the
+# durations travel back with the task's result and `merge_stage_timings()` adds them to
+# the request process's histogram and to the request that submitted the task.
+# With INSTRUMENTATION=off, `@timed` returns the function unchanged and `stage()`
+# returns a shared no-op context manager. Metrics are per process (one set per gunicorn worker).
+
+import contextlib
+import contextvars
+import functools
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+INSTRUMENTATION_ENABLED = os.environ.get('INSTRUMENTATION', 'on').lower() not in ('0', 'off', 'false', 'no')
+# Send request timings to clients in a Server-Timing header
+SERVER_TIMING_HEADER = os.environ.get('SERVER_TIMING_HEADER', 'on').lower() not in ('0', 'off', 'false', 'no')
+
+# Histogram bucket upper bounds, in seconds
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Stages currently running in this context, and the timings of the current request
+_active_stages = contextvars.ContextVar('active_stages', default=frozenset())
+_request_timings = contextvars.ContextVar('request_timings', default=None)
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram of durations per label set (Prometheus semantics).
+    """
+
+    def __init__(self, buckets=DURATION_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._series = {}  # label tuple -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, labels, seconds):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    series[i] += 1
+                    break
+            else:
+                series[len(self.buckets)] += 1
+            series[-1] += seconds
+
+    def snapshot(self):
+        """
+        Returns {labels: (cumulative bucket counts incl. +Inf, count, sum)}.
+        """
+        with self._lock:
+            items = [(labels, list(series)) for labels, series in self._series.items()]
+        snapshot = {}
+        for labels, series in items:
+            cumulative = []
+            total = 0
+            for count in series[:-1]:
+                total += count
+                cumulative.append(total)
+            snapshot[labels] = (cumulative, total, series[-1])
+        return snapshot
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+
+class RequestTimings:
+    """
+    Total time and call count per stage for one request.
+    """
+
+    __slots__ = ('started', 'stages')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages = {}  # stage -> [seconds, calls]
+
+    def add(self, name, seconds):
+        entry = self.stages.get(name)
+        if entry is None:
+            self.stages[name] = [seconds, 1]
+        else:
+            entry[0] += seconds
+            entry[1] += 1
+
+    def server_timing(self):
+        """
+        Returns the Server-Timing header value, e.g. 'preprocess;dur=12.3, total;dur=40.1'.
+        """
+        parts = [f"{name};dur={seconds * 1000:.1f}" for name, (seconds, _) in self.stages.items()]
+        parts.append(f"total;dur={(time.perf_counter() - self.started) * 1000:.1f}")
+        return ", ".join(parts)
+
+
+stage_durations = Histogram()  # labels: (stage,)
+request_durations = Histogram()  # labels: (endpoint, method, status class)
+# Cache name -> callable returning (hits, misses)
+_cache_sources = {}
+
+
+class _StageTimer:
+    __slots__ = ('name', 'started', 'token')
+
+    def __init__(self, name):
+        self.name = name
+        self.token = None
+
+    def __enter__(self):
+        active = _active_stages.get()
+        if self.name not in active:
+            self.token = _active_stages.set(active | {self.name})
+            self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.token is None:
+            return False  # Nested inside the same stage: counted by the outer one
+        seconds = time.perf_counter() - self.started
+        _active_stages.reset(self.token)
+        stage_durations.observe((self.name,), seconds)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.add(self.name, seconds)
+        return False
+
+
+_NOOP = contextlib.nullcontext()
+
+
+def stage(name):
+    """
+    Context manager timing the block as stage `name`.
+    """
+    if not INSTRUMENTATION_ENABLED:
+        return _NOOP
+    return _StageTimer(name)
+
+
+def timed(name):
+    """
+    Decorator timing every call of the function as stage `name`.
+    Returns the function unchanged when instrumentation is disabled.
+    """
+    def decorator(function):
+        if not INSTRUMENTATION_ENABLED:
+            return function
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with _StageTimer(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class _StageLog:
+    """
+    Stands in for the request timings while collecting: records every stage duration.
+    """
+
+    __slots__ = ('stages',)
+
+    def __init__(self):
+        self.stages = []  # (stage, seconds), in the order the stages finished
+
+    def add(self, name, seconds):
+        self.stages.append((name, seconds))
+
+
+@contextlib.contextmanager
+def collect_stage_timings():
+    """
+    Context manager collecting the stages timed inside the block, e.g. in a pool worker
+    whose timings would otherwise stay in the worker process. Yields the list of
+    (stage, seconds) pairs it fills, to be passed to `merge_stage_timings`.
+    """
+    log = _StageLog()
+    token = _request_timings.set(log)
+    try:
+        yield log.stages
+    finally:
+        _request_timings.reset(token)
+
+
+def merge_stage_timings(stages):
+    """
+    Adds stage durations collected elsewhere (see `collect_stage_timings`) to the stage
+    histogram and, inside a request, to the request's timings.
+
+    Args:
+        stages (list of tuple): (stage, seconds) pairs.
+    """
+    if not INSTRUMENTATION_ENABLED or not stages:
+        return
+    timings = _request_timings.get()
+    for name, seconds in stages:
+        stage_durations.observe((name,), seconds)
+        if timings is not None:
+            timings.add(name, seconds)
+
+
+def register_cache(name, stats):
+    """
+    Exposes a cache's hit rate on /api/metrics. `stats()` returns (hits, misses).
+    """
+    _cache_sources[name] = stats
+
+
+def instrument_app(app):
+    """
+    Adds request timing to a Flask app: a Server-Timing header on every response,
+    the request duration histogram and timed JSON serialization.
+    """
+    if not INSTRUMENTATION_ENABLED:
+        return
+    from flask import g, request
+    from flask.json.provider import DefaultJSONProvider
+
+    class TimedJSONProvider(DefaultJSONProvider):
+        def dumps(self, obj, **kwargs):
+            with _StageTimer('serialization'):
+                return super().dumps(obj, **kwargs)
+
+    app.json = TimedJSONProvider(app)
+
+    @app.before_request
+    def _start_request_timings():
+        g.request_timings_token = _request_timings.set(RequestTimings())
+
+    @app.after_request
+    def _finish_request_timings(response):
+        timings = _request_timings.get()
+        if timings is None:
+            return response
+        request_durations.observe(
+            (request.endpoint or 'unknown', request.method, f"{response.status_code // 100}xx"),
+            time.perf_counter() - timings.started,
+        )
+        if SERVER_TIMING_HEADER:
+            response.headers['Server-Timing'] = timings.server_timing()
+        return response
+
+    @app.teardown_request
+    def _reset_request_timings(exc):
+        token = g.pop('request_timings_token', None)
+        if token is not None:
+            _request_timings.reset(token)
+
+
+def render_metrics():
+    """
+    Returns all metrics in the Prometheus text exposition format.
+    """
+    lines = []
+    _render_histogram(lines, 'matcher_stage_duration_seconds', 'Time spent in each processing stage.', ('stage',), stage_durations)
+    _render_histogram(
+        lines, 'matcher_request_duration_seconds', 'Time spent handling HTTP requests.',
+        ('endpoint', 'method', 'status'), request_durations,
+    )
+
+    cache_stats = {}
+    for name, stats in sorted(_cache_sources.items()):
+        try:
+            cache_stats[name] = stats()
+        except Exception as e:
+            logger.warning("Could not read stats of cache %s: %s", name, e)
+    for metric, help_text, metric_type, value in (
+        ('matcher_cache_hits_total', 'Cache lookups answered from the cache.', 'counter', lambda hits, misses: hits),
+        ('matcher_cache_misses_total', 'Cache lookups that missed.', 'counter', lambda hits, misses: misses),
+        ('matcher_cache_hit_ratio', 'Share of cache lookups that hit.', 'gauge', lambda hits, misses: hits / (hits + misses) if hits + misses else 0.0),
+    ):
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {metric_type}")
+        for name, (hits, misses) in cache_stats.items():
+            lines.append(f'{metric}{{cache="{_escape(name)}"}} {_number(value(hits, misses))}')
+    return "\n".join(lines) + "\n"
+
+
+def _render_histogram(lines, metric, help_text, label_names, histogram):
+    lines.append(f"# HELP {metric} {help_text}")
+    lines.append(f"# TYPE {metric} histogram")
+    bounds = [_number(bound) for bound in histogram.buckets] + ['+Inf']
+    for labels, (cumulative, count, total) in sorted(histogram.snapshot().items()):
+        label_text = ",".join(f'{key}="{_escape(value)}"' for key, value in zip(label_names, labels))
+        for bound, bucket_count in zip(bounds, cumulative):
+            lines.append(f'{metric}_bucket{{{label_text},le="{bound}"}} {bucket_count}')
+        lines.append(f"{metric}_sum{{{label_text}}} {_number(total)}")
+        lines.append(f"{metric}_count{{{label_text}}} {count}")
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
@@ -0,0 +1,271 @@
+# backend/job_catalogue.py
+# In-process cache of the job catalogue.
+# Instead of downloading the whole 'jobs' tree from Firebase on every request, the
+# catalogue keeps a snapshot in memory. After JOBS_CACHE_TTL seconds the stale snapshot
+# is still served while a background thread fetches a fresh one. With JOBS_LISTEN on,
+# Firebase streaming events (put/patch) keep the snapshot current incrementally.
+# Every snapshot has an ETag (hash of its content) so /api/jobs can answer 304.
+# A snapshot is built once per change as a tuple of read-only `FrozenJob` dicts and
+# swapped in whole, so requests share it without copying; handlers that need to change
+# a job copy it (`dict(job)`) first.
+# For offline use and testing, JOBS_LOCAL_PATH points at a JSON file used instead of Firebase.
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+from instrumentation import timed
+
+logger = logging.getLogger(__name__)
+
+# Seconds before a snapshot is refreshed (in the background)
+JOBS_CACHE_TTL = float(os.environ.get('JOBS_CACHE_TTL', 60))
+# Keep the snapshot current with Firebase streaming events
+JOBS_LISTEN = os.environ.get('JOBS_LISTEN', '').lower() in ('1', 'true', 'yes')
+# Local JSON file ({Job_ID: job} or a list of jobs) used instead of Firebase when set
+JOBS_LOCAL_PATH = os.environ.get('JOBS_LOCAL_PATH', '')
+
+
+class FrozenJob(dict):
+    """
+    A catalogue job shared by all requests. It serializes like a dict, but changing it
+    raises TypeError; use `dict(job)` for a private, mutable copy.
+    """
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("Catalogue jobs are shared and read-only; copy them with dict(job) first")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        return (FrozenJob, (dict(self),))
+
+
+class FirebaseJobSource:
+    """
+    Reads the 'jobs' tree of the Firebase Realtime Database.
+    """
+
+    def __init__(self, path='jobs'):
+        self.path = path
+
+    @timed('firebase')
+    def fetch(self):
+        """
+        Returns {Job_ID: job dict} for every job.
+        """
+        from firebase_admin import db
+        return db.reference(self.path).get() or {}
+
+    def listen(self, callback):
+        """
+        Calls `callback(event_type, path, data)` for every change under the jobs tree.
+        Returns an object with a `close()` method.
+        """
+        from firebase_admin import db
+        return db.reference(self.path).listen(lambda event: callback(event.event_type, event.path, event.data))
+
+
+class LocalJsonJobSource:
+    """
+    Reads jobs from a local JSON file: either {Job_ID: job} or a list of jobs with a 'Job_ID'.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def fetch(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if isinstance(data, list):
+            return {job["Job_ID"]: job for job in data if job.get("Job_ID")}
+        return data or {}
+
+    def listen(self, callback):
+        return None  # No change events; the TTL refresh re-reads the file
+
+
+class JobCatalogue:
+    """
+    Cached snapshot of all jobs, refreshed after a TTL or through change events.
+
+    Args:
+        source: An object with `fetch()` (and optionally `listen(callback)`).
+        ttl (float): Seconds before the snapshot is refreshed in the background.
+        listen (bool): Subscribe to the source's change events.
+    """
+
+    def __init__(self, source, ttl=JOBS_CACHE_TTL, listen=JOBS_LISTEN):
+        self.source = source
+        self.ttl = ttl
+        self.listen = listen
+        self._jobs = None  # Job_ID -> job dict, None until the first fetch
+        self._etag = None
+        self._snapshot = ((), None)  # (tuple of FrozenJob, etag), replaced as a whole on every change
+        self._fetched_at = 0.0
+        self._listener = None
+        self._refreshing = False
+        self._lock = threading.RLock()
+        self.version = 0  # Bumped on every change to the snapshot
+
+    def get_jobs(self):
+        """
+        Returns all jobs as a tuple of read-only dicts (each with its 'Job_ID').
+        """
+        return self.snapshot()[0]
+
+    def snapshot(self):
+        """
+        Returns (jobs, etag), jobs being a tuple of `FrozenJob`. The same objects are
+        returned until the catalogue changes. The first call fetches synchronously;
+        later calls never wait for the network: an expired snapshot is served while a
+        refresh runs.
+        """
+        if self._jobs is None:
+            with self._lock:
+                if self._jobs is None:
+                    self.refresh()
+                    self._start_listener()
+        elif self._is_expired() and not self._refreshing:
+            with self._lock:
+                if not self._refreshing:
+                    self._refreshing = True
+                    threading.Thread(target=self._background_refresh, name="job-catalogue-refresh", daemon=True).start()
+        return self._snapshot
+
+    @property
+    def etag(self):
+        return self.snapshot()[1]
+
+    def _is_expired(self):
+        if self._listener is not None:
+            return False  # Change events keep the snapshot current
+        return time.time() - self._fetched_at > self.ttl
+
+    def refresh(self):
+        """
+        Fetches a full snapshot from the source now. On failure the current snapshot is kept.
+
+        Returns:
+            bool: True if the snapshot was replaced.
+        """
+        started = time.perf_counter()
+        try:
+            raw = self.source.fetch()
+        except Exception as e:
+            logger.error("Error retrieving jobs: %s", e)
+            with self._lock:
+                self._fetched_at = time.time()  # Don't retry on every request
+                if self._jobs is None:
+                    self._set_jobs({})
+            return False
+        with self._lock:
+            self._set_jobs({job_id: job for job_id, job in raw.items() if isinstance(job, dict)})
+            self._fetched_at = time.time()
+        logger.info("Job catalogue refreshed: %d jobs in %.1f ms", len(raw), (time.perf_counter() - started) * 1000)
+        return True
+
+    def _background_refresh(self):
+        try:
+            self.refresh()
+        finally:
+            self._refreshing = False
+
+    def _set_jobs(self, jobs):
+        """
+        Replaces the snapshot and recomputes its ETag (called with the lock held).
+        """
+        serialized = json.dumps(jobs, sort_keys=True, default=str).encode('utf-8')
+        etag = hashlib.sha256(serialized).hexdigest()[:32]
+        if etag != self._etag:
+            self._etag = etag
+            self._snapshot = (tuple(FrozenJob(job, Job_ID=job_id) for job_id, job in jobs.items()), etag)
+            self.version += 1
+        # Set last: `snapshot` reads `_snapshot` without the lock once `_jobs` is set
+        self._jobs = jobs
+
+    def _start_listener(self):
+        if not self.listen or self._listener is not None:
+            return
+        try:
+            self._listener = self.source.listen(self._on_event)
+            if self._listener is not None:
+                logger.info("Listening for job catalogue changes.")
+        except Exception as e:
+            logger.error("Could not listen for job changes, using TTL refreshes: %s", e)
+            self._listener = None
+
+    def _on_event(self, event_type, path, data):
+        """
+        Applies a Firebase streaming event ('put' or 'patch' at `path`) to the snapshot.
+        """
+        parts = [part for part in (path or '/').split('/') if part]
+        with self._lock:
+            jobs = dict(self._jobs or {})
+            if not parts:
+                if event_type == 'put':
+                    jobs = {job_id: job for job_id, job in (data or {}).items() if isinstance(job, dict)}
+                else:  # 'patch' replaces the listed children
+                    for job_id, job in (data or {}).items():
+                        if isinstance(job, dict):
+                            jobs[job_id] = job
+                        else:
+                            jobs.pop(job_id, None)
+            else:
+                job_id, field_path = parts[0], parts[1:]
+                if not field_path:
+                    if event_type == 'put':
+                        if isinstance(data, dict):
+                            jobs[job_id] = data
+                        else:
+                            jobs.pop(job_id, None)
+                    elif isinstance(data, dict):
+                        jobs[job_id] = dict(jobs.get(job_id, {}), **data)
+                else:
+                    job = dict(jobs.get(job_id, {}))
+                    if event_type == 'put' and len(field_path) == 1 and data is None:
+                        job.pop(field_path[0], None)
+                    elif event_type == 'put':
+                        job[field_path[0]] = data if len(field_path) == 1 else _set_nested(job.get(field_path[0]), field_path[1:], data)
+                    elif isinstance(data, dict) and len(field_path) == 1:
+                        job[field_path[0]] = dict(job.get(field_path[0]) or {}, **data)
+                    jobs[job_id] = job
+            self._set_jobs(jobs)
+            self._fetched_at = time.time()
+        logger.debug("Job catalogue %s event at %s applied.", event_type, path)
+
+    def close(self):
+        with self._lock:
+            if self._listener is not None:
+                self._listener.close()
+                self._listener = None
+
+    def __len__(self):
+        return len(self._jobs or {})
+
+
+def _set_nested(value, path, data):
+    """
+    Returns a copy of the nested dict `value` with `data` set at `path`.
+    """
+    value = dict(value) if isinstance(value, dict) else {}
+    if len(path) == 1:
+        value[path[0]] = data
+    else:
+        value[path[0]] = _set_nested(value.get(path[0]), path[1:], data)
+    return value
+
+
+def default_job_source():
+    """
+    The local JSON file if JOBS_LOCAL_PATH is set, Firebase otherwise.
+    """
+    if JOBS_LOCAL_PATH:
+        logger.info("Reading jobs from local file '%s' instead of Firebase.", JOBS_LOCAL_PATH)
+        return LocalJsonJobSource(JOBS_LOCAL_PATH)
+    return FirebaseJobSource()
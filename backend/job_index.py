@@ -0,0 +1,265 @@
+# backend/job_index.py
+# Persistent, precomputed index of job skill tokens.
+# Each job's 'Required_Skills' text is preprocessed once and stored together with
+# a hash of the text, so a job only has to go through spaCy again when it changes.
+# An inverted index (token -> Job_IDs) is kept alongside so scoring only touches
+# jobs that share at least one token with the resume.
+
+import hashlib
+import heapq
+import json
+import logging
+import os
+import threading
+
+from instrumentation import timed
+
+logger = logging.getLogger(__name__)
+
+JOB_INDEX_PATH = os.environ.get('JOB_INDEX_PATH', 'cache/job_index.json')
+# Bump this whenever preprocessing changes, so stale token sets on disk are discarded
+INDEX_FORMAT_VERSION = 1
+
+
+def content_hash(text):
+    """
+    Returns a stable SHA-256 hex digest for a piece of job text.
+    """
+    return hashlib.sha256((text or "").encode('utf-8')).hexdigest()
+
+
+class JobIndex:
+    """
+    Stores the preprocessed skill token set of every job, keyed by Job_ID.
+    Each entry remembers the content hash of the text it was built from, so
+    `sync` only reprocesses jobs that are new or whose text has changed.
+    The index is saved to a JSON file so it survives restarts.
+    """
+
+    def __init__(self, path=JOB_INDEX_PATH, text_field='Required_Skills'):
+        self.path = path
+        self.text_field = text_field
+        self._entries = {}  # Job_ID -> {"hash": str, "tokens": set}
+        self._postings = {}  # token -> set of Job_IDs containing it
+        self._lock = threading.RLock()
+        self.version = 0  # Bumped whenever the indexed tokens change
+        self._bulk_matcher = None  # (version, Job_IDs, BulkSkillMatcher) of the last bulk_matcher call
+        self.load()
+
+    def load(self):
+        """
+        Loads the index from disk. A missing or unreadable file starts an empty index.
+        """
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                raw = json.load(f)
+            if raw.get("version") != INDEX_FORMAT_VERSION or raw.get("text_field") != self.text_field:
+                logger.warning("Job index at '%s' is from an older format. Rebuilding it.", self.path)
+                return
+            with self._lock:
+                self._entries = {
+                    job_id: {"hash": entry["hash"], "tokens": set(entry["tokens"])}
+                    for job_id, entry in raw.get("jobs", {}).items()
+                }
+                self._rebuild_postings()
+                self.version += 1
+            logger.info("Job index loaded from '%s' (%s jobs).", self.path, len(self._entries))
+        except Exception as e:
+            logger.error("Error loading job index from %s: %s. Starting with an empty index.", self.path, e)
+            self._entries = {}
+            self._postings = {}
+
+    def save(self):
+        """
+        Writes the index to disk atomically (write to a temp file, then rename).
+        """
+        if not self.path:
+            return
+        with self._lock:
+            raw = {
+                "version": INDEX_FORMAT_VERSION,
+                "text_field": self.text_field,
+                "jobs": {
+                    job_id: {"hash": entry["hash"], "tokens": sorted(entry["tokens"])}
+                    for job_id, entry in self._entries.items()
+                },
+            }
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(raw, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error("Error saving job index to %s: %s", self.path, e)
+
+    def sync(self, jobs, preprocess_batch, prune=True):
+        """
+        Brings the index up to date with a list of job dicts.
+
+        Args:
+            jobs (list of dict): Jobs with a 'Job_ID' and the indexed text field.
+            preprocess_batch (callable): Turns a list of texts into a list of space-separated
+                                         token strings (normally match_percentage.preprocess_texts).
+            prune (bool): Drop indexed jobs that are no longer in `jobs`.
+
+        Returns:
+            int: The number of jobs that had to be (re)processed.
+        """
+        with self._lock:
+            seen = set()
+            changed = []  # (Job_ID, hash, text) of new or modified jobs
+            for job in jobs:
+                job_id = job.get("Job_ID")
+                if not job_id:
+                    continue
+                seen.add(job_id)
+                text = job.get(self.text_field, "") or ""
+                digest = content_hash(text)
+                entry = self._entries.get(job_id)
+                if entry is not None and entry["hash"] == digest:
+                    continue
+                changed.append((job_id, digest, text))
+
+            # All changed jobs are preprocessed together in one batch
+            processed_texts = preprocess_batch([text for _, _, text in changed]) if changed else []
+            for (job_id, digest, _), processed in zip(changed, processed_texts):
+                entry = self._entries.get(job_id)
+                if entry is not None:
+                    self._remove_postings(job_id, entry["tokens"])
+                tokens = set(processed.split())
+                self._entries[job_id] = {"hash": digest, "tokens": tokens}
+                self._add_postings(job_id, tokens)
+            updated = len(changed)
+
+            removed = 0
+            if prune:
+                for job_id in list(self._entries):
+                    if job_id not in seen:
+                        self._remove_postings(job_id, self._entries.pop(job_id)["tokens"])
+                        removed += 1
+
+            if updated or removed:
+                self.version += 1
+                logger.info("Job index updated: %s jobs (re)processed, %s removed.", updated, removed)
+                self.save()
+        return updated
+
+    def _add_postings(self, job_id, tokens):
+        for token in tokens:
+            self._postings.setdefault(token, set()).add(job_id)
+
+    def _remove_postings(self, job_id, tokens):
+        for token in tokens:
+            posting = self._postings.get(token)
+            if posting is None:
+                continue
+            posting.discard(job_id)
+            if not posting:
+                del self._postings[token]
+
+    def _rebuild_postings(self):
+        self._postings = {}
+        for job_id, entry in self._entries.items():
+            self._add_postings(job_id, entry["tokens"])
+
+    def overlap_counts(self, resume_tokens):
+        """
+        Walks the postings of the resume tokens and counts, per job, how many
+        resume tokens it contains. Jobs without any overlap are never visited.
+
+        Returns:
+            dict: Job_ID -> number of shared tokens.
+        """
+        counts = {}
+        with self._lock:
+            for token in resume_tokens:
+                for job_id in self._postings.get(token, ()):
+                    counts[job_id] = counts.get(job_id, 0) + 1
+        return counts
+
+    @timed('scoring')
+    def search(self, resume_tokens, top_k=None, min_score=None, include_unmatched=True):
+        """
+        Scores the indexed jobs against a resume token set using the postings lists.
+        The score is the same as the plain skill matcher:
+        (shared tokens / job tokens) * 100, rounded to 2 decimals.
+        Jobs with no overlap score 0.0 and, like in the plain matcher, are returned
+        unless `min_score` is above 0 (they are only walked when they are needed).
+
+        Args:
+            resume_tokens (set of str): Preprocessed resume tokens.
+            top_k (int, optional): Only return the best `top_k` jobs (heap-selected).
+            min_score (float, optional): Drop jobs scoring below this percentage.
+            include_unmatched (bool): Set to False to leave jobs with no overlap out.
+
+        Returns:
+            list of tuple: (Job_ID, percentage, common token set), best first.
+                           Ties are broken by Job_ID.
+        """
+        resume_tokens = set(resume_tokens)
+
+        def rank_key(item):
+            return (-item[1], item[0])
+
+        with self._lock:
+            counts = self.overlap_counts(resume_tokens)
+            scored = []
+            for job_id, count in counts.items():
+                job_tokens = self._entries[job_id]["tokens"]
+                percentage = round((count / len(job_tokens)) * 100, 2)
+                if min_score is not None and percentage < min_score:
+                    continue
+                scored.append((job_id, percentage))
+
+            if top_k is not None:
+                scored = heapq.nsmallest(top_k, scored, key=rank_key)
+            else:
+                scored.sort(key=rank_key)
+
+            # Jobs with no overlap rank last, by Job_ID
+            if include_unmatched and (min_score is None or min_score <= 0):
+                needed = len(self._entries) if top_k is None else top_k - len(scored)
+                if needed > 0:
+                    unmatched = (job_id for job_id in self._entries if job_id not in counts)
+                    scored.extend((job_id, 0.0) for job_id in heapq.nsmallest(needed, unmatched))
+
+            return [
+                (job_id, percentage, resume_tokens & self._entries[job_id]["tokens"])
+                for job_id, percentage in scored
+            ]
+
+    def bulk_matcher(self, job_ids=None):
+        """
+        Returns a `bulk_match.BulkSkillMatcher` over the indexed token sets of `job_ids`
+        (every indexed job if None), for scoring many resumes at once.
+        The matcher is reused until the index or the requested Job_IDs change.
+        """
+        from bulk_match import BulkSkillMatcher
+
+        with self._lock:
+            job_ids = list(self._entries) if job_ids is None else [job_id for job_id in job_ids if job_id in self._entries]
+            cached = self._bulk_matcher
+            if cached is not None and cached[0] == self.version and cached[1] == job_ids:
+                return cached[2]
+            matcher = BulkSkillMatcher([self._entries[job_id]["tokens"] for job_id in job_ids], job_ids)
+            self._bulk_matcher = (self.version, job_ids, matcher)
+            return matcher
+
+    def get_tokens(self, job_id):
+        """
+        Returns the preprocessed token set for a job, or an empty set if it is not indexed.
+        """
+        with self._lock:
+            entry = self._entries.get(job_id)
+            return set(entry["tokens"]) if entry else set()
+
+    def __contains__(self, job_id):
+        return job_id in self._entries
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,162 @@
+# backend/job_queue.py
+# In-process queue for long-running matching work.
+# A request submits a task and gets a job ID back immediately; a small set of worker
+# threads runs the tasks in the background. Tasks report progress and partial results
+# on their `MatchJob`, which clients poll through the API. Finished jobs are kept for
+# MATCH_JOB_TTL_SECONDS. Nothing is persisted: jobs are lost when the process restarts.
+
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# Background worker threads (each runs one job at a time)
+MATCH_QUEUE_WORKERS = int(os.environ.get('MATCH_QUEUE_WORKERS', 2))
+# Jobs that may wait in the queue before new submissions are refused
+MATCH_QUEUE_MAX_PENDING = int(os.environ.get('MATCH_QUEUE_MAX_PENDING', 100))
+# How long finished jobs (and their results) stay available
+MATCH_JOB_TTL_SECONDS = int(os.environ.get('MATCH_JOB_TTL_SECONDS', 60 * 60))
+
+
+class QueueFullError(RuntimeError):
+    """
+    Raised by `JobQueue.submit` when too many jobs are already waiting.
+    """
+
+
+class MatchJob:
+    """
+    Status, progress and (partial) results of one queued task.
+    Status goes 'queued' -> 'running' -> 'done' or 'failed'.
+    """
+
+    def __init__(self, total=0):
+        self.id = uuid.uuid4().hex
+        self.status = 'queued'
+        self.total = total
+        self.done = 0
+        self.results = []
+        self.errors = []
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._lock = threading.Lock()
+
+    def add_result(self, result):
+        """
+        Records one finished item (counts towards progress).
+        """
+        with self._lock:
+            self.results.append(result)
+            self.done += 1
+
+    def add_error(self, error):
+        """
+        Records one failed item (counts towards progress).
+        """
+        with self._lock:
+            self.errors.append(error)
+            self.done += 1
+
+    def to_dict(self, include_results=True):
+        """
+        Returns a JSON-serializable snapshot of the job.
+        """
+        with self._lock:
+            data = {
+                "job_id": self.id,
+                "status": self.status,
+                "progress": {"done": self.done, "total": self.total},
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+            }
+            if include_results:
+                data["results"] = list(self.results)
+            if self.errors:
+                data["errors"] = list(self.errors)
+            if self.error:
+                data["error"] = self.error
+            return data
+
+
+class JobQueue:
+    """
+    Runs submitted tasks on background threads. The threads are started on the first submit.
+    """
+
+    def __init__(self, workers=MATCH_QUEUE_WORKERS, max_pending=MATCH_QUEUE_MAX_PENDING, ttl=MATCH_JOB_TTL_SECONDS):
+        self.workers = max(1, workers)
+        self.ttl = ttl
+        self._queue = queue.Queue(maxsize=max(1, max_pending))
+        self._jobs = {}  # job ID -> MatchJob
+        self._lock = threading.Lock()
+        self._threads = []
+
+    def submit(self, task, total=0):
+        """
+        Queues `task(job)` and returns its `MatchJob` right away.
+        The task reports progress through `job.add_result` / `job.add_error`.
+
+        Raises:
+            QueueFullError: If MATCH_QUEUE_MAX_PENDING jobs are already waiting.
+        """
+        job = MatchJob(total)
+        with self._lock:
+            self._prune()
+            self._start_workers()
+            try:
+                self._queue.put_nowait((job, task))
+            except queue.Full:
+                raise QueueFullError(f"More than {self._queue.maxsize} matching jobs are waiting")
+            self._jobs[job.id] = job
+        logger.info("Queued matching job %s (%s items).", job.id, total)
+        return job
+
+    def get(self, job_id):
+        """
+        Returns the `MatchJob` for `job_id`, or None if it is unknown or expired.
+        """
+        with self._lock:
+            self._prune()
+            return self._jobs.get(job_id)
+
+    def _start_workers(self):
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._work, name=f"match-queue-{len(self._threads)}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _work(self):
+        while True:
+            job, task = self._queue.get()
+            job.status = 'running'
+            job.started_at = time.time()
+            try:
+                task(job)
+                job.status = 'done'
+            except Exception as e:
+                logger.exception("Matching job %s failed: %s", job.id, e)
+                job.error = f"{type(e).__name__}: {e}"
+                job.status = 'failed'
+            finally:
+                job.finished_at = time.time()
+                self._queue.task_done()
+            logger.info("Matching job %s %s in %.1f s", job.id, job.status, job.finished_at - job.started_at)
+
+    def _prune(self):
+        """
+        Forgets finished jobs older than the TTL (called with the lock held).
+        """
+        cutoff = time.time() - self.ttl
+        expired = [job_id for job_id, job in self._jobs.items() if job.finished_at is not None and job.finished_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def __len__(self):
+        return self._queue.qsize()
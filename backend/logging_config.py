@@ -0,0 +1,40 @@
+# backend/logging_config.py
+# Logging setup for the backend.
+# Every module logs through `logging.getLogger(__name__)`. The global level comes from
+# LOG_LEVEL, and individual modules can be raised or lowered with LOG_LEVELS, e.g.
+#   LOG_LEVELS="match_percentage=DEBUG,job_index=WARNING"
+# Token-level output in match_percentage is logged at DEBUG and is skipped entirely
+# (no formatting, no loops) unless DEBUG is enabled for that module.
+
+import logging
+import os
+
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+LOG_LEVELS = os.environ.get('LOG_LEVELS', '')
+LOG_FORMAT = os.environ.get('LOG_FORMAT', '%(asctime)s %(levelname)s [%(name)s] %(message)s')
+
+
+def parse_module_levels(spec):
+    """
+    Parses "module=LEVEL,other=LEVEL" into a dict of logger name -> level name.
+    Malformed entries are ignored.
+    """
+    levels = {}
+    for item in spec.split(','):
+        name, sep, level = item.partition('=')
+        if sep and name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def configure_logging(level=LOG_LEVEL, module_levels=LOG_LEVELS):
+    """
+    Configures the root logger and the per-module levels. Safe to call more than once.
+    """
+    logging.basicConfig(level=level.upper(), format=LOG_FORMAT)
+    logging.getLogger().setLevel(level.upper())
+    for name, module_level in parse_module_levels(module_levels).items():
+        try:
+            logging.getLogger(name).setLevel(module_level)
+        except ValueError:
+            logging.getLogger(__name__).warning("Ignoring unknown log level %r for %s", module_level, name)
@@ -1,89 +1,272 @@
 # backend/match_percentage.py
+# NLP models (SentenceTransformer, SpaCy, NLTK data) are loaded lazily on first use,
+# so importing this module is fast and works without network access. Call `warm_up()`
+# to load everything up front (the app does this in a background thread at startup).
 
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from sentence_transformers import SentenceTransformer
+import time
+_IMPORT_STARTED = time.perf_counter()
+
+import logging
+import os
 import re
+import threading
+from bisect import bisect_right
 import numpy as np
 import nltk
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
-import spacy
+from embedding_store import JobEmbeddingStore, text_hash
+from ann_index import JobAnnIndex
+from tfidf_model import CatalogueTfidfModel, pairwise_similarities
+from resume_cache import resume_cache, sha256_text
+from instrumentation import stage, timed
+
+logger = logging.getLogger(__name__)
+
+# Offline mode: never try to download NLTK data, SpaCy or transformer models
+MATCHER_OFFLINE = os.environ.get('MATCHER_OFFLINE', '').lower() in ('1', 'true', 'yes')
+if MATCHER_OFFLINE:
+    # Must be set before huggingface_hub is imported by sentence_transformers
+    os.environ.setdefault('HF_HUB_OFFLINE', '1')
+    os.environ.setdefault('TRANSFORMERS_OFFLINE', '1')
+
+# Load a pre-trained sentence transformer model for semantic similarity
+SENTENCE_MODEL_NAME = 'all-MiniLM-L6-v2'
+
+# Only tokenization, lexical flags (is_alpha/is_stop/...) and lemmas are used, so the
+# dependency parser and NER are excluded. The lemmatizer still needs tok2vec, tagger
+# and attribute_ruler for POS tags, so those stay in the pipeline.
+SPACY_EXCLUDED_COMPONENTS = ['parser', 'ner']
+# Batch settings for nlp.pipe (override through environment variables)
+SPACY_BATCH_SIZE = int(os.environ.get('SPACY_BATCH_SIZE', 64))
+SPACY_N_PROCESS = int(os.environ.get('SPACY_N_PROCESS', 1))
+
+# NLTK resources used by the fallback preprocessing: (download name, nltk.data path)
+NLTK_RESOURCES = [
+    ('stopwords', 'corpora/stopwords'),
+    ('wordnet', 'corpora/wordnet'),
+    ('punkt', 'tokenizers/punkt'),
+]
+
+# --- Lazily loaded NLP resources ---
+# Each resource is loaded once per process, the first time it is needed, and then
+# shared by all request threads. `_load_lock` makes sure concurrent first requests
+# don't load the same model twice.
+_load_lock = threading.RLock()
+_resources = {}
+# Seconds spent loading each resource, plus import time and the first matching call
+load_timings = {}
+
+def _load_once(name, loader):
+    """
+    Returns the cached resource `name`, calling `loader` the first time.
+    A loader returning None (load failure) is cached too, so it is not retried per request.
+    """
+    if name in _resources:
+        return _resources[name]
+    with _load_lock:
+        if name not in _resources:
+            started = time.perf_counter()
+            _resources[name] = loader()
+            load_timings[name] = time.perf_counter() - started
+            logger.info("Loaded %s in %.1f ms", name, load_timings[name] * 1000)
+    return _resources[name]
 
 # --- NLTK Data Download (Run once) ---
 def download_nltk_data():
     """
-    Ensures necessary NLTK data is downloaded.
-    This function will attempt to download the data if it's not found.
+    Ensures necessary NLTK data is available.
+    Data that is already installed is not downloaded again, and nothing is
+    downloaded in offline mode.
     """
-    print("Checking and downloading NLTK data...")
+    for download_name, data_path in NLTK_RESOURCES:
+        try:
+            nltk.data.find(data_path)
+            continue
+        except LookupError:
+            pass
+        if MATCHER_OFFLINE:
+            logger.warning("NLTK '%s' data is missing and offline mode is on; not downloading it.", download_name)
+            continue
+        try:
+            nltk.download(download_name, quiet=True)
+            logger.info("NLTK '%s' data downloaded.", download_name)
+        except Exception as e:
+            logger.error("Error downloading NLTK '%s' data: %s", download_name, e)
+    return True
+
+def _load_sentence_model():
     try:
-        nltk.download('stopwords', quiet=True)
-        print("NLTK 'stopwords' data checked/downloaded.")
+        from sentence_transformers import SentenceTransformer
+        model = SentenceTransformer(SENTENCE_MODEL_NAME)
+        logger.info("SentenceTransformer model loaded successfully.")
+        return model
     except Exception as e:
-        print(f"Error downloading NLTK 'stopwords' data: {e}")
+        logger.error("Error loading SentenceTransformer model: %s", e)
+        if not MATCHER_OFFLINE:
+            logger.error("Please ensure you have an active internet connection for the first run to download the model.")
+        # model stays None if loading fails to trigger fallback
+        return None
 
+def _load_spacy():
+    # Load SpaCy model for advanced NLP (tokenization, lemmatization)
+    try:
+        import spacy
+    except ImportError as e:
+        logger.error("SpaCy is not installed: %s", e)
+        return None
     try:
-        nltk.download('wordnet', quiet=True)
-        print("NLTK 'wordnet' data checked/downloaded.")
+        nlp = spacy.load('en_core_web_sm', exclude=SPACY_EXCLUDED_COMPONENTS)
+        logger.info("SpaCy 'en_core_web_sm' model loaded successfully.")
+        return nlp
+    except OSError:
+        if MATCHER_OFFLINE:
+            logger.error("SpaCy 'en_core_web_sm' model not found and offline mode is on. Using the NLTK fallback.")
+            return None
+        logger.warning("SpaCy 'en_core_web_sm' model not found. Attempting to download it now...")
+    try:
+        spacy.cli.download('en_core_web_sm')
+        nlp = spacy.load('en_core_web_sm', exclude=SPACY_EXCLUDED_COMPONENTS)
+        logger.info("SpaCy 'en_core_web_sm' model downloaded and loaded.")
+        return nlp
     except Exception as e:
-        print(f"Error downloading NLTK 'wordnet' data: {e}")
+        logger.error("Error downloading or loading SpaCy model: %s", e)
+        logger.error("SpaCy features (advanced tokenization, lemmatization) will be unavailable.")
+        return None
 
+def _load_stop_words():
+    # Initialize stop words - Re-introducing standard stop words
+    _load_once('nltk_data', download_nltk_data)
     try:
-        nltk.download('punkt', quiet=True)
-        print("NLTK 'punkt' data checked/downloaded.")
-    except Exception as e:
-        print(f"Error downloading NLTK 'punkt' data: {e}")
+        from nltk.corpus import stopwords
+        return set(stopwords.words('english'))
+    except LookupError as e:
+        logger.error("NLTK stopwords are unavailable, no stop words will be filtered: %s", e)
+        return set()
 
-download_nltk_data() # Call this function once when the module is imported
+def _load_lemmatizer():
+    _load_once('nltk_data', download_nltk_data)
+    from nltk.stem import WordNetLemmatizer
+    return WordNetLemmatizer()
 
-# --- Global NLP Resources ---
-# Load a pre-trained sentence transformer model for semantic similarity
-model = None # Initialize model to None
-try:
-    model = SentenceTransformer('all-MiniLM-L6-v2')
-    print("SentenceTransformer model loaded successfully.")
-except Exception as e:
-    print(f"Error loading SentenceTransformer model: {e}")
-    print("Please ensure you have an active internet connection for the first run to download the model.")
-    # model remains None if loading fails to trigger fallback
-
-# Load SpaCy model for advanced NLP (tokenization, lemmatization)
-nlp = None
-try:
-    nlp = spacy.load('en_core_web_sm')
-    print("SpaCy 'en_core_web_sm' model loaded successfully.")
-except OSError:
-    print("SpaCy 'en_core_web_sm' model not found. Attempting to download it now...")
-    try:
-        spacy.cli.download('en_core_web_sm')
-        nlp = spacy.load('en_core_web_sm')
-        print("SpaCy 'en_core_web_sm' model downloaded and loaded.")
-    except Exception as e:
-        print(f"Error downloading or loading SpaCy model: {e}")
-        print("SpaCy features (advanced tokenization, lemmatization) will be unavailable.")
+def get_model():
+    """
+    Returns the shared SentenceTransformer model, or None if it could not be loaded.
+    """
+    return _load_once('sentence_model', _load_sentence_model)
+
+def get_nlp():
+    """
+    Returns the shared SpaCy pipeline, or None if it could not be loaded.
+    """
+    return _load_once('spacy', _load_spacy)
+
+def get_stop_words():
+    """
+    Returns the shared set of NLTK English stop words.
+    """
+    return _load_once('stop_words', _load_stop_words)
+
+def get_lemmatizer():
+    """
+    Returns the shared NLTK WordNet lemmatizer (used by the NLTK fallback).
+    """
+    return _load_once('lemmatizer', _load_lemmatizer)
 
-# Initialize stop words - Re-introducing standard stop words
-stop_words = set(stopwords.words('english'))
+def warm_up(load_model=True):
+    """
+    Loads every NLP resource now instead of on the first request.
+
+    Args:
+        load_model (bool): Also load the SentenceTransformer model.
+
+    Returns:
+        dict: Seconds spent loading each resource.
+    """
+    started = time.perf_counter()
+    get_stop_words()
+    get_lemmatizer()
+    get_nlp()
+    if load_model:
+        get_model()
+    logger.info("Matcher warm-up finished in %.1f ms", (time.perf_counter() - started) * 1000)
+    return dict(load_timings)
+
+def _report_first_call(name, started):
+    """
+    Logs the latency of the first matching call in this process (which includes lazy model loading).
+    """
+    if 'first_call' in load_timings:
+        return
+    with _load_lock:
+        if 'first_call' not in load_timings:
+            load_timings['first_call'] = time.perf_counter() - started
+            logger.info("First matching call (%s) took %.1f ms", name, load_timings['first_call'] * 1000)
 
-lemmatizer = WordNetLemmatizer()
+# Precomputed, normalized job description embeddings (keyed by Job_ID and text hash)
+job_embedding_store = JobEmbeddingStore(model_name=SENTENCE_MODEL_NAME)
+# TF-IDF vectors of the job catalogue (and nothing else, see `sync_catalogue_tfidf`),
+# used when the SentenceTransformer is unavailable
+catalogue_tfidf_model = CatalogueTfidfModel()
 
 # --- Helper Functions ---
 
+# PII patterns (emails, common phone number formats, URLs), compiled once.
+# They are applied one after the other, in this order: a single alternation is not
+# equivalent, because a URL or email match can swallow the start of an adjacent
+# phone number and leave the rest of it in the text.
+# Names are harder to filter accurately without a custom NER model,
+# so we avoid generic name removal to prevent false positives.
+_PII_PATTERNS = [
+    re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'),      # Email addresses
+    re.compile(r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b'),  # Phone numbers
+    re.compile(r'http\S+|www.\S+'),                                         # URLs
+]
+
+def _scrub(text):
+    for pattern in _PII_PATTERNS:
+        text = pattern.sub('', text)
+    return text
+
+class ScrubbedText(str):
+    """
+    A string that has already been through `filter_pii`.
+    `filter_pii` returns these and passes them through untouched, so text scrubbed
+    once at the start of a request is not scrubbed again by every later stage.
+    """
+    __slots__ = ()
+
+@timed('pii')
 def filter_pii(text):
     """
     Filters out personally identifiable information (PII) from the text.
-    Focuses on emails and phone numbers using regex.
-    Names are harder to filter accurately without a custom NER model,
-    so we avoid generic name removal to prevent false positives.
-    """
-    # Remove email addresses
-    text = re.sub(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', '', text)
-    # Remove common phone number patterns (adjust regex for specific formats if needed)
-    text = re.sub(r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b', '', text)
-    # Remove URLs (already in clean_text, but good to have here too for PII context)
-    text = re.sub(r'http\S+|www.\S+', '', text)
-    return text
+    Focuses on emails, phone numbers and URLs.
+
+    Returns:
+        ScrubbedText: The filtered text (returned as-is if it was already scrubbed).
+    """
+    if isinstance(text, ScrubbedText):
+        return text
+    return ScrubbedText(_scrub(text))
+
+@timed('pii')
+def filter_pii_batch(texts):
+    """
+    Batch version of `filter_pii` for job lists.
+    Identical texts (e.g. jobs sharing a Required_Skills string) are scrubbed once.
+
+    Returns:
+        list of ScrubbedText: One filtered text per input text.
+    """
+    scrubbed = {}
+    results = []
+    for text in texts:
+        if isinstance(text, ScrubbedText):
+            results.append(text)
+            continue
+        filtered = scrubbed.get(text)
+        if filtered is None:
+            filtered = scrubbed[text] = ScrubbedText(_scrub(text))
+        results.append(filtered)
+    return results
 
 def preprocess_text(text):
     """
@@ -92,37 +275,63 @@ def preprocess_text(text):
     Re-introduces standard stop word filtering.
     Removes the minimum length filter to allow short but important keywords.
     """
-    print(f"--- Preprocessing Text (first 50 chars): '{text[:50]}' ---")
-    # Apply PII filtering before further processing
-    text = filter_pii(text)
+    return preprocess_texts([text])[0]
 
-    if nlp is None:
-        print("Using NLTK fallback for preprocessing.")
-        text = text.lower()
-        # Allow alphanumeric, spaces, and common tech skill characters: ., #, +, -
-        text = re.sub(r'[^a-z0-9\s\.\#\+\-]', '', text) 
-        text = re.sub(r'\s+', ' ', text).strip()
-        tokens = nltk.word_tokenize(text)
-        print(f"NLTK Raw Tokens: {tokens}")
-        
-        processed_tokens = []
-        for word in tokens:
-            # Check if word contains any alphanumeric character or allowed symbol
-            if any(c.isalnum() or c in ['.', '#', '+', '-'] for c in word):
-                lemmatized_word = lemmatizer.lemmatize(word)
-                # Re-introducing stop word check
-                if lemmatized_word not in stop_words:
-                    # Removed len(lemmatized_word) > 1 filter to keep short, significant words
-                    processed_tokens.append(lemmatized_word)
-        print(f"NLTK Processed Tokens: {processed_tokens}")
-        return " ".join(processed_tokens)
-
-    print("Using SpaCy for preprocessing.")
-    doc = nlp(text.lower())
+def preprocess_texts(texts, batch_size=None, n_process=None):
+    """
+    Batch version of `preprocess_text`.
+    Runs all texts through a single `nlp.pipe` call, which is much faster than
+    calling the pipeline once per string.
+
+    Args:
+        texts (list of str): Raw texts to preprocess.
+        batch_size (int, optional): nlp.pipe batch size (defaults to SPACY_BATCH_SIZE).
+        n_process (int, optional): Number of processes for nlp.pipe (defaults to SPACY_N_PROCESS).
+
+    Returns:
+        list of str: Space-separated lemma strings, one per input text.
+    """
+    # Apply PII filtering before further processing (skipped for already scrubbed text)
+    texts = filter_pii_batch(texts)
+    if not texts:
+        return []
+
+    started = time.perf_counter()
+    nlp = get_nlp()
+    with stage('preprocess'):
+        if nlp is None:
+            processed = [_nltk_preprocess(text) for text in texts]
+            backend = "NLTK fallback"
+        else:
+            docs = nlp.pipe(
+                (text.lower() for text in texts),
+                batch_size=batch_size or SPACY_BATCH_SIZE,
+                n_process=n_process or SPACY_N_PROCESS,
+            )
+            processed = [" ".join(_filter_spacy_tokens(doc)) for doc in docs]
+            backend = "SpaCy"
+    logger.debug("preprocess_texts: %d texts with %s in %.1f ms", len(texts), backend, (time.perf_counter() - started) * 1000)
+    return processed
+
+def _filter_spacy_tokens(doc):
+    """
+    Keeps the lemmas of the relevant tokens in a SpaCy Doc.
+    """
+    tokens = [token.lemma_ for token in _relevant_spacy_tokens(doc)] # Use lemma for root form of the word
+    logger.debug("SpaCy processed tokens: %s", tokens)
+    return tokens
+
+def _relevant_spacy_tokens(doc):
+    """
+    Returns the relevant SpaCy tokens of a Doc (with their character offsets).
+    """
+    debug = logger.isEnabledFor(logging.DEBUG)
+    if debug:
+        logger.debug("Preprocessing text (first 50 chars): %r", doc.text[:50])
     tokens = []
-    print(f"SpaCy Raw Tokens:")
     for token in doc:
-        print(f"  - '{token.text}' (is_alpha: {token.is_alpha}, is_punct: {token.is_punct}, is_stop: {token.is_stop})")
+        if debug:
+            logger.debug("  - %r (is_alpha: %s, is_punct: %s, is_stop: %s)", token.text, token.is_alpha, token.is_punct, token.is_stop)
         # Keep tokens that are alphanumeric OR contain allowed tech symbols, not just punctuation
         # Also ensure they are not just whitespace
         is_tech_skill_char = any(c in ['.', '#', '+', '-'] for c in token.text)
@@ -130,9 +339,340 @@ def preprocess_text(text):
         # Re-introducing token.is_stop check
         if (token.is_alpha or token.is_digit or is_tech_skill_char) and not token.is_punct and not token.is_stop and token.text.strip():
             # Removed min length filter: len(token.text.strip()) > 1
-            tokens.append(token.lemma_) # Use lemma for root form of the word
-    print(f"SpaCy Processed Tokens: {tokens}")
-    return " ".join(tokens)
+            tokens.append(token)
+    return tokens
+
+def _nltk_preprocess(text):
+    """
+    NLTK fallback for preprocessing when the SpaCy model is unavailable.
+    """
+    text = text.lower()
+    # Allow alphanumeric, spaces, and common tech skill characters: ., #, +, -
+    text = re.sub(r'[^a-z0-9\s\.\#\+\-]', '', text) 
+    text = re.sub(r'\s+', ' ', text).strip()
+    tokens = nltk.word_tokenize(text)
+    logger.debug("NLTK raw tokens: %s", tokens)
+    
+    lemmatizer = get_lemmatizer()
+    stop_words = get_stop_words()
+    processed_tokens = []
+    for word in tokens:
+        # Check if word contains any alphanumeric character or allowed symbol
+        if any(c.isalnum() or c in ['.', '#', '+', '-'] for c in word):
+            lemmatized_word = lemmatizer.lemmatize(word)
+            # Re-introducing stop word check
+            if lemmatized_word not in stop_words:
+                # Removed len(lemmatized_word) > 1 filter to keep short, significant words
+                processed_tokens.append(lemmatized_word)
+    logger.debug("NLTK processed tokens: %s", processed_tokens)
+    return " ".join(processed_tokens)
+
+# Common section headers and their priority order (first match wins)
+SECTION_HEADERS = {
+    'skills': ['skills', 'technical skills', 'technologies', 'expertise', 'core competencies', 'proficiencies', 'key skills'],
+    'experience': ['experience', 'work experience', 'professional experience', 'employment history'],
+    'education': ['education', 'academic background', 'qualifications'],
+    'projects': ['projects', 'portfolio', 'key projects'],
+    'summary': ['summary', 'profile', 'about me', 'objective'],
+    'certifications': ['certifications', 'licenses'],
+}
+
+# How often each preprocessed section is repeated in the combined text
+SECTION_WEIGHTS = [
+    ('skills', 5), # Even higher weight for skills
+    ('experience', 2), # Double weight
+    ('projects', 1),
+    ('summary', 1),
+    ('education', 1),
+    ('certifications', 1),
+]
+
+# Section priority order (lower wins when a line mentions headers of several sections)
+SECTION_KEYS = list(SECTION_HEADERS)
+_SECTION_PRIORITY = {key: priority for priority, key in enumerate(SECTION_KEYS)}
+
+# All headers of all sections in one pattern, compiled once. Each section is a named
+# group, and the whole alternation sits in a lookahead so `finditer` reports a match at
+# every position where some header starts (overlapping headers are not swallowed).
+_SECTION_HEADER_RE = re.compile(
+    r'(?=\b(?:'
+    + '|'.join(
+        f"(?P<{key}>" + '|'.join(re.escape(h) for h in headers) + ')'
+        for key, headers in SECTION_HEADERS.items()
+    )
+    + r')\b)'
+)
+
+def detect_section_header(line):
+    """
+    Returns the section key of a header line, or None if the line mentions no header.
+    Matching is case-insensitive on whole words; if headers of several sections
+    appear, the section listed first in SECTION_HEADERS wins.
+    """
+    best = None
+    for match in _SECTION_HEADER_RE.finditer(line.lower()):
+        priority = _SECTION_PRIORITY[match.lastgroup]
+        if best is None or priority < best:
+            best = priority
+            if best == 0:
+                break
+    return SECTION_KEYS[best] if best is not None else None
+
+def _split_sections(text_without_pii):
+    """
+    Splits (PII-filtered) text into sections based on header lines.
+    Header lines themselves are not added to any section.
+
+    Returns:
+        dict: section name -> list of content lines ('other' holds lines before any header).
+    """
+    return split_sections_batch([text_without_pii])[0]
+
+def split_sections_batch(texts_without_pii):
+    """
+    Batch version of `_split_sections`.
+
+    Args:
+        texts_without_pii (list of str): PII-filtered texts.
+
+    Returns:
+        list of dict: section name -> list of content lines, one dict per text.
+    """
+    results = []
+    for text, line_labels in zip(texts_without_pii, _label_lines_batch(texts_without_pii)):
+        extracted_sections = {name: [] for name in SECTION_HEADERS}
+        extracted_sections['other'] = []
+        for line, label in zip(text.split('\n'), line_labels):
+            if label is not None:
+                extracted_sections[label].append(line.strip())
+        results.append(extracted_sections)
+    return results
+
+def _label_lines_batch(texts_without_pii):
+    """
+    Assigns every line of every text to a section.
+    The non-empty lines of all texts are lowercased and joined into one string that
+    is scanned by the header pattern once; match offsets are mapped back to lines.
+
+    Returns:
+        list of list: For each text, one entry per '\n'-separated line: the section key
+                      of a content line, or None for blank and header lines.
+    """
+    lines = []      # lowercased, stripped, non-empty lines of all texts
+    positions = []  # (text index, line number within the text) for each line
+    for i, text in enumerate(texts_without_pii):
+        for line_no, line in enumerate(text.split('\n')):
+            line_stripped = line.strip()
+            if line_stripped:
+                lines.append(line_stripped.lower())
+                positions.append((i, line_no))
+
+    line_starts = []
+    offset = 0
+    for line in lines:
+        line_starts.append(offset)
+        offset += len(line) + 1
+
+    # Best (lowest) section priority found on each line, None for content lines
+    line_priorities = [None] * len(lines)
+    for match in _SECTION_HEADER_RE.finditer('\n'.join(lines)):
+        index = bisect_right(line_starts, match.start()) - 1
+        priority = _SECTION_PRIORITY[match.lastgroup]
+        current = line_priorities[index]
+        if current is None or priority < current:
+            line_priorities[index] = priority
+
+    labels = [[None] * (text.count('\n') + 1) for text in texts_without_pii]
+    current_owner = None
+    current_section_key = 'other'
+    for (owner, line_no), priority in zip(positions, line_priorities):
+        if owner != current_owner:
+            current_owner = owner
+            current_section_key = 'other'
+        if priority is not None:
+            # If it's a header, don't add the header itself to the content, just change the section
+            current_section_key = SECTION_KEYS[priority]
+        else:
+            labels[owner][line_no] = current_section_key
+    return labels
+
+class DocumentAnalysis:
+    """
+    Everything the matchers need from one text, computed in a single SpaCy pass:
+    the PII-filtered text, its sections, the lemma tokens of the whole text and of
+    each section, the lemma set (for keyword overlap) and the section-weighted key
+    information (for embeddings).
+
+    Args:
+        text (ScrubbedText): The PII-filtered text.
+        tokens (list of str): Preprocessed lemmas of the whole text, in order.
+        section_tokens (dict): section name -> lemmas of its content lines, for every
+                               section that has at least one content line.
+    """
+    __slots__ = ('text', 'tokens', 'section_tokens', '_sections', '_lemma_set')
+
+    def __init__(self, text, tokens, section_tokens):
+        self.text = text
+        self.tokens = tokens
+        self.section_tokens = section_tokens
+        self._sections = None
+        self._lemma_set = None
+
+    @property
+    def sections(self):
+        """
+        section name -> list of content lines (computed on first access).
+        """
+        if self._sections is None:
+            self._sections = _split_sections(self.text)
+        return self._sections
+
+    @property
+    def lemma_set(self):
+        if self._lemma_set is None:
+            self._lemma_set = set(self.tokens)
+        return self._lemma_set
+
+    @property
+    def preprocessed_text(self):
+        """
+        The whole text preprocessed, as returned by `preprocess_text`.
+        """
+        return " ".join(self.tokens)
+
+    @property
+    def key_information(self):
+        """
+        Key sections combined with weighting, as returned by `extract_key_information`.
+        """
+        combined_text_parts = []
+        for sec_key, weight in SECTION_WEIGHTS:
+            if sec_key in self.section_tokens:
+                combined_text_parts.extend([" ".join(self.section_tokens[sec_key])] * weight)
+        if not combined_text_parts:
+            # Fallback to the entire preprocessed text if no specific sections were found
+            combined_text_parts.append(self.preprocessed_text)
+        return " ".join(combined_text_parts).strip()
+
+    def to_dict(self):
+        return {"tokens": self.tokens, "section_tokens": self.section_tokens}
+
+    @classmethod
+    def from_dict(cls, text, data):
+        return cls(text, data["tokens"], data["section_tokens"])
+
+# Part of the analysis cache key: bump it whenever the preprocessing itself changes
+# (token filters, lemmatization, section assignment), so analyses cached on disk by
+# an older version are not served.
+ANALYSIS_CACHE_VERSION = 1
+
+def _analysis_backend_tag():
+    """
+    Identifies the preprocessing that produces analyses right now: the SpaCy model and
+    version, or the NLTK fallback with its stop words, plus the section headers.
+    Analyses made by another backend or configuration get a different cache key.
+    """
+    nlp = get_nlp()
+    if nlp is not None:
+        meta = getattr(nlp, 'meta', None) or {}
+        backend = f"spacy-{meta.get('name', 'unknown')}-{meta.get('version', 'unknown')}"
+        config = repr(sorted(SECTION_HEADERS.items()))
+    else:
+        backend = "nltk"
+        config = repr((sorted(SECTION_HEADERS.items()), sorted(get_stop_words())))
+    return f"{backend}-{sha256_text(config)[:12]}"
+
+def analyze_documents(texts, batch_size=None, n_process=None):
+    """
+    Builds a `DocumentAnalysis` for each text.
+    Every text goes through SpaCy once, as a whole; each token is assigned to a
+    section through its character offset. Analyses are cached by the SHA-256 of the
+    PII-filtered text, so a resume or job seen before skips SpaCy. The key also carries
+    ANALYSIS_CACHE_VERSION and the preprocessing backend (see `_analysis_backend_tag`).
+
+    Args:
+        texts (list of str): Raw resume or job description texts.
+        batch_size (int, optional): nlp.pipe batch size (defaults to SPACY_BATCH_SIZE).
+        n_process (int, optional): Number of processes for nlp.pipe (defaults to SPACY_N_PROCESS).
+
+    Returns:
+        list of DocumentAnalysis: One analysis per input text.
+    """
+    started = time.perf_counter()
+    # Filter PII first from the raw text (texts scrubbed by the caller are passed through)
+    texts = filter_pii_batch(texts)
+
+    results = [None] * len(texts)
+    prefix = f"analysis:v{ANALYSIS_CACHE_VERSION}:{_analysis_backend_tag()}"
+    cache_keys = [f"{prefix}:{sha256_text(text)}" for text in texts]
+    pending = []
+    for i, key in enumerate(cache_keys):
+        cached = resume_cache.get(key)
+        if cached is not None:
+            results[i] = DocumentAnalysis.from_dict(texts[i], cached)
+        else:
+            pending.append(i)
+
+    if pending:
+        analyses = _analyze_uncached([texts[i] for i in pending], batch_size, n_process)
+        for i, analysis in zip(pending, analyses):
+            results[i] = analysis
+            resume_cache.put(cache_keys[i], analysis.to_dict())
+
+    logger.debug(
+        "analyze_documents: %d texts (%d cached) in %.1f ms",
+        len(texts), len(texts) - len(pending), (time.perf_counter() - started) * 1000,
+    )
+    return results
+
+@timed('preprocess')
+def _analyze_uncached(texts, batch_size=None, n_process=None):
+    """
+    Runs the preprocessing for `analyze_documents` (texts must already be PII-filtered).
+    """
+    all_line_labels = _label_lines_batch(texts)
+    analyses = []
+
+    nlp = get_nlp()
+    if nlp is None:
+        # The NLTK fallback has no character offsets, so it works line by line
+        for text, line_labels in zip(texts, all_line_labels):
+            tokens = []
+            section_tokens = {}
+            for line, label in zip(text.split('\n'), line_labels):
+                if not line.strip():
+                    continue
+                line_tokens = _nltk_preprocess(line).split()
+                tokens.extend(line_tokens)
+                if label is not None:
+                    section_tokens.setdefault(label, []).extend(line_tokens)
+            analyses.append(DocumentAnalysis(text, tokens, section_tokens))
+        return analyses
+
+    lowered = [text.lower() for text in texts]
+    docs = nlp.pipe(
+        lowered,
+        batch_size=batch_size or SPACY_BATCH_SIZE,
+        n_process=n_process or SPACY_N_PROCESS,
+    )
+    for text, lowered_text, line_labels, doc in zip(texts, lowered, all_line_labels, docs):
+        # Lowercasing never adds or removes newlines, so line numbers match `line_labels`
+        line_starts = []
+        offset = 0
+        for line in lowered_text.split('\n'):
+            line_starts.append(offset)
+            offset += len(line) + 1
+
+        tokens = []
+        section_tokens = {label: [] for label in line_labels if label is not None}
+        for token in _relevant_spacy_tokens(doc):
+            lemma = token.lemma_
+            tokens.append(lemma)
+            label = line_labels[bisect_right(line_starts, token.idx) - 1]
+            if label is not None:
+                section_tokens[label].append(lemma)
+        analyses.append(DocumentAnalysis(text, tokens, section_tokens))
+    return analyses
 
 def extract_key_information(text):
     """
@@ -141,91 +681,40 @@ def extract_key_information(text):
     Also ensures section headers themselves are not heavily weighted.
     This function is primarily for parsing resumes where structure is less predictable.
     """
-    print(f"\n--- Extracting Key Information from Resume (first 50 chars): '{text[:50]}' ---")
-    # 1. Filter PII first from the raw text
-    text_without_pii = filter_pii(text)
-
-    # 2. Define common section headers and their priority weights
-    section_headers = {
-        'skills': ['skills', 'technical skills', 'technologies', 'expertise', 'core competencies', 'proficiencies', 'key skills'],
-        'experience': ['experience', 'work experience', 'professional experience', 'employment history'],
-        'education': ['education', 'academic background', 'qualifications'],
-        'projects': ['projects', 'portfolio', 'key projects'],
-        'summary': ['summary', 'profile', 'about me', 'objective'],
-        'certifications': ['certifications', 'licenses'],
-    }
+    return extract_key_information_batch([text])[0]
 
-    extracted_sections = {name: [] for name in section_headers}
-    extracted_sections['other'] = []
+def extract_key_information_batch(texts):
+    """
+    Batch version of `extract_key_information`.
+    Built on `analyze_documents`, so each text goes through SpaCy once (as a whole,
+    not once per section) and a text seen before is served from the cache.
 
-    # Split text by lines to process section by section
-    lines = text_without_pii.split('\n')
-    current_section_key = 'other'
+    Args:
+        texts (list of str): Raw resume or job description texts.
 
-    for line in lines:
-        line_stripped = line.strip()
-        if not line_stripped:
-            continue
+    Returns:
+        list of str: The weighted, preprocessed key information for each text.
+    """
+    return [analysis.key_information for analysis in analyze_documents(texts)]
 
-        found_header = False
-        for sec_key, headers in section_headers.items():
-            # Check if the line is a potential section header (case-insensitive)
-            # Use word boundaries to match whole words and ensure it's a header, not just a word in a sentence
-            if any(re.search(r'\b' + re.escape(h) + r'\b', line_stripped.lower()) for h in headers):
-                # If it's a header, don't add the header itself to the content, just change the section
-                current_section_key = sec_key
-                found_header = True
-                break
-        
-        if not found_header:
-            extracted_sections[current_section_key].append(line_stripped)
 
-    # Combine extracted sections with weighting (after preprocessing each part)
-    combined_text_parts = []
-    
-    # Prioritize skills heavily (repeat preprocessed text)
-    if extracted_sections['skills']:
-        processed_skills = preprocess_text(" ".join(extracted_sections['skills']))
-        print(f"Extracted & Processed Skills Section: '{processed_skills}'")
-        combined_text_parts.extend([processed_skills] * 5) # Even higher weight for skills
-    
-    if extracted_sections['experience']:
-        processed_experience = preprocess_text(" ".join(extracted_sections['experience']))
-        combined_text_parts.extend([processed_experience] * 2) # Double weight
-
-    # Add other relevant sections with less weight
-    if extracted_sections['projects']:
-        combined_text_parts.append(preprocess_text(" ".join(extracted_sections['projects'])))
-    if extracted_sections['summary']:
-        combined_text_parts.append(preprocess_text(" ".join(extracted_sections['summary'])))
-    if extracted_sections['education']:
-        combined_text_parts.append(preprocess_text(" ".join(extracted_sections['education'])))
-    if extracted_sections['certifications']:
-        combined_text_parts.append(preprocess_text(" ".join(extracted_sections['certifications'])))
-
-    # Fallback to the entire preprocessed text if no specific sections were found
-    # or if skills section was empty, still include other processed text for context
-    if not combined_text_parts:
-        processed_full_text = preprocess_text(text_without_pii)
-        print(f"No specific sections found, using full processed text: '{processed_full_text}'")
-        combined_text_parts.append(processed_full_text)
-
-    final_extracted_text = " ".join(combined_text_parts).strip()
-    print(f"Final Extracted Key Information: '{final_extracted_text}'")
-    print(f"--- Finished Extracting Key Information ---")
-    return final_extracted_text
-
-
-def calculate_semantic_match(resume_text, job_descriptions):
+def calculate_semantic_match(resume_text, job_descriptions, job_ids=None, catalogue=False):
     """
     Calculates the semantic similarity between a resume and multiple job descriptions
     using Sentence Embeddings, after advanced pre-processing, PII filtering,
     and focusing on relevant sections.
+    Job description embeddings come from `job_embedding_store`, so only the resume
+    (and any new or changed job) has to be encoded per request.
     Also identifies matching keywords from the preprocessed text.
 
     Args:
         resume_text (str): The raw text content of the resume.
         job_descriptions (list of str): A list of raw job description texts.
+        job_ids (list of str, optional): Job_IDs for the descriptions, used as cache keys.
+                                         Descriptions without an ID are keyed by their text hash.
+        catalogue (bool): The job_ids are catalogue Job_IDs (see `sync_catalogue_tfidf`), so
+                          the TF-IDF fallback scores them with `catalogue_tfidf_model`
+                          instead of fitting a model for this request.
 
     Returns:
         tuple: A tuple containing:
@@ -235,50 +724,42 @@ def calculate_semantic_match(resume_text, job_descriptions):
               inner list contains common keywords (lemmas) found in the
               preprocessed resume and the corresponding preprocessed job description.
     """
-    # --- Step 1: PII Filtering and Key Information Extraction ---
-    # Apply PII filtering and key information extraction to resume and job descriptions
-    # For semantic matching, we still process the full job description to get context
-    processed_resume_for_embedding = extract_key_information(resume_text)
-    processed_job_descriptions_for_embedding = [extract_key_information(jd) for jd in job_descriptions]
-
-    # Combine processed texts for initial embedding generation
-    temp_combined_texts = [processed_resume_for_embedding] + processed_job_descriptions_for_embedding
+    started = time.perf_counter()
+    if job_ids is None:
+        job_ids = [None] * len(job_descriptions)
+    # --- Step 1 & 2: Semantic Similarity Calculation (Cosine Similarity with Sentence Embeddings) ---
+    if get_model() is None:
+        logger.warning("SentenceTransformer model not loaded. Falling back to TF-IDF matching for similarity.")
+        return _tfidf_match_percentage_fallback(resume_text, job_descriptions, job_ids, catalogue=catalogue)
 
-    # Handle cases where processed text might be empty for embedding (e.g., very short docs)
-    # Provide a placeholder to prevent embedding errors
-    all_processed_texts_for_embedding = [text if text.strip() else "empty document" for text in temp_combined_texts]
-
-    # --- Step 2: Semantic Similarity Calculation (Cosine Similarity with Sentence Embeddings) ---
-    if model is None:
-        print("SentenceTransformer model not loaded. Falling back to TF-IDF matching for similarity.")
-        return _tfidf_match_percentage_fallback(resume_text, job_descriptions)
+    # One analysis per text (PII filtering, sections, lemmas) shared by the embedding
+    # and keyword stages. New or changed jobs are encoded from the same cached analyses.
+    analyses = analyze_documents([resume_text] + list(job_descriptions))
+    resume_analysis = analyses[0]
+    job_analyses = analyses[1:]
 
     try:
-        embeddings = model.encode(all_processed_texts_for_embedding, convert_to_tensor=True)
+        resume_embedding = _encode_analyses([resume_analysis])[0]
+        job_embeddings = job_embedding_store.get_embeddings(job_ids, job_descriptions, _encode_for_embedding)
     except Exception as e:
-        print(f"Error encoding processed sentences with SentenceTransformer: {e}")
-        print("Falling back to TF-IDF for similarity due to embedding error.")
-        return _tfidf_match_percentage_fallback(resume_text, job_descriptions)
-
-    resume_embedding = embeddings[0].reshape(1, -1)
-    job_embeddings = embeddings[1:]
+        logger.error("Error encoding processed sentences with SentenceTransformer: %s", e)
+        logger.error("Falling back to TF-IDF for similarity due to embedding error.")
+        return _tfidf_match_percentage_fallback(resume_text, job_descriptions, job_ids, catalogue=catalogue)
 
-    semantic_similarities = cosine_similarity(resume_embedding, job_embeddings)[0]
+    # Both sides are L2-normalized, so the dot product is the cosine similarity
+    with stage('scoring'):
+        semantic_similarities = job_embeddings @ resume_embedding
     semantic_percentages = [float(round(similarity * 100, 2)) for similarity in semantic_similarities]
 
     # --- Step 3: Keyword Matching (from preprocessed text for display) ---
-    # For keyword matching, we want words that are common and meaningful after preprocessing
-    
-    # Preprocess original texts for keyword extraction (distinct from embedding preprocessing if needed)
-    # Here, we'll use the same robust preprocessing for consistency
-    preprocessed_resume_for_keywords = preprocess_text(filter_pii(resume_text))
-    preprocessed_job_descriptions_for_keywords = [preprocess_text(filter_pii(jd)) for jd in job_descriptions]
-
-    resume_words_set = set(preprocessed_resume_for_keywords.split())
+    # For keyword matching, we want words that are common and meaningful after preprocessing.
+    # The lemma sets come from the same analyses used for the embeddings.
+    resume_words_set = resume_analysis.lemma_set
+    stop_words = get_stop_words()
     all_matching_words = []
 
-    for i, preprocessed_job_text in enumerate(preprocessed_job_descriptions_for_keywords):
-        job_words_set = set(preprocessed_job_text.split())
+    for job_analysis in job_analyses:
+        job_words_set = job_analysis.lemma_set
         
         # Find common words that are not stop words and have a reasonable length
         common_words = [
@@ -289,8 +770,99 @@ def calculate_semantic_match(resume_text, job_descriptions):
         common_words.sort()
         all_matching_words.append(common_words[:15]) # Limit to top 15 matching keywords
 
+    logger.info("calculate_semantic_match: %d jobs in %.1f ms", len(job_descriptions), (time.perf_counter() - started) * 1000)
+    _report_first_call("calculate_semantic_match", started)
     return semantic_percentages, all_matching_words
 
+# Most recently built ANN index, reused while the job set and texts stay the same
+_ann_index_cache = {"fingerprint": None, "index": None}
+_ann_index_lock = threading.Lock()
+
+def _job_ann_index(job_descriptions, job_ids):
+    """
+    Returns a JobAnnIndex over the stored embeddings of the jobs, keyed by job position.
+    The last index is reused while the Job_IDs and description texts stay the same.
+    """
+    job_embeddings = job_embedding_store.get_embeddings(job_ids, job_descriptions, _encode_for_embedding)
+    fingerprint = text_hash("\n".join(f"{job_id}:{text_hash(text)}" for job_id, text in zip(job_ids, job_descriptions)))
+    with _ann_index_lock:
+        if _ann_index_cache["index"] is None or _ann_index_cache["fingerprint"] != fingerprint:
+            _ann_index_cache["index"] = JobAnnIndex(range(len(job_descriptions)), job_embeddings)
+            _ann_index_cache["fingerprint"] = fingerprint
+        return _ann_index_cache["index"]
+
+def bulk_rank_jobs_semantic(resume_texts, job_descriptions, job_ids=None, top_k=10, min_score=None, mode='exact', ef=None, nprobe=None, catalogue=False):
+    """
+    Returns the best jobs for every resume by semantic similarity.
+    With mode='ann' the stored job embeddings are searched through a cached `JobAnnIndex`
+    (HNSW, or the NumPy IVF fallback); with 'exact', or when the SentenceTransformer is
+    unavailable (TF-IDF fallback), the full score matrix from `bulk_semantic_match` is
+    ranked instead.
+
+    Args:
+        resume_texts (list of str): Raw resume texts.
+        job_descriptions (list of str): Raw job description texts.
+        job_ids (list of str, optional): Job_IDs for the descriptions, used as cache keys.
+        top_k (int, optional): Jobs to return per resume (all jobs if None).
+        min_score (float, optional): Drop jobs scoring below this percentage.
+        mode (str): 'exact' or 'ann'.
+        ef (int, optional): HNSW search breadth for mode='ann' (recall/latency knob).
+        nprobe (int, optional): IVF clusters to probe for mode='ann' (recall/latency knob).
+        catalogue (bool): Passed on to `bulk_semantic_match`.
+
+    Returns:
+        list of list of tuple: For each resume, (job position, percentage), best first.
+    """
+    from bulk_match import top_k_rows
+
+    resume_texts = list(resume_texts)
+    if job_ids is None:
+        job_ids = [None] * len(job_descriptions)
+    if mode != 'ann' or top_k is None or get_model() is None or not job_descriptions:
+        scores = bulk_semantic_match(resume_texts, job_descriptions, job_ids, catalogue=catalogue)
+        return top_k_rows(scores, top_k=top_k, min_score=min_score)
+
+    started = time.perf_counter()
+    try:
+        resume_embeddings = _encode_for_embedding(resume_texts)
+        index = _job_ann_index(job_descriptions, job_ids)
+    except Exception as e:
+        logger.error("Error building the ANN search: %s. Falling back to exact search.", e)
+        return top_k_rows(bulk_semantic_match(resume_texts, job_descriptions, job_ids, catalogue=catalogue), top_k=top_k, min_score=min_score)
+    results = []
+    with stage('scoring'):
+        for resume_embedding in resume_embeddings:
+            ranked = [(row, float(round(similarity * 100, 2))) for row, similarity in index.search(resume_embedding, top_k=top_k, ef=ef, nprobe=nprobe)]
+            results.append([(row, percentage) for row, percentage in ranked if min_score is None or percentage >= min_score])
+    logger.info(
+        "bulk_rank_jobs_semantic: %d resumes x %d jobs (%s index) in %.1f ms",
+        len(resume_texts), len(job_descriptions), index.backend, (time.perf_counter() - started) * 1000,
+    )
+    return results
+
+def _encode_for_embedding(texts):
+    """
+    PII-filters, extracts key information from and encodes a list of raw texts.
+
+    Returns:
+        numpy.ndarray: A (len(texts), D) matrix of L2-normalized embeddings.
+    """
+    return _encode_analyses(analyze_documents(list(texts)))
+
+@timed('embedding')
+def _encode_analyses(analyses):
+    """
+    Encodes the key information of document analyses.
+
+    Returns:
+        numpy.ndarray: A (len(analyses), D) matrix of L2-normalized embeddings.
+    """
+    processed_texts = [analysis.key_information for analysis in analyses]
+    # Handle cases where processed text might be empty for embedding (e.g., very short docs)
+    # Provide a placeholder to prevent embedding errors
+    processed_texts = [text if text.strip() else "empty document" for text in processed_texts]
+    return get_model().encode(processed_texts, convert_to_numpy=True, normalize_embeddings=True)
+
 def calculate_skill_keyword_match(resume_text, job_required_skills_list):
     """
     Calculates the match percentage based on keyword overlap between resume skills
@@ -309,43 +881,253 @@ def calculate_skill_keyword_match(resume_text, job_required_skills_list):
               inner list contains common keywords (lemmas) found in the
               preprocessed resume skills and the corresponding preprocessed job skills.
     """
-    print(f"\n--- Starting calculate_skill_keyword_match ---")
-    print(f"Raw Resume Text (first 100 chars): {resume_text[:100]}")
+    started = time.perf_counter()
 
     # 1. Preprocess resume to extract and prioritize skills
     # Use extract_key_information to focus on skills section if available
     processed_resume_skills_text = extract_key_information(resume_text) 
-    print(f"Processed Resume Skills Text: '{processed_resume_skills_text}'")
     resume_skills_set = set(processed_resume_skills_text.split())
-    print(f"Resume Skills Set (after preprocessing): {resume_skills_set}")
+    logger.debug("Resume skills set (after preprocessing): %s", resume_skills_set)
+
+    # 2. Preprocess all jobs' Required_Skills in one batch (they're already isolated, so simple preprocess)
+    processed_job_skills_texts = preprocess_texts(job_required_skills_list)
+    job_skills_sets = [set(processed.split()) for processed in processed_job_skills_texts]
+
+    all_percentages, all_matching_words = _score_skill_sets(resume_skills_set, job_skills_sets)
+
+    logger.info(
+        "calculate_skill_keyword_match: %d jobs, %d resume tokens in %.1f ms",
+        len(job_skills_sets), len(resume_skills_set), (time.perf_counter() - started) * 1000,
+    )
+    _report_first_call("calculate_skill_keyword_match", started)
+    return all_percentages, all_matching_words
 
+
+def calculate_skill_keyword_match_indexed(resume_text, job_index, job_ids):
+    """
+    Same as `calculate_skill_keyword_match`, but reads each job's preprocessed
+    Required_Skills tokens from a `JobIndex` instead of running spaCy over the
+    job texts again. Only jobs sharing a token with the resume are scored
+    (through the index's postings lists); every other job gets 0.0%.
+
+    Args:
+        resume_text (str): The raw text content of the resume.
+        job_index (JobIndex): An index that has been synced with the jobs.
+        job_ids (list of str): The Job_IDs to score, in the order results should be returned.
+
+    Returns:
+        tuple: (percentages, matching_words), in the same format as
+               `calculate_skill_keyword_match`.
+    """
+    matches = {
+        job_id: (percentage, keywords)
+        for job_id, percentage, keywords in search_skill_keyword_match(resume_text, job_index, include_unmatched=False)
+    }
     all_percentages = []
     all_matching_words = []
+    for job_id in job_ids:
+        percentage, keywords = matches.get(job_id, (0.0, []))
+        all_percentages.append(percentage)
+        all_matching_words.append(keywords)
+    return all_percentages, all_matching_words
+
+
+def search_skill_keyword_match(resume_text, job_index, top_k=None, min_score=None, include_unmatched=True):
+    """
+    Returns a ranked shortlist of indexed jobs for a resume.
+    Scores are the same keyword-overlap percentages as `calculate_skill_keyword_match`,
+    but only jobs that share at least one token with the resume are visited.
+    As with the plain matcher, jobs with no overlap are returned with 0.0% (after
+    every overlapping job) unless `min_score` is above 0.
 
-    for job_skills_text in job_required_skills_list:
-        print(f"\nProcessing Job Required Skills: '{job_skills_text}'")
-        # 2. Preprocess job's Required_Skills (it's already isolated, so simple preprocess)
-        processed_job_skills_text = preprocess_text(job_skills_text)
-        print(f"Processed Job Skills Text: '{processed_job_skills_text}'")
-        job_skills_set = set(processed_job_skills_text.split())
-        print(f"Job Skills Set (after preprocessing): {job_skills_set}")
+    Args:
+        resume_text (str): The raw text content of the resume.
+        job_index (JobIndex): An index that has been synced with the jobs.
+        top_k (int, optional): Maximum number of jobs to return.
+        min_score (float, optional): Minimum match percentage to return.
+        include_unmatched (bool): Set to False to leave jobs with no overlap out.
+
+    Returns:
+        list of tuple: (Job_ID, percentage, matching_words), best match first.
+    """
+    started = time.perf_counter()
+    processed_resume_skills_text = extract_key_information(resume_text)
+    resume_skills_set = set(processed_resume_skills_text.split())
+
+    stop_words = get_stop_words()
+    results = []
+    for job_id, percentage, common_skills in job_index.search(
+        resume_skills_set, top_k=top_k, min_score=min_score, include_unmatched=include_unmatched,
+    ):
+        display_common_skills = sorted(word for word in common_skills if word not in stop_words)
+        results.append((job_id, percentage, display_common_skills[:15]))
+    logger.info(
+        "search_skill_keyword_match: %d matches from %d indexed jobs in %.1f ms",
+        len(results), len(job_index), (time.perf_counter() - started) * 1000,
+    )
+    _report_first_call("search_skill_keyword_match", started)
+    return results
+
+
+def bulk_skill_keyword_match(resume_texts, job_required_skills_list, job_ids=None, top_k=10, min_score=None):
+    """
+    Scores many resumes against many jobs at once with sparse matrix products
+    (see bulk_match.BulkSkillMatcher). Scores are identical to calling
+    `calculate_skill_keyword_match` for every resume.
+
+    Args:
+        resume_texts (list of str): Raw resume texts.
+        job_required_skills_list (list of str): The 'Required_Skills' string of each job.
+        job_ids (list, optional): Keys returned with the scores (defaults to job positions).
+        top_k (int, optional): Jobs to return per resume (all jobs if None).
+        min_score (float, optional): Minimum match percentage to return (jobs with no
+                                     overlap are returned with 0.0 unless it is above 0).
+
+    Returns:
+        list of list of tuple: For each resume, (job_id, percentage, matching_words), best first.
+    """
+    from bulk_match import BulkSkillMatcher
+
+    resume_skills_sets = resume_skill_sets(resume_texts)
+    job_skills_sets = [set(text.split()) for text in preprocess_texts(list(job_required_skills_list))]
+    matcher = BulkSkillMatcher(job_skills_sets, job_ids)
+    return matcher.top_k(resume_skills_sets, top_k=top_k, min_score=min_score, stop_words=get_stop_words())
+
+
+def resume_skill_sets(resume_texts):
+    """
+    Returns the skill token set of each resume, as used by the skill matchers.
+    """
+    return [set(text.split()) for text in extract_key_information_batch(list(resume_texts))]
+
+
+def bulk_semantic_match(resume_texts, job_descriptions, job_ids=None, catalogue=False):
+    """
+    Semantic match percentages of many resumes against many jobs.
+    All resumes are encoded in one batch and scored against the stored job embeddings
+    with a single matrix product (TF-IDF, see `_tfidf_similarities`, if the
+    SentenceTransformer is unavailable).
+
+    Args:
+        resume_texts (list of str): Raw resume texts.
+        job_descriptions (list of str): Raw job description texts.
+        job_ids (list of str, optional): Job_IDs for the descriptions, used as cache keys.
+        catalogue (bool): The jobs come from the catalogue `sync_catalogue_tfidf` was called with.
+
+    Returns:
+        numpy.ndarray: A (len(resume_texts), len(job_descriptions)) matrix of percentages.
+    """
+    started = time.perf_counter()
+    resume_texts = list(resume_texts)
+    if job_ids is None:
+        job_ids = [None] * len(job_descriptions)
+    if not resume_texts or not job_descriptions:
+        return np.zeros((len(resume_texts), len(job_descriptions)), dtype=np.float64)
+
+    similarities = None
+    if get_model() is not None:
+        try:
+            resume_embeddings = _encode_for_embedding(resume_texts)
+            job_embeddings = job_embedding_store.get_embeddings(job_ids, job_descriptions, _encode_for_embedding)
+            with stage('scoring'):
+                similarities = resume_embeddings @ job_embeddings.T
+        except Exception as e:
+            logger.error("Error encoding texts with SentenceTransformer: %s. Falling back to TF-IDF.", e)
+
+    if similarities is None:
+        similarities = _tfidf_similarities(
+            analyze_documents(resume_texts), analyze_documents(list(job_descriptions)), job_ids, catalogue,
+        )
+
+    percentages = np.round(np.asarray(similarities, dtype=np.float64) * 100, 2)
+    logger.info(
+        "bulk_semantic_match: %d resumes x %d jobs in %.1f ms",
+        len(resume_texts), len(job_descriptions), (time.perf_counter() - started) * 1000,
+    )
+    return percentages
+
+
+def sync_catalogue_tfidf(jobs):
+    """
+    Brings `catalogue_tfidf_model` up to date with the whole job catalogue (the
+    Job_Description of every job with a Job_ID; jobs no longer listed are pruned).
+    Does nothing while the SentenceTransformer is available, as only the TF-IDF
+    fallback uses the model.
+
+    Args:
+        jobs (list of dict): Every job of the catalogue (not a filtered subset).
+    """
+    if get_model() is not None:
+        return
+    jobs = [job for job in jobs if job.get("Job_ID")]
+    analyses = analyze_documents([job.get("Job_Description", "") for job in jobs])
+    catalogue_tfidf_model.sync(
+        [job["Job_ID"] for job in jobs], [analysis.preprocessed_text for analysis in analyses], prune=True,
+    )
+
+
+def _tfidf_similarities(resume_analyses, job_analyses, job_ids, catalogue):
+    """
+    TF-IDF cosine similarities of resumes against jobs, as a (resumes, jobs) array.
+    Catalogue jobs are scored with `catalogue_tfidf_model` (if it holds every job with
+    the same text); any other job list with a model fitted per resume on that resume and the jobs (nothing is kept), so ad-hoc
+    scores don't depend on earlier requests.
+    """
+    job_texts = [analysis.preprocessed_text for analysis in job_analyses]
+    if catalogue and catalogue_tfidf_model.has_rows(job_ids, job_texts):
+        rows = [catalogue_tfidf_model.similarities(analysis.preprocessed_text, job_ids) for analysis in resume_analyses]
+    else:
+        rows = [pairwise_similarities(analysis.preprocessed_text, job_texts) for analysis in resume_analyses]
+    return np.vstack(rows) if rows else np.zeros((0, len(job_texts)), dtype=np.float64)
+
+
+def matching_keywords(resume_text, job_texts):
+    """
+    Common preprocessed keywords between a resume and each job text (for display).
+
+    Returns:
+        list of list of str: Up to 15 sorted keywords per job.
+    """
+    analyses = analyze_documents([resume_text] + list(job_texts))
+    resume_words_set = analyses[0].lemma_set
+    stop_words = get_stop_words()
+    all_matching_words = []
+    for job_analysis in analyses[1:]:
+        common_words = sorted(
+            word for word in resume_words_set.intersection(job_analysis.lemma_set)
+            if word not in stop_words
+        )
+        all_matching_words.append(common_words[:15])
+    return all_matching_words
+
+
+@timed('scoring')
+def _score_skill_sets(resume_skills_set, job_skills_sets):
+    """
+    Scores a resume skill set against a list of preprocessed job skill sets, one pair at a time.
+    """
+    debug = logger.isEnabledFor(logging.DEBUG)
+    stop_words = get_stop_words()
+    all_percentages = []
+    all_matching_words = []
+
+    for job_skills_set in job_skills_sets:
+        if debug:
+            logger.debug("Job skills set (after preprocessing): %s", job_skills_set)
 
         # Handle cases where either set is empty to avoid division by zero
         if not job_skills_set:
-            print("Job skills set is empty, appending 0.0%")
             all_percentages.append(0.0)
             all_matching_words.append([])
             continue
         
         if not resume_skills_set:
-            print("Resume skills set is empty, appending 0.0%")
             all_percentages.append(0.0)
             all_matching_words.append([])
             continue
 
         # 3. Calculate intersection of skills
         common_skills = resume_skills_set.intersection(job_skills_set)
-        print(f"Common Skills (Intersection): {common_skills}")
         
         # 4. Calculate percentage: (number of matching skills / total unique required skills) * 100
         # This formula can lead to 100% if all job skills are in the resume, even if few.
@@ -353,7 +1135,6 @@ def calculate_skill_keyword_match(resume_text, job_required_skills_list):
         # Or, just the ratio of common skills to job's required skills. Sticking to the latter for now as requested.
         percentage = (len(common_skills) / len(job_skills_set)) * 100
         all_percentages.append(round(percentage, 2))
-        print(f"Calculated Percentage: {round(percentage, 2)}%")
 
         # 5. Prepare matching keywords for display
         # Filter out stop words from the common skills for display
@@ -362,47 +1143,47 @@ def calculate_skill_keyword_match(resume_text, job_required_skills_list):
         ]
         display_common_skills.sort()
         all_matching_words.append(display_common_skills[:15]) # Limit to top 15 for display
-        print(f"Display Common Skills: {display_common_skills}")
+        if debug:
+            logger.debug("Common skills: %s -> %.2f%%", display_common_skills, percentage)
 
-    print(f"--- Finished calculate_skill_keyword_match ---")
     return all_percentages, all_matching_words
 
 
-def _tfidf_match_percentage_fallback(resume_text, job_descriptions):
+def _tfidf_match_percentage_fallback(resume_text, job_descriptions, job_ids=None, catalogue=False):
     """
     Fallback function to calculate match percentage using only TF-IDF
     if SentenceTransformer encounters an error or is not loaded.
     This fallback also uses the new preprocessing and PII filtering.
+    Catalogue jobs (catalogue=True, after `sync_catalogue_tfidf`) are scored with
+    `catalogue_tfidf_model`, so only the resume is transformed per request; other job
+    lists get a TF-IDF model fitted on the resume and those jobs.
     """
-    # Apply PII filtering and preprocessing for fallback TF-IDF
-    cleaned_resume_text = preprocess_text(filter_pii(resume_text))
-    cleaned_job_descriptions = [preprocess_text(filter_pii(jd)) for jd in job_descriptions]
-
-    corpus = [cleaned_resume_text] + cleaned_job_descriptions
-    
-    # Handle empty documents for TF-IDF
-    corpus = [text if text.strip() else "empty document" for text in corpus]
-
-    vectorizer = TfidfVectorizer(stop_words='english') # TF-IDF has its own stop words, but we'll let it handle it
-    tfidf_matrix = vectorizer.fit_transform(corpus)
-    vectors = tfidf_matrix.toarray()
+    started = time.perf_counter()
+    if job_ids is None:
+        job_ids = [None] * len(job_descriptions)
 
-    resume_vector = vectors[0]
-    job_vectors = vectors[1:]
+    # Apply PII filtering and preprocessing for fallback TF-IDF (shared, cached analyses)
+    analyses = analyze_documents([resume_text] + list(job_descriptions))
+    resume_analysis = analyses[0]
+    job_analyses = analyses[1:]
 
-    similarities = cosine_similarity([resume_vector], job_vectors)[0]
+    similarities = _tfidf_similarities([resume_analysis], job_analyses, job_ids, catalogue)[0]
     percentages = [float(round(similarity * 100, 2)) for similarity in similarities]
 
     # Keyword extraction for fallback (similar to main function)
-    resume_words_set = set(cleaned_resume_text.split())
+    stop_words = get_stop_words()
+    resume_words_set = resume_analysis.lemma_set
     matching_words = []
-    for i, job_text in enumerate(cleaned_job_descriptions):
-        job_words_set = set(job_text.split())
+    for job_analysis in job_analyses:
         common_words = [
-            word for word in resume_words_set.intersection(job_words_set)
+            word for word in resume_words_set.intersection(job_analysis.lemma_set)
             if word not in stop_words # Ensure they are not stop words
         ]
         common_words.sort()
         matching_words.append(common_words[:15])
 
+    logger.info("_tfidf_match_percentage_fallback: %d jobs in %.1f ms", len(job_descriptions), (time.perf_counter() - started) * 1000)
     return percentages, matching_words
+
+load_timings['import'] = time.perf_counter() - _IMPORT_STARTED
+logger.info("match_percentage imported in %.1f ms", load_timings['import'] * 1000)
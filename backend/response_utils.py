@@ -0,0 +1,127 @@
+# backend/response_utils.py
+# Helpers for shaping large list responses: pagination (offset/limit), field projection
+# ('fields'), and NDJSON streaming (one tagged JSON object per line) as an alternative
+# to a single JSON document. Requests that don't ask for any of these get the full response.
+
+import itertools
+import json
+import time
+
+from flask import Response
+
+from instrumentation import merge_stage_timings
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+
+def parse_bool(value, default=False):
+    """
+    Reads a boolean request parameter ("true"/"1"/"yes", "false"/"0"/"no").
+    """
+    if value is None or value == "":
+        return default
+    if isinstance(value, bool):
+        return value
+    return str(value).lower() in ("true", "1", "yes")
+
+
+def parse_fields(value):
+    """
+    Reads a 'fields' parameter: a list or a comma-separated string of field names.
+    Returns None when no projection was requested.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        value = value.split(",")
+    if not isinstance(value, list):
+        raise ValueError("fields must be a list or a comma-separated string")
+    fields = [str(field).strip() for field in value if str(field).strip()]
+    return fields or None
+
+
+def parse_compact_options(params, request=None):
+    """
+    Reads the shared response options from a dict-like (JSON body, form or query args).
+
+    Returns:
+        dict: offset (int), limit (int or None), fields (list or None) and ndjson (bool).
+
+    Raises:
+        ValueError: With a message for the client if a value is invalid.
+    """
+    try:
+        offset = int(params.get("offset") or 0)
+        limit = params.get("limit")
+        limit = int(limit) if limit not in (None, "") else None
+    except (TypeError, ValueError):
+        raise ValueError("offset and limit must be integers")
+    if offset < 0 or (limit is not None and limit < 0):
+        raise ValueError("offset and limit must not be negative")
+
+    response_format = str(params.get("format") or "").lower()
+    ndjson = response_format == "ndjson"
+    if not response_format and request is not None:
+        ndjson = request.accept_mimetypes.best == NDJSON_MIMETYPE
+    return {"offset": offset, "limit": limit, "fields": parse_fields(params.get("fields")), "ndjson": ndjson}
+
+
+def project(record, fields):
+    """
+    Keeps only `fields` of a result dict (all of it if `fields` is None).
+    """
+    if not fields:
+        return record
+    return {field: record[field] for field in fields if field in record}
+
+
+def paginate(items, offset=0, limit=None):
+    """
+    Returns the `limit` items starting at `offset`.
+    """
+    if limit is None:
+        return items[offset:]
+    return items[offset:offset + limit]
+
+
+def ndjson_response(records, errors=None):
+    """
+    Streams `records` as NDJSON, one compact JSON object per line, so large result
+    sets are serialized incrementally instead of as one big document.
+    Every line has the same envelope, {"type": "result", "data": <record>}, and each
+    entry of `errors` follows the results as {"type": "error", "data": <error>}.
+    The time spent encoding lines (not sending them) is recorded as one 'serialization'
+    stage once the stream ends. The lines are encoded after the headers went out, so
+    it reaches the stage histogram but not the Server-Timing header.
+    """
+    def generate():
+        lines = itertools.chain((("result", record) for record in records), (("error", error) for error in errors or ()))
+        encoding = 0.0
+        try:
+            for kind, data in lines:
+                started = time.perf_counter()
+                line = json.dumps({"type": kind, "data": data}, separators=(',', ':')) + "\n"
+                encoding += time.perf_counter() - started
+                yield line
+        finally:
+            merge_stage_timings([('serialization', encoding)])
+    return Response(generate(), mimetype=NDJSON_MIMETYPE)
+
+
+def shape_results(results, options, fields=None):
+    """
+    Applies pagination and projection to a list of result dicts.
+
+    Args:
+        results (list of dict): The full, ordered results.
+        options (dict): As returned by `parse_compact_options`.
+        fields (list, optional): Projection to use instead of options["fields"].
+
+    Returns:
+        list of dict: The page of (projected) results.
+    """
+    page = paginate(results, options["offset"], options["limit"])
+    fields = fields if fields is not None else options["fields"]
+    if fields:
+        page = [project(record, fields) for record in page]
+    return page
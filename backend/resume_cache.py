@@ -0,0 +1,199 @@
+# backend/resume_cache.py
+# Content-addressed cache for extracted resume text and preprocessed key information.
+# Entries are keyed by the SHA-256 of the file bytes (extracted text) or of the text
+# itself (section-weighted tokens), so the same resume matched again - against a single
+# job, against the catalogue, or after being re-uploaded - skips extraction and spaCy.
+# The cache is an in-memory LRU bounded by size, optionally backed by a directory of
+# JSON files that is shared between processes.
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# Memory budget for the in-process LRU
+RESUME_CACHE_MAX_BYTES = int(os.environ.get('RESUME_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+# Optional on-disk store (disabled when empty) and its size budget
+RESUME_CACHE_DIR = os.environ.get('RESUME_CACHE_DIR', '')
+RESUME_CACHE_DISK_MAX_BYTES = int(os.environ.get('RESUME_CACHE_DISK_MAX_BYTES', 512 * 1024 * 1024))
+
+
+def sha256_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def sha256_text(text):
+    return hashlib.sha256((text or "").encode('utf-8')).hexdigest()
+
+
+class ResumeCache:
+    """
+    Size-bounded LRU of JSON-serializable values, with an optional disk tier.
+    Keys should be namespaced, e.g. "text:<sha256 of bytes>".
+    """
+
+    def __init__(self, max_bytes=RESUME_CACHE_MAX_BYTES, directory=RESUME_CACHE_DIR, disk_max_bytes=RESUME_CACHE_DISK_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.directory = directory or None
+        self.disk_max_bytes = disk_max_bytes
+        self._entries = OrderedDict()  # key -> (value, size)
+        self._bytes = 0
+        self._disk_bytes = None  # computed lazily on the first disk write
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """
+        Returns the cached value for `key`, or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+        value = self._read_disk(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._store_memory(key, value, len(json.dumps(value)))
+        return value
+
+    def put(self, key, value):
+        """
+        Stores a JSON-serializable value under `key`.
+        """
+        serialized = json.dumps(value)
+        with self._lock:
+            self._store_memory(key, value, len(serialized))
+        self._write_disk(key, serialized)
+
+    def _store_memory(self, key, value, size):
+        if size > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old[1]
+        self._entries[key] = (value, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes and self._entries:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self.evictions += 1
+
+    def _disk_path(self, key):
+        digest = sha256_text(key)
+        return os.path.join(self.directory, digest[:2], digest + '.json')
+
+    def _read_disk(self, key):
+        if not self.directory:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                value = json.load(f)
+            os.utime(path)  # Keep recently used files from being pruned first
+            return value
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.error("Error reading resume cache entry %s: %s", path, e)
+            return None
+
+    def _write_disk(self, key, serialized):
+        if not self.directory:
+            return
+        path = self._disk_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(serialized)
+            os.replace(tmp_path, path)
+            with self._lock:
+                if self._disk_bytes is None:
+                    self._disk_bytes = sum(size for _, size, _ in self._disk_files())
+                else:
+                    self._disk_bytes += len(serialized)
+                if self._disk_bytes > self.disk_max_bytes:
+                    self._prune_disk()
+        except Exception as e:
+            logger.error("Error writing resume cache entry %s: %s", path, e)
+
+    def _disk_files(self):
+        """
+        Yields (path, size, mtime) for every file in the disk store.
+        """
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith('.json'):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    yield path, stat.st_size, stat.st_mtime
+
+    def _prune_disk(self):
+        """
+        Deletes the least recently used files until the disk store is back under
+        90% of its budget.
+        """
+        files = sorted(self._disk_files(), key=lambda item: item[2])
+        total = sum(size for _, size, _ in files)
+        target = self.disk_max_bytes * 0.9
+        for path, size, _ in files:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                self.evictions += 1
+            except FileNotFoundError:
+                total -= size
+        self._disk_bytes = total
+
+    def stats(self):
+        """
+        Returns hit/miss counters and the current memory usage.
+        """
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+    def clear(self, disk=False):
+        """
+        Empties the in-memory LRU, and with `disk=True` the disk store as well.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            if disk and self.directory:
+                for path, _, _ in list(self._disk_files()):
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+                self._disk_bytes = 0
+
+
+# Shared per-process cache instance
+resume_cache = ResumeCache()
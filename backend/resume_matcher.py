@@ -1,46 +1,39 @@
 # backend/resume_matcher.py
 # This file seems to be an older version or a utility not directly used by app.py's current logic
-# The core logic for text extraction is now in app.py and matching in match_percentage.py.
+# The core logic for text extraction is now in text_extraction.py and matching in match_percentage.py.
 # Keeping it here for completeness as it was in the original upload, but it's not strictly
 # necessary for the current app.py functionality.
 
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import docx2txt
-import PyPDF2
 import os
+from text_extraction import extract_text
+from tfidf_model import pairwise_similarities
 
 def extract_text_from_file(file_path):
     """
     Extracts text from a given file path based on its extension.
     Supports .txt, .docx, and .pdf files.
+    Uses the same streaming extractor as app.py (see text_extraction.py).
     """
-    ext = os.path.splitext(file_path)[-1].lower()
+    return extract_text(file_path)
 
-    if ext == ".txt":
-        with open(file_path, "r", encoding="utf-8") as f:
-            return f.read()
-    elif ext == ".docx":
-        return docx2txt.process(file_path)
-    elif ext == ".pdf":
-        with open(file_path, "rb") as f:
-            reader = PyPDF2.PdfReader(f)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text() or ""
-            return text
-    return ""
-
-def match_resume_with_description(resume_text, job_description):
+def match_resume_with_description(resume_text, job_description, job_id=None, model=None):
     """
     Calculates the cosine similarity percentage between a resume and a single job description.
+    By default the TF-IDF model is fitted on just this pair. With a fitted catalogue `model`
+    (tfidf_model.CatalogueTfidfModel) the stored job vector is used instead, and only the
+    resume is transformed.
+
+    Args:
+        job_id (str, optional): Key of the description in `model` (defaults to its text hash).
+        model (CatalogueTfidfModel, optional): Model of the catalogue the description belongs to.
     """
-    vectorizer = TfidfVectorizer(stop_words='english')
-    # Transform both texts into TF-IDF vectors
-    tfidf_matrix = vectorizer.fit_transform([resume_text, job_description])
-    # Calculate cosine similarity between the two vectors
-    score = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
-    return round(score * 100, 2)
+    if model is None:
+        score = pairwise_similarities(resume_text, [job_description])[0]
+    else:
+        keys = model.sync([job_id], [job_description])
+        # Calculate cosine similarity between the resume and the stored job vector
+        score = model.similarities(resume_text, keys)[0]
+    return round(float(score) * 100, 2)
 
 # Example usage (if this file were run directly, which it isn't by app.py)
 if __name__ == '__main__':
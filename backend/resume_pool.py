@@ -0,0 +1,332 @@
+# backend/resume_pool.py
+# Process-pool execution for bulk resume matching.
+# Text extraction, preprocessing and matching of each uploaded resume run in a
+# separate worker process. Each worker loads the NLP models once (see `_init_worker`)
+# and then handles many files. Results keep the input order, and
+# a per-file timeout keeps one bad file from stalling the whole batch.
+# Concurrent batches share the pool. A file's timeout counts from when a worker starts
+# on it (workers report this over a queue), so files waiting behind other batches
+# are not timed out. Stage timings measured in a worker are sent back
+# with its result and merged into the metrics and Server-Timing of the submitting request.
+
+import functools
+import itertools
+import logging
+import multiprocessing
+import os
+import threading
+import time
+
+from instrumentation import collect_stage_timings, merge_stage_timings
+from logging_config import configure_logging
+from match_percentage import calculate_semantic_match, calculate_skill_keyword_match, catalogue_tfidf_model, job_embedding_store, warm_up
+from text_extraction import extract_text_cached
+
+logger = logging.getLogger(__name__)
+
+# Number of worker processes (defaults to the number of CPU cores)
+MATCHER_WORKERS = int(os.environ.get('MATCHER_WORKERS', os.cpu_count() or 1))
+# Seconds to wait for a single file before giving up on it
+MATCHER_FILE_TIMEOUT = float(os.environ.get('MATCHER_FILE_TIMEOUT', 60))
+# Uploads with fewer files than this are processed in the request thread
+MATCHER_PARALLEL_MIN_FILES = int(os.environ.get('MATCHER_PARALLEL_MIN_FILES', 4))
+# 'spawn' is the safe default next to Flask's threads; 'fork' starts faster on Linux
+MATCHER_START_METHOD = os.environ.get('MATCHER_START_METHOD', 'spawn')
+
+
+def match_resume_file(filename, source, job_description="", job_required_skills="", job_id=None, catalogue=False):
+    """
+    Extracts the text of one resume and matches it against a single job.
+    `source` is the file's bytes or a file path (see `text_extraction.extract_text`).
+    Uses skill-based matching if `job_required_skills` is given, otherwise
+    semantic matching against `job_description`. `catalogue` says `job_id` is a
+    catalogue Job_ID (see `calculate_semantic_match`).
+
+    Returns:
+        dict: The result entry for /api/matcher, or None if no text could be extracted.
+    """
+    resume_text = extract_text_cached(source, filename)
+
+    if not resume_text:
+        logger.warning("Could not extract text from %s. Skipping matching for this file.", filename)
+        return None
+
+    percentage = 0
+    keywords = []
+
+    if job_required_skills:
+        percentages, matched_keywords = calculate_skill_keyword_match(resume_text, [job_required_skills])
+        percentage = percentages[0] if percentages else 0
+        keywords = matched_keywords[0] if matched_keywords else []
+    elif job_description:
+        percentages, matched_keywords = calculate_semantic_match(resume_text, [job_description], job_ids=[job_id], catalogue=catalogue)
+        percentage = percentages[0] if percentages else 0
+        keywords = matched_keywords[0] if matched_keywords else []
+    else:
+        logger.warning("No job description or required skills provided for matching %s.", filename)
+
+    return {
+        "filename": filename,
+        "text": resume_text,
+        "match_percentage": round(percentage, 2),
+        "matched_keywords": keywords
+    }
+
+
+def extract_resume_file(filename, source):
+    """
+    Extracts (and caches) the text of one resume without matching it.
+
+    Returns:
+        str: The extracted text ("" if nothing could be extracted).
+    """
+    return extract_text_cached(source, filename) or ""
+
+
+# Set in each worker by `_init_worker`: where `_run_task` reports that a task has started
+_started_queue = None
+
+
+def _init_worker(started_queue):
+    """
+    Runs once in every worker process: sets up logging and loads the NLP models,
+    so each file handled by the worker only pays for matching.
+    The request process is the only writer of the job embedding store and the catalogue
+    TF-IDF model; workers keep the embeddings they compute in memory and reload the
+    TF-IDF model when the request process saved a newer one.
+    """
+    global _started_queue
+    _started_queue = started_queue
+    configure_logging()
+    job_embedding_store.read_only = True
+    catalogue_tfidf_model.read_only = True
+    warm_up()
+
+
+def _run_task(task_function, token, args):
+    """
+    Worker entry point wrapping every task: reports `token` to the pool as soon as a
+    worker picks the task up (its timeout starts then), then runs it.
+    """
+    _started_queue.put(token)
+    return task_function(args)
+
+
+def _match_resume_task(args):
+    """
+    Worker entry point. Exceptions are turned into an error string so a single
+    failing file does not break the batch.
+
+    Returns:
+        tuple: (result, error, stage timings as (stage, seconds) pairs).
+    """
+    with collect_stage_timings() as stages:
+        try:
+            return match_resume_file(*args), None, stages
+        except Exception as e:
+            logger.exception("Error processing file %s", args[0])
+            return None, f"{type(e).__name__}: {e}", stages
+
+
+def _extract_resume_task(args):
+    """
+    Worker entry point for text extraction only (see `_match_resume_task`).
+    """
+    with collect_stage_timings() as stages:
+        try:
+            return extract_resume_file(*args), None, stages
+        except Exception as e:
+            logger.exception("Error extracting text from %s", args[0])
+            return None, f"{type(e).__name__}: {e}", stages
+
+
+class ResumeMatchPool:
+    """
+    Lazily created multiprocessing pool for matching many resumes at once.
+    Several batches can share the pool at the same time. A batch with a timed-out file
+    retires the pool: new batches get a fresh one, and the old pool (with the stuck
+    worker) is terminated once the last batch using it has finished.
+    """
+
+    def __init__(self, workers=MATCHER_WORKERS, file_timeout=MATCHER_FILE_TIMEOUT, start_method=MATCHER_START_METHOD):
+        self.workers = max(1, workers)
+        self.file_timeout = file_timeout
+        self.start_method = start_method
+        self._pool = None
+        self._users = {}  # pool -> number of batches running on it
+        self._retired = {}  # pool -> time it was retired; terminated once its last batch finishes
+        self._started_queues = {}  # pool -> queue its workers report started tasks on
+        self._batches = {}  # batch number -> (condition, {task number: start time}, pool) of running batches
+        self._batch_numbers = itertools.count()
+        # Guards pool creation and retirement and the registry of running batches; batches run without it
+        self._lock = threading.Lock()
+
+    def _acquire(self):
+        with self._lock:
+            if self._pool is None:
+                context = multiprocessing.get_context(self.start_method)
+                started_queue = context.SimpleQueue()
+                self._pool = context.Pool(processes=self.workers, initializer=_init_worker, initargs=(started_queue,))
+                self._started_queues[self._pool] = started_queue
+                threading.Thread(
+                    target=self._watch_started, args=(started_queue,), name="resume-pool-started", daemon=True,
+                ).start()
+                logger.info("Resume matching pool started with %s workers (%s).", self.workers, self.start_method)
+            self._users[self._pool] = self._users.get(self._pool, 0) + 1
+            return self._pool
+
+    def _release(self, pool, timed_out):
+        """
+        Ends a batch on `pool`. A timed-out batch retires the pool; a retired pool
+        is terminated (including workers stuck on a timed-out file) when no batch uses it.
+        Other batches still on a retired pool are woken up, as their files that have not
+        started yet may now be stuck behind a hung worker (see `_run`).
+        """
+        waiting = []
+        with self._lock:
+            self._users[pool] -= 1
+            if timed_out and pool is self._pool:
+                self._pool = None
+                self._retired[pool] = time.monotonic()
+                waiting = [finished for finished, _, batch_pool in self._batches.values() if batch_pool is pool]
+            terminate = pool in self._retired and self._users[pool] == 0
+            if terminate:
+                del self._retired[pool]
+                del self._users[pool]
+        for finished in waiting:
+            with finished:
+                finished.notify_all()
+        if terminate:
+            pool.terminate()
+            pool.join()
+            self._stop_watching(pool)
+
+    def _watch_started(self, started_queue):
+        """
+        Records when a worker starts each task (until the pool is gone) and wakes its batch.
+        """
+        while True:
+            token = started_queue.get()
+            if token is None:
+                return
+            batch_number, i = token
+            with self._lock:
+                batch = self._batches.get(batch_number)
+            if batch is None:
+                continue  # The batch has already given up on its tasks
+            finished, started, _ = batch
+            with finished:
+                started[i] = time.monotonic()
+                finished.notify_all()
+
+    def _stop_watching(self, pool):
+        with self._lock:
+            started_queue = self._started_queues.pop(pool, None)
+        if started_queue is not None:
+            started_queue.put(None)
+
+    def match_files(self, tasks):
+        """
+        Runs `match_resume_file` for every task in the worker processes.
+
+        Args:
+            tasks (list of tuple): (filename, source, job_description, job_required_skills, job_id, catalogue).
+
+        Returns:
+            list of tuple: (result dict or None, error message or None), in input order.
+        """
+        return self._run(_match_resume_task, tasks)
+
+    def extract_files(self, tasks):
+        """
+        Runs `extract_resume_file` for every task in the worker processes, e.g. to
+        extract a large batch of resumes that is then matched in one go.
+
+        Args:
+            tasks (list of tuple): (filename, source).
+
+        Returns:
+            list of tuple: (text or None, error message or None), in input order.
+        """
+        return self._run(_extract_resume_task, tasks)
+
+    def _run(self, task_function, tasks):
+        """
+        Submits every task and waits for all of them together. Each task times out
+        `file_timeout` seconds after a worker has started on it; time spent queued (behind
+        this batch's other files or another batch sharing the pool) does not count.
+        Hung files time out together instead of one full timeout after another.
+        Once the pool is retired (another batch had a hung file), files that have not
+        started get `file_timeout` from the retirement, as they may never get a worker.
+        The stage timings each task brings back are merged here, in the calling thread,
+        so they reach the caller's request timings.
+        """
+        finished = threading.Condition()
+        done = {}  # task number -> outcome, filled in by the pool's result thread
+        started = {}  # task number -> time a worker started it, filled in by `_watch_started`
+        batch_number = next(self._batch_numbers)
+
+        def on_success(i, outcome):
+            with finished:
+                done[i] = outcome
+                finished.notify_all()
+
+        def on_error(i, e):
+            logger.error("Error processing file %s in worker pool: %s", tasks[i][0], e)
+            on_success(i, (None, f"{type(e).__name__}: {e}", []))
+
+        pool = self._acquire()
+        with self._lock:
+            self._batches[batch_number] = (finished, started, pool)
+        timed_out = False
+        try:
+            for i, task in enumerate(tasks):
+                pool.apply_async(
+                    _run_task, (task_function, (batch_number, i), task),
+                    callback=functools.partial(on_success, i), error_callback=functools.partial(on_error, i),
+                )
+
+            outcomes = [None] * len(tasks)
+            remaining = list(range(len(tasks)))
+            with finished:
+                while remaining:
+                    now = time.monotonic()
+                    with self._lock:
+                        retired_at = self._retired.get(pool)
+                    queued_deadline = retired_at + self.file_timeout if retired_at is not None else None
+
+                    def deadline(i):
+                        # None for a queued file on a healthy pool: it waits for a worker
+                        return started[i] + self.file_timeout if i in started else queued_deadline
+
+                    still_running = []
+                    for i in remaining:
+                        task_deadline = deadline(i)
+                        if i in done:
+                            result, error, stages = done[i]
+                            merge_stage_timings(stages)
+                            outcomes[i] = (result, error)
+                        elif task_deadline is not None and now >= task_deadline:
+                            logger.warning("Timed out after %ss while processing %s.", self.file_timeout, tasks[i][0])
+                            outcomes[i] = (None, f"Timed out after {self.file_timeout} seconds")
+                            timed_out = True
+                        else:
+                            still_running.append(i)
+                    remaining = still_running
+                    if remaining:
+                        # Sleep until a task starts or finishes, or the next deadline passes
+                        deadlines = [task_deadline for task_deadline in map(deadline, remaining) if task_deadline is not None]
+                        finished.wait(min(deadlines) - now if deadlines else None)
+            return outcomes
+        finally:
+            with self._lock:
+                del self._batches[batch_number]
+            self._release(pool, timed_out)
+
+    def close(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.close()
+            pool.join()
+            self._stop_watching(pool)
@@ -0,0 +1,214 @@
+# backend/scraped_job_store.py
+# Local store of scraped job listings and the background scheduler that fills it.
+# Jobs are kept in a SQLite database keyed by their stable Job_ID (a SHA-1 of the job
+# URL, see topjobs_scraper.stable_job_id), so the same listing scraped again updates
+# its row instead of adding a duplicate, and IDs stay valid across restarts.
+# The scheduler scrapes every SCRAPE_INTERVAL_SECONDS on a daemon thread; API requests
+# only read the store. Listings not seen for SCRAPED_JOB_TTL_SECONDS are dropped.
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# SQLite file of scraped jobs (':memory:' or empty keeps them in memory only)
+SCRAPED_JOBS_DB_PATH = os.environ.get('SCRAPED_JOBS_DB_PATH', 'cache/scraped_jobs.sqlite3')
+# Seconds between background scrapes (0 only scrapes when asked to)
+SCRAPE_INTERVAL_SECONDS = float(os.environ.get('SCRAPE_INTERVAL_SECONDS', 60 * 60))
+# Listings missing from every scrape for this long are removed
+SCRAPED_JOB_TTL_SECONDS = float(os.environ.get('SCRAPED_JOB_TTL_SECONDS', 7 * 24 * 60 * 60))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scraped_jobs (
+    job_id TEXT PRIMARY KEY,
+    job_url TEXT NOT NULL,
+    data TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS scrape_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class ScrapedJobStore:
+    """
+    Deduplicated, persistent store of scraped jobs (dicts with a 'Job_ID').
+    """
+
+    def __init__(self, path=SCRAPED_JOBS_DB_PATH):
+        self.path = path or ':memory:'
+        if self.path != ':memory:' and os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        # One connection shared by all threads, serialized by the lock
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    def upsert_many(self, jobs, seen_at=None):
+        """
+        Inserts new jobs and refreshes existing ones (matched by Job_ID).
+
+        Returns:
+            tuple: (number of new jobs, number of updated jobs).
+        """
+        seen_at = seen_at or time.time()
+        rows = [(job["Job_ID"], job.get("Job_URL", ""), json.dumps(job, sort_keys=True)) for job in jobs if job.get("Job_ID")]
+        with self._lock, self._conn:
+            existing = self._existing_ids([row[0] for row in rows])
+            self._conn.executemany(
+                "INSERT INTO scraped_jobs (job_id, job_url, data, first_seen, last_seen) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(job_id) DO UPDATE SET job_url = excluded.job_url, data = excluded.data, last_seen = excluded.last_seen",
+                [(job_id, job_url, data, seen_at, seen_at) for job_id, job_url, data in rows],
+            )
+        added = len({row[0] for row in rows} - existing)
+        return added, len(rows) - added
+
+    def _existing_ids(self, job_ids):
+        found = set()
+        for start in range(0, len(job_ids), 500):  # Stay below SQLite's bound-parameter limit
+            chunk = job_ids[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            found.update(row[0] for row in self._conn.execute(f"SELECT job_id FROM scraped_jobs WHERE job_id IN ({placeholders})", chunk))
+        return found
+
+    def all_jobs(self):
+        """
+        Returns every stored job, most recently first seen first.
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT data FROM scraped_jobs ORDER BY first_seen DESC, job_id").fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def get_many(self, job_ids):
+        """
+        Returns the stored jobs for `job_ids`, in the given order. Unknown IDs are skipped.
+        """
+        job_ids = [str(job_id) for job_id in job_ids]
+        jobs = {}
+        with self._lock:
+            for start in range(0, len(job_ids), 500):
+                chunk = job_ids[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                for job_id, data in self._conn.execute(f"SELECT job_id, data FROM scraped_jobs WHERE job_id IN ({placeholders})", chunk):
+                    jobs[job_id] = json.loads(data)
+        return [jobs[job_id] for job_id in dict.fromkeys(job_ids) if job_id in jobs]
+
+    def prune(self, older_than):
+        """
+        Removes jobs last seen before the timestamp `older_than`. Returns how many were removed.
+        """
+        with self._lock, self._conn:
+            return self._conn.execute("DELETE FROM scraped_jobs WHERE last_seen < ?", (older_than,)).rowcount
+
+    def get_meta(self, key, default=None):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM scrape_meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_meta(self, key, value):
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO scrape_meta (key, value) VALUES (?, ?)", (key, json.dumps(value)))
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM scraped_jobs").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class ScrapeScheduler:
+    """
+    Runs `scrape()` on a daemon thread every `interval` seconds (and whenever
+    `trigger()` is called) and writes the results into `store`.
+
+    Args:
+        scrape (callable): Returns a list of job dicts (empty on failure).
+        store (ScrapedJobStore): Where scraped jobs are kept.
+        interval (float): Seconds between scrapes; 0 only scrapes on `trigger()`.
+        ttl (float): Seconds after which jobs no longer listed are removed.
+    """
+
+    def __init__(self, scrape, store, interval=SCRAPE_INTERVAL_SECONDS, ttl=SCRAPED_JOB_TTL_SECONDS):
+        self.scrape = scrape
+        self.store = store
+        self.interval = interval
+        self.ttl = ttl
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.running = False  # True while a scrape is in progress
+
+    def start(self):
+        """
+        Starts the scheduler thread (once). The first scrape runs right away
+        if the store has never been filled or its last scrape is older than the interval.
+        """
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._loop, name="scrape-scheduler", daemon=True)
+            self._thread.start()
+
+    def trigger(self):
+        """
+        Asks for a scrape as soon as possible without waiting for it.
+        """
+        self.start()
+        self._wake.set()
+
+    def stop(self):
+        self._stopped.set()
+        self._wake.set()
+
+    def _loop(self):
+        last_run = self.store.get_meta('last_scrape_at') or 0.0
+        if self.interval > 0 and time.time() - last_run >= self.interval:
+            self._wake.set()
+        while not self._stopped.is_set():
+            if self.interval > 0:
+                timeout = max(0.0, last_run + self.interval - time.time())
+                self._wake.wait(timeout)
+            else:
+                self._wake.wait()
+            if self._stopped.is_set():
+                break
+            self._wake.clear()
+            self.run_once()
+            last_run = time.time()
+
+    def run_once(self):
+        """
+        Scrapes now and stores the results.
+
+        Returns:
+            int: Number of jobs scraped.
+        """
+        self.running = True
+        started = time.time()
+        try:
+            jobs = self.scrape()
+            if jobs:
+                added, updated = self.store.upsert_many(jobs, seen_at=started)
+                removed = self.store.prune(started - self.ttl)
+                logger.info("Scrape stored %d new and %d updated jobs (%d expired removed).", added, updated, removed)
+            else:
+                logger.warning("Scrape returned no jobs; keeping the stored listings.")
+            self.store.set_meta('last_scrape_at', started)
+            self.store.set_meta('last_scrape_count', len(jobs))
+            return len(jobs)
+        except Exception as e:
+            logger.exception("Scheduled scrape failed: %s", e)
+            return 0
+        finally:
+            self.running = False
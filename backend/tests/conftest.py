@@ -0,0 +1,55 @@
+# backend/tests/conftest.py
+# The backend modules are imported as top-level modules (as app.py does), so the
+# backend directory is put on sys.path. Run the tests from backend/ with `python -m pytest tests`.
+# `fake_nlp` swaps the NLP models for a tiny stand-in so matching can be tested offline.
+
+import os
+import re
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Stop words of the stand-in pipeline below
+FAKE_STOP_WORDS = frozenset({'a', 'an', 'and', 'the', 'with', 'of', 'in', 'for'})
+
+
+class _FakeToken:
+    def __init__(self, text, idx):
+        self.text = text
+        self.idx = idx
+        self.lemma_ = text.lower()
+        self.is_alpha = text.isalpha()
+        self.is_digit = text.isdigit()
+        self.is_punct = bool(re.fullmatch(r'\W+', text))
+        self.is_stop = text.lower() in FAKE_STOP_WORDS
+
+
+class _FakeDoc(list):
+    def __init__(self, text):
+        super().__init__(_FakeToken(m.group(), m.start()) for m in re.finditer(r'[\w.#+-]+|[^\w\s]', text))
+        self.text = text
+
+
+class _FakeNlp:
+    def pipe(self, texts, **kwargs):
+        return (_FakeDoc(text) for text in texts)
+
+
+@pytest.fixture
+def fake_nlp(monkeypatch):
+    """
+    Replaces spaCy with a small rule-based pipeline (lowercased words as lemmas) and
+    leaves the sentence model out, so matching runs without downloaded models and
+    semantic matching takes the TF-IDF fallback. The resume cache starts empty.
+    """
+    import match_percentage
+    from resume_cache import resume_cache
+
+    monkeypatch.setitem(match_percentage._resources, 'spacy', _FakeNlp())
+    monkeypatch.setitem(match_percentage._resources, 'stop_words', set(FAKE_STOP_WORDS))
+    monkeypatch.setitem(match_percentage._resources, 'sentence_model', None)
+    resume_cache.clear()
+    yield match_percentage
+    resume_cache.clear()
@@ -0,0 +1,77 @@
+# backend/tests/test_ann_index.py
+# Recall of the approximate job search against exact (brute-force) search.
+
+import numpy as np
+import pytest
+
+import ann_index
+from ann_index import JobAnnIndex, exact_search, recall_at_k
+
+N_JOBS = 3000
+DIM = 48
+TOP_K = 10
+
+
+def clustered_embeddings(n, dim, n_clusters=60, seed=0):
+    """
+    L2-normalized vectors scattered around random cluster centres, like job embeddings
+    of a catalogue with many similar postings.
+    """
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(n_clusters, dim))
+    matrix = centres[rng.integers(0, n_clusters, size=n)] + 1.2 * rng.normal(size=(n, dim))
+    return (matrix / np.linalg.norm(matrix, axis=1, keepdims=True)).astype(np.float32)
+
+
+@pytest.fixture(scope='module')
+def corpus():
+    matrix = clustered_embeddings(N_JOBS + 100, DIM)
+    return matrix[:N_JOBS], matrix[N_JOBS:]  # jobs, queries
+
+
+def mean_recall(index, matrix, queries, **knobs):
+    recalls = []
+    for query in queries:
+        approx = [key for key, _ in index.search(query, top_k=TOP_K, **knobs)]
+        exact, _ = exact_search(matrix, query, TOP_K)
+        recalls.append(recall_at_k(approx, exact))
+    return float(np.mean(recalls))
+
+
+def test_ivf_recall_against_exact_search(corpus):
+    matrix, queries = corpus
+    index = JobAnnIndex(range(N_JOBS), matrix, backend='ivf')
+    assert mean_recall(index, matrix, queries) >= 0.95
+
+
+def test_ivf_recall_grows_with_nprobe(corpus):
+    matrix, queries = corpus
+    index = JobAnnIndex(range(N_JOBS), matrix, backend='ivf')
+    low = mean_recall(index, matrix, queries, nprobe=1)
+    high = mean_recall(index, matrix, queries, nprobe=index._index.n_lists)
+    assert high == 1.0  # Probing every cluster is exhaustive
+    assert low < high
+
+
+@pytest.mark.skipif(ann_index.hnswlib is None, reason="hnswlib is not installed")
+def test_hnsw_recall_against_exact_search(corpus):
+    matrix, queries = corpus
+    index = JobAnnIndex(range(N_JOBS), matrix, backend='hnsw')
+    assert mean_recall(index, matrix, queries) >= 0.95
+
+
+def test_exact_mode_matches_brute_force(corpus):
+    matrix, queries = corpus
+    index = JobAnnIndex([f"job_{i}" for i in range(N_JOBS)], matrix, backend='ivf')
+    for query in queries[:10]:
+        rows, scores = exact_search(matrix, query, TOP_K)
+        results = index.search(query, top_k=TOP_K, exact=True)
+        assert [key for key, _ in results] == [f"job_{row}" for row in rows]
+        assert np.allclose([score for _, score in results], scores)
+
+
+def test_small_catalogues_use_exact_search():
+    matrix = clustered_embeddings(50, DIM, n_clusters=5)
+    index = JobAnnIndex(range(50), matrix)
+    assert index.backend == 'exact'
+    assert mean_recall(index, matrix, matrix[:5]) == 1.0
@@ -0,0 +1,59 @@
+# backend/tests/test_bulk_match.py
+# BulkSkillMatcher against the per-pair scorer it replaces, on random token sets with
+# empty resumes and jobs and plenty of tied scores.
+
+import random
+
+import numpy as np
+import pytest
+
+import bulk_match
+from bulk_match import BulkSkillMatcher, select_top_k, top_k_rows
+
+# A small vocabulary (stop words included) so overlaps and tied scores are common
+VOCABULARY = ['python', 'java', 'sql', 'flask', 'react', 'docker', 'aws', 'c++', 'c#', '.net', 'the', 'and']
+
+
+def random_token_sets(rng, count):
+    # Roughly one set in five is empty
+    return [set(rng.sample(VOCABULARY, rng.choice([0, 0, 1, 2, 3, 4, 6]))) for _ in range(count)]
+
+
+def reference_top_k(percentages, top_k, min_score):
+    ranked = sorted(range(len(percentages)), key=lambda job: (-percentages[job], job))
+    if min_score is not None:
+        ranked = [job for job in ranked if percentages[job] >= min_score]
+    return ranked if top_k is None else ranked[:top_k]
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_bulk_scores_and_top_k_match_per_pair_scorer(fake_nlp, monkeypatch, seed):
+    monkeypatch.setattr(bulk_match, 'BULK_MATCH_CHUNK_SIZE', 7)  # Several chunks per batch
+    rng = random.Random(seed)
+    jobs = random_token_sets(rng, 30)
+    resumes = random_token_sets(rng, 25) + [set()]
+    matcher = BulkSkillMatcher(jobs, job_ids=[f"job{i}" for i in range(len(jobs))])
+    stop_words = fake_nlp.get_stop_words()
+
+    scores = matcher.score_matrix(resumes)
+    expected = [fake_nlp._score_skill_sets(resume, jobs) for resume in resumes]
+    assert scores.tolist() == [percentages for percentages, _ in expected]
+    # Plenty of ties, or the tie-breaking below is not exercised
+    assert max(len(row) - len(set(row)) for row in scores.tolist()) > 5
+
+    all_jobs = np.arange(len(jobs))
+    for top_k in (None, 0, 1, 3, 10, len(jobs) + 5):
+        for min_score in (None, 0, 0.01, 50):
+            bulk = matcher.top_k(resumes, top_k=top_k, min_score=min_score, stop_words=stop_words)
+            rows = top_k_rows(scores, top_k=top_k, min_score=min_score)
+            for i, (percentages, matching_words) in enumerate(expected):
+                ranked = reference_top_k(percentages, top_k, min_score)
+                assert select_top_k(all_jobs, scores[i], top_k, min_score) == (ranked, [percentages[j] for j in ranked])
+                assert rows[i] == [(j, percentages[j]) for j in ranked]
+                assert bulk[i] == [(f"job{j}", percentages[j], matching_words[j]) for j in ranked]
+
+
+def test_no_jobs_or_no_resumes():
+    assert BulkSkillMatcher([]).score_matrix([{'python'}]).shape == (1, 0)
+    assert BulkSkillMatcher([]).top_k([{'python'}, set()]) == [[], []]
+    assert BulkSkillMatcher([{'python'}]).top_k([]) == []
@@ -0,0 +1,61 @@
+# backend/tests/test_instrumentation.py
+# Stage timings collected away from the request (as in a pool worker) and merged back into it.
+
+import instrumentation
+from instrumentation import RequestTimings, collect_stage_timings, instrument_app, merge_stage_timings, stage
+
+
+def test_collected_stages_are_merged_into_request_and_histogram():
+    instrumentation.stage_durations.clear()
+    with collect_stage_timings() as stages:
+        with stage('extraction'):
+            pass
+        with stage('scoring'):
+            pass
+    assert [name for name, _ in stages] == ['extraction', 'scoring']
+
+    timings = RequestTimings()
+    token = instrumentation._request_timings.set(timings)
+    try:
+        merge_stage_timings(stages)
+        merge_stage_timings(stages)
+    finally:
+        instrumentation._request_timings.reset(token)
+
+    assert {name: calls for name, (_, calls) in timings.stages.items()} == {'extraction': 2, 'scoring': 2}
+    counts = {labels: count for labels, (_, count, _) in instrumentation.stage_durations.snapshot().items()}
+    # Once when timed (in a pool worker, that is the worker's own histogram) and once per merge
+    assert counts == {('extraction',): 3, ('scoring',): 3}
+
+
+def test_collecting_does_not_touch_the_current_request():
+    timings = RequestTimings()
+    token = instrumentation._request_timings.set(timings)
+    try:
+        with collect_stage_timings():
+            with stage('extraction'):
+                pass
+        assert instrumentation._request_timings.get() is timings
+    finally:
+        instrumentation._request_timings.reset(token)
+    assert timings.stages == {}
+
+
+def test_ndjson_line_encoding_is_timed_as_serialization():
+    from flask import Flask
+    from response_utils import ndjson_response
+
+    app = Flask(__name__)
+    instrument_app(app)
+
+    @app.route('/stream')
+    def stream():
+        return ndjson_response([{"id": i} for i in range(50)], errors=[{"filename": "x.pdf"}])
+
+    instrumentation.stage_durations.clear()
+    response = app.test_client().get('/stream')
+    lines = response.get_data(as_text=True).splitlines()
+    assert len(lines) == 51 and lines[-1] == '{"type":"error","data":{"filename":"x.pdf"}}'
+    counts = {labels: count for labels, (_, count, _) in instrumentation.stage_durations.snapshot().items()}
+    # One observation for the whole stream, not one per line
+    assert counts == {('serialization',): 1}
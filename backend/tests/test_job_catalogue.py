@@ -0,0 +1,84 @@
+# backend/tests/test_job_catalogue.py
+# JobCatalogue snapshots: shared read-only jobs, swapped as a whole when the catalogue changes.
+
+import copy
+import json
+import pickle
+
+import pytest
+
+from job_catalogue import FrozenJob, JobCatalogue
+
+
+class FakeSource:
+    def __init__(self, jobs):
+        self.jobs = jobs
+        self.fetches = 0
+
+    def fetch(self):
+        self.fetches += 1
+        return json.loads(json.dumps(self.jobs))
+
+    def listen(self, callback):
+        return None
+
+
+@pytest.fixture
+def source():
+    return FakeSource({
+        "j1": {"Job_Title": "Python developer", "Required_Skills": "python, flask"},
+        "j2": {"Job_Title": "Java developer", "Required_Skills": "java, spring"},
+    })
+
+
+def test_snapshot_is_shared_until_the_catalogue_changes(source):
+    catalogue = JobCatalogue(source, ttl=3600)
+    jobs, etag = catalogue.snapshot()
+    assert isinstance(jobs, tuple) and all(isinstance(job, FrozenJob) for job in jobs)
+    assert [job["Job_ID"] for job in jobs] == ["j1", "j2"]
+    assert catalogue.snapshot()[0] is jobs
+    assert catalogue.get_jobs() is jobs
+
+    # A refresh with the same content keeps the snapshot
+    catalogue.refresh()
+    assert catalogue.snapshot() == (jobs, etag) and catalogue.snapshot()[0] is jobs
+
+    source.jobs["j3"] = {"Job_Title": "Data engineer"}
+    catalogue.refresh()
+    new_jobs, new_etag = catalogue.snapshot()
+    assert new_etag != etag
+    assert [job["Job_ID"] for job in new_jobs] == ["j1", "j2", "j3"]
+    # Requests still holding the old snapshot keep seeing it unchanged
+    assert [job["Job_ID"] for job in jobs] == ["j1", "j2"]
+    assert source.fetches == 3
+
+
+def test_events_swap_in_a_new_snapshot(source):
+    catalogue = JobCatalogue(source, ttl=3600)
+    jobs, _ = catalogue.snapshot()
+    catalogue._on_event('patch', '/j1', {"Job_Title": "Senior Python developer"})
+    updated, _ = catalogue.snapshot()
+    assert updated is not jobs
+    assert updated[0]["Job_Title"] == "Senior Python developer" and updated[0]["Required_Skills"] == "python, flask"
+    assert jobs[0]["Job_Title"] == "Python developer"
+
+
+def test_catalogue_jobs_are_read_only_but_copyable(source):
+    job = JobCatalogue(source, ttl=3600).get_jobs()[0]
+    for change in (
+        lambda: job.__setitem__("Job_Title", "x"),
+        lambda: job.__delitem__("Job_Title"),
+        lambda: job.update(Job_Title="x"),
+        lambda: job.pop("Job_Title"),
+        lambda: job.setdefault("Location", "Colombo"),
+        lambda: job.clear(),
+    ):
+        with pytest.raises(TypeError):
+            change()
+    assert job["Job_Title"] == "Python developer"
+
+    mutable = dict(job)
+    mutable["Job_Title"] = "x"
+    assert job["Job_Title"] == "Python developer"
+    assert json.loads(json.dumps(job)) == dict(job)
+    assert copy.deepcopy(job) == job and pickle.loads(pickle.dumps(job)) == job
@@ -0,0 +1,116 @@
+# backend/tests/test_job_index.py
+# The persisted skill index: incremental sync of the postings, and search results
+# against the plain (per-pair) skill matcher.
+
+import random
+
+import pytest
+
+from job_index import JobIndex
+
+
+def split_batch(texts):
+    """
+    Stand-in for match_percentage.preprocess_texts: lowercased, comma/space separated tokens.
+    """
+    return [" ".join(text.lower().replace(",", " ").split()) for text in texts]
+
+
+def postings(index):
+    return {token: set(job_ids) for token, job_ids in index._postings.items()}
+
+
+def test_sync_adds_changes_and_removes_jobs(tmp_path):
+    path = str(tmp_path / "job_index.json")
+    index = JobIndex(path=path)
+    jobs = [
+        {"Job_ID": "j1", "Required_Skills": "python, flask"},
+        {"Job_ID": "j2", "Required_Skills": "java, sql"},
+    ]
+    assert index.sync(jobs, split_batch) == 2
+    assert postings(index) == {"python": {"j1"}, "flask": {"j1"}, "java": {"j2"}, "sql": {"j2"}}
+
+    # Unchanged jobs are not reprocessed
+    assert index.sync(jobs, split_batch) == 0
+
+    jobs[0] = {"Job_ID": "j1", "Required_Skills": "python, django"}
+    jobs.append({"Job_ID": "j3", "Required_Skills": "sql, pandas"})
+    assert index.sync(jobs, split_batch) == 2
+    assert postings(index) == {"python": {"j1"}, "django": {"j1"}, "java": {"j2"}, "sql": {"j2", "j3"}, "pandas": {"j3"}}
+
+    assert index.sync(jobs[1:], split_batch) == 0
+    assert "j1" not in index
+    assert postings(index) == {"java": {"j2"}, "sql": {"j2", "j3"}, "pandas": {"j3"}}
+
+    # The pruned index is what gets loaded again
+    reloaded = JobIndex(path=path)
+    assert postings(reloaded) == postings(index)
+    assert reloaded.get_tokens("j3") == {"sql", "pandas"}
+
+
+def test_sync_without_prune_keeps_other_jobs():
+    index = JobIndex(path="")
+    index.sync([{"Job_ID": "j1", "Required_Skills": "python"}], split_batch)
+    index.sync([{"Job_ID": "j2", "Required_Skills": "java"}], split_batch, prune=False)
+    assert "j1" in index and "j2" in index
+
+
+SKILLS = ["python", "java", "sql", "docker", "aws", "react", "flask", "django", "pandas", "git", "linux", "kotlin"]
+
+
+def random_jobs(rng, n):
+    jobs = []
+    for i in range(n):
+        # Some jobs list no skills at all
+        skills = rng.sample(SKILLS, rng.randint(0, 5))
+        jobs.append({"Job_ID": f"job{i:03d}", "Required_Skills": ", ".join(skills)})
+    return jobs
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_search_matches_plain_skill_matcher(fake_nlp, seed):
+    rng = random.Random(seed)
+    jobs = random_jobs(rng, 60)
+    index = JobIndex(path="")
+    index.sync(jobs, fake_nlp.preprocess_texts)
+
+    for _ in range(5):
+        resume_text = "Skills\n" + ", ".join(rng.sample(SKILLS, rng.randint(0, 6)))
+        percentages, keywords = fake_nlp.calculate_skill_keyword_match(resume_text, [job["Required_Skills"] for job in jobs])
+        expected = {job["Job_ID"]: (percentage, words) for job, percentage, words in zip(jobs, percentages, keywords)}
+
+        results = fake_nlp.search_skill_keyword_match(resume_text, index, include_unmatched=True)
+
+        assert {job_id: (percentage, words) for job_id, percentage, words in results} == expected
+        ranked = sorted(expected, key=lambda job_id: (-expected[job_id][0], job_id))
+        assert [job_id for job_id, _, _ in results] == ranked
+
+
+def test_top_k_and_min_score_follow_full_ranking_with_ties():
+    index = JobIndex(path="")
+    index.sync([
+        {"Job_ID": "b", "Required_Skills": "python, sql"},       # 50
+        {"Job_ID": "a", "Required_Skills": "python, java"},      # 50, ties with b
+        {"Job_ID": "d", "Required_Skills": "python"},            # 100
+        {"Job_ID": "c", "Required_Skills": "python, sql, aws"},  # 33.33
+        {"Job_ID": "f", "Required_Skills": "kotlin"},            # 0
+        {"Job_ID": "e", "Required_Skills": "rust"},              # 0, ties with f
+        {"Job_ID": "g", "Required_Skills": ""},                  # no tokens: 0
+    ], split_batch)
+    resume = {"python"}
+    ranking = [(job_id, percentage) for job_id, percentage, _ in index.search(resume)]
+    # Best first, ties by Job_ID; jobs with no overlap last, by Job_ID
+    assert ranking == [("d", 100.0), ("a", 50.0), ("b", 50.0), ("c", 33.33), ("e", 0.0), ("f", 0.0), ("g", 0.0)]
+
+    for top_k in (0, 1, 2, 3, 5, 7, 10):
+        for min_score in (None, 0, 33.33, 40, 50, 100.01):
+            expected = [item for item in ranking if min_score is None or item[1] >= min_score][:top_k]
+            got = [(job_id, percentage) for job_id, percentage, _ in index.search(resume, top_k=top_k, min_score=min_score)]
+            assert got == expected, (top_k, min_score)
+
+
+def test_search_without_unmatched_jobs():
+    index = JobIndex(path="")
+    index.sync([{"Job_ID": "a", "Required_Skills": "python"}, {"Job_ID": "b", "Required_Skills": "java"}], split_batch)
+    assert [job_id for job_id, _, _ in index.search({"python"}, top_k=5, include_unmatched=False)] == ["a"]
+    assert [job_id for job_id, _, _ in index.search({"python"}, top_k=5)] == ["a", "b"]
@@ -0,0 +1,124 @@
+# backend/tests/test_match_percentage.py
+# Preprocessing and matching in match_percentage, run against the `fake_nlp` stand-in.
+
+import random
+import re
+
+import numpy as np
+
+from resume_cache import resume_cache
+from resume_pool import match_resume_file
+from tfidf_model import CatalogueTfidfModel
+
+RESUME = "Jane Doe\nSkills\nPython, Flask and SQL\nExperience\nBackend developer"
+
+
+def _count_uncached(monkeypatch, match_percentage):
+    calls = []
+    analyze = match_percentage._analyze_uncached
+
+    def counting(texts, *args, **kwargs):
+        calls.append(len(texts))
+        return analyze(texts, *args, **kwargs)
+
+    monkeypatch.setattr(match_percentage, '_analyze_uncached', counting)
+    return calls
+
+
+def test_analysis_cache_key_carries_version_and_backend(fake_nlp, monkeypatch):
+    calls = _count_uncached(monkeypatch, fake_nlp)
+    fake_nlp.analyze_documents([RESUME])
+    fake_nlp.analyze_documents([RESUME])
+    assert calls == [1]
+    keys = list(resume_cache._entries)
+    assert len(keys) == 1
+    assert keys[0].startswith(f"analysis:v{fake_nlp.ANALYSIS_CACHE_VERSION}:spacy-")
+
+
+def test_analyses_are_not_shared_between_backends_or_versions(fake_nlp, monkeypatch):
+    calls = _count_uncached(monkeypatch, fake_nlp)
+    fake_nlp.analyze_documents([RESUME])
+
+    # Another SpaCy model version
+    nlp = fake_nlp.get_nlp()
+    monkeypatch.setattr(nlp, 'meta', {'name': 'core_web_sm', 'version': '9.9.9'}, raising=False)
+    fake_nlp.analyze_documents([RESUME])
+    # A new preprocessing version
+    monkeypatch.setattr(fake_nlp, 'ANALYSIS_CACHE_VERSION', fake_nlp.ANALYSIS_CACHE_VERSION + 1)
+    fake_nlp.analyze_documents([RESUME])
+    assert calls == [1, 1, 1]
+
+
+def test_nltk_fallback_key_changes_with_stop_words(fake_nlp, monkeypatch):
+    monkeypatch.setitem(fake_nlp._resources, 'spacy', None)
+    tag = fake_nlp._analysis_backend_tag()
+    assert tag.startswith("nltk-")
+    monkeypatch.setitem(fake_nlp._resources, 'stop_words', {'python'})
+    assert fake_nlp._analysis_backend_tag() != tag
+
+
+def _baseline_filter_pii(text):
+    # filter_pii before the patterns were precompiled: three re.sub passes in this order
+    text = re.sub(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', '', text)
+    text = re.sub(r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b', '', text)
+    return re.sub(r'http\S+|www.\S+', '', text)
+
+
+PII_CASES = [
+    "Contact jane.doe@example.com or +94 77 123 4567",
+    "Profile: https://example.com/u?mail=jane@example.com",
+    "www.example.org/jane@mail.com is my page",
+    "Employee ID EMP5551234567X, badge 555-123-4567-B",
+    "Ref 1555-123-4567ab and order (555) 123-4567.",
+    "https://x.com/p(555) 123-4567 after a link",
+    "call 555.123.4567@work.io now",
+    "a@b.io(555) 123-4567.x.y@mail.com",
+    "www-555-123-4567 and http5551234567",
+]
+
+
+def test_filter_pii_matches_sequential_baseline(fake_nlp):
+    rng = random.Random(0)
+    pieces = ['a@b.io', 'x.y@mail.com', '555-123-4567', '+94 77 123 4567', '(555) 123-4567', '5551234567',
+              'https://x.com/p', 'www.site.org', 'http', 'www', 'EMP', 'ID', '@', '.io', '-', '.', '/', ' ', '\n', '1', 'a']
+    texts = PII_CASES + [''.join(rng.choice(pieces) for _ in range(rng.randint(1, 7))) for _ in range(2000)]
+
+    expected = [_baseline_filter_pii(text) for text in texts]
+    assert [fake_nlp.filter_pii(text) for text in texts] == expected
+    assert fake_nlp.filter_pii_batch(texts) == expected
+
+
+JOBS = [
+    {"Job_ID": "j1", "Job_Description": "Python developer building Flask services with SQL"},
+    {"Job_ID": "j2", "Job_Description": "Java engineer working on Spring and Kafka"},
+    {"Job_ID": "j3", "Job_Description": "Frontend developer using React and TypeScript"},
+]
+
+
+def test_semantic_fallback_scores_catalogue_jobs_without_refitting(fake_nlp, monkeypatch):
+    model = CatalogueTfidfModel(path='')
+    monkeypatch.setattr(fake_nlp, 'catalogue_tfidf_model', model)
+    fake_nlp.sync_catalogue_tfidf(JOBS)
+    fits = []
+    monkeypatch.setattr(model, '_refit', lambda missing: fits.append(missing))
+    pairwise = []
+    monkeypatch.setattr(fake_nlp, 'pairwise_similarities', lambda *args, **kwargs: pairwise.append(args) or np.zeros(1))
+    descriptions = [job["Job_Description"] for job in JOBS]
+    resume_text = fake_nlp.analyze_documents([RESUME])[0].preprocessed_text
+    job_texts = [analysis.preprocessed_text for analysis in fake_nlp.analyze_documents(descriptions)]
+
+    percentages, keywords = fake_nlp.calculate_semantic_match(RESUME, descriptions, job_ids=["j1", "j2", "j3"], catalogue=True)
+    assert not fits and not pairwise
+    expected = model.similarities(resume_text, ["j1", "j2", "j3"])
+    assert percentages == [float(round(similarity * 100, 2)) for similarity in expected]
+    assert percentages[0] > 0 and keywords[0]
+
+    # A pool worker matches one catalogue job at a time the same way
+    result = match_resume_file("cv.txt", RESUME.encode('utf-8'), descriptions[0], "", "j1", True)
+    assert result["match_percentage"] == round(percentages[0], 2) and not fits and not pairwise
+
+    # Ad-hoc descriptions (no catalogue IDs, or a description that differs from the catalogue's) are fitted per request
+    fake_nlp.calculate_semantic_match(RESUME, descriptions)
+    fake_nlp.calculate_semantic_match(RESUME, ["Go developer"], job_ids=["j1"], catalogue=True)
+    assert len(pairwise) == 2 and not fits
+    assert model.has_rows(["j1"], [job_texts[0]])
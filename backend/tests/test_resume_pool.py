@@ -0,0 +1,106 @@
+# backend/tests/test_resume_pool.py
+# The resume matching pool: worker processes must not start the app's background services,
+# and per-file timeouts only count time a worker spends on the file.
+
+import json
+import threading
+import time
+
+from resume_pool import ResumeMatchPool
+
+
+def _probe_app_import(args):
+    """
+    Runs in a pool worker: imports app.py the way a 'spawn' worker re-imports the main
+    script started with `python app.py`, and reports which services are running.
+    """
+    import app
+    import firebase_admin
+
+    app.start_background_services()  # As when app.py is the re-imported main script
+    return {
+        "services_started": app._services_started,
+        "scheduler_thread": app.scrape_scheduler._thread is not None,
+        "threads": sorted(thread.name for thread in threading.enumerate()),
+        "firebase_apps": len(firebase_admin._apps),
+    }, None, []
+
+
+def test_pool_workers_do_not_start_app_services(tmp_path, monkeypatch):
+    jobs_path = tmp_path / "jobs.json"
+    jobs_path.write_text(json.dumps({}))
+    monkeypatch.chdir(tmp_path)
+    for name, value in {
+        "MATCHER_OFFLINE": "1", "MATCHER_WARMUP": "background", "SCRAPE_INTERVAL_SECONDS": "3600",
+        "SCRAPED_JOBS_DB_PATH": "", "JOB_INDEX_PATH": "", "EMBEDDING_STORE_DIR": "", "JOBS_LOCAL_PATH": str(jobs_path),
+        "FIREBASE_ADMIN_SDK_CONFIG": "",
+    }.items():
+        monkeypatch.setenv(name, value)
+
+    pool = ResumeMatchPool(workers=1, file_timeout=120, start_method='spawn')
+    try:
+        [(report, error)] = pool._run(_probe_app_import, [("probe",)])
+    finally:
+        pool.close()
+
+    assert error is None
+    assert report["services_started"] is False
+    assert report["scheduler_thread"] is False
+    assert "scrape-scheduler" not in report["threads"]
+    assert "matcher-warm-up" not in report["threads"]
+    assert report["firebase_apps"] == 0
+
+
+def _sleep_task(args):
+    filename, seconds = args
+    time.sleep(seconds)
+    return filename, None, []
+
+
+def _run_in_thread(pool, tasks):
+    outcome = {}
+    thread = threading.Thread(target=lambda: outcome.update(result=pool._run(_sleep_task, tasks)))
+    thread.start()
+    return thread, outcome
+
+
+def test_files_queued_behind_another_batch_are_not_timed_out(monkeypatch):
+    monkeypatch.setenv("MATCHER_OFFLINE", "1")
+    pool = ResumeMatchPool(workers=1, file_timeout=1.0, start_method='spawn')
+    try:
+        pool._run(_sleep_task, [("warm", 0)])  # Start the worker first
+        first_pool = pool._pool
+        # The second batch's file waits ~1.4s for the only worker, longer than the timeout
+        thread, first = _run_in_thread(pool, [("a1", 0.7), ("a2", 0.7)])
+        time.sleep(0.2)
+        second = pool._run(_sleep_task, [("b1", 0.1)])
+        thread.join()
+        assert pool._pool is first_pool and not pool._retired  # Nothing timed out, so nothing was retired
+    finally:
+        pool.close()
+
+    assert first["result"] == [("a1", None), ("a2", None)]
+    assert second == [("b1", None)]
+
+
+def test_hung_file_retires_pool_without_stalling_other_batches(monkeypatch):
+    monkeypatch.setenv("MATCHER_OFFLINE", "1")
+    pool = ResumeMatchPool(workers=1, file_timeout=0.5, start_method='spawn')
+    try:
+        pool._run(_sleep_task, [("warm", 0)])
+        started = time.monotonic()
+        thread, first = _run_in_thread(pool, [("hung", 60)])
+        time.sleep(0.2)
+        # Never gets the worker: times out file_timeout after the pool is retired
+        second = pool._run(_sleep_task, [("queued", 0.1)])
+        thread.join()
+        elapsed = time.monotonic() - started
+
+        assert first["result"] == [(None, "Timed out after 0.5 seconds")]
+        assert second == [(None, "Timed out after 0.5 seconds")]
+        assert elapsed < 5
+        assert pool._retired == {} and pool._users == {}  # The stuck pool was terminated
+        # New batches get a fresh pool
+        assert pool._run(_sleep_task, [("after", 0)]) == [("after", None)]
+    finally:
+        pool.close()
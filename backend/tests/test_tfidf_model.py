@@ -0,0 +1,35 @@
+# backend/tests/test_tfidf_model.py
+# A read-only CatalogueTfidfModel (as in a matcher pool worker) sharing the pickle of the writing one.
+
+import os
+
+from tfidf_model import CatalogueTfidfModel
+
+KEYS = ["j1", "j2", "j3"]
+TEXTS = ["python flask sql developer", "java spring kafka engineer", "react typescript frontend developer"]
+
+
+def test_read_only_model_reloads_the_writers_pickle(tmp_path):
+    path = str(tmp_path / "tfidf.pkl")
+    writer = CatalogueTfidfModel(path=path)
+    reader = CatalogueTfidfModel(path=path, read_only=True)
+    assert not reader.has_rows(KEYS, TEXTS)
+
+    writer.sync(KEYS, TEXTS, prune=True)
+    assert reader.has_rows(KEYS, TEXTS)
+    assert list(reader.similarities("python developer", KEYS)) == list(writer.similarities("python developer", KEYS))
+
+    # A changed text has no row until the writer syncs it
+    changed = [TEXTS[0], "java spring boot engineer", TEXTS[2]]
+    assert not reader.has_rows(KEYS, changed)
+    writer.sync(KEYS, changed, prune=True)
+    assert reader.has_rows(KEYS, changed)
+    assert not reader.has_rows(KEYS, TEXTS)
+
+
+def test_read_only_model_is_never_saved(tmp_path):
+    path = str(tmp_path / "tfidf.pkl")
+    reader = CatalogueTfidfModel(path=path, read_only=True)
+    reader.sync(KEYS, TEXTS)
+    assert reader.has_rows(KEYS, TEXTS)
+    assert not os.path.exists(path)
@@ -0,0 +1,128 @@
+# backend/tests/test_topjobs_scraper.py
+# End-to-end scrape of the benchmark fixture pages served by a local http.server:
+# parsed jobs, conditional-GET revalidation through the HTTP cache, and per-host rate limiting.
+
+import hashlib
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from topjobs_scraper import HostRateLimiter, TopJobsScraper, parse_detail, parse_listing
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks', 'fixtures')
+RATE_LIMIT = 20  # Requests per second
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), 'rb') as f:
+        return f.read()
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """
+    Serves the listing fixture at / and the detail fixture for every job link,
+    with an ETag, and answers a matching If-None-Match with 304.
+    """
+    pages = {}
+    requests_seen = []  # (arrival time, path, status)
+
+    def do_GET(self):
+        body = self.pages['detail'] if self.path.startswith('/employer/') else self.pages['listing']
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        status = 304 if self.headers.get('If-None-Match') == etag else 200
+        self.requests_seen.append((time.monotonic(), self.path, status))
+        self.send_response(status)
+        self.send_header('ETag', etag)
+        if status == 200:
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if status == 200:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope='module')
+def server():
+    FixtureHandler.pages = {'listing': read_fixture('topjobs_listing.html'), 'detail': read_fixture('topjobs_detail.html')}
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def scraper(server):
+    FixtureHandler.requests_seen = []
+    scraper = TopJobsScraper(base_url=server, max_workers=4, rate_limit=RATE_LIMIT)
+    yield scraper
+    scraper.close()
+
+
+def test_scrape_parses_listing_and_detail_pages(server, scraper):
+    cards = parse_listing(FixtureHandler.pages['listing'].decode('utf-8'), server)
+    detail_description, _ = parse_detail(FixtureHandler.pages['detail'].decode('utf-8'))
+    short = [card for card in cards if len(card["Job_Description"]) < 100]
+    assert cards and short
+
+    jobs = scraper.scrape()
+
+    listing_order = [card["Job_URL"] for card in cards]
+    assert jobs and [job["Job_URL"] for job in jobs] == sorted((job["Job_URL"] for job in jobs), key=listing_order.index)
+    assert all(job["Job_URL"].startswith(server + "employer/") for job in jobs)
+    assert all(job["Source"] == "TopJobs.lk" and job["Job_ID"].startswith("topjobs_") for job in jobs)
+    assert len({job["Job_ID"] for job in jobs}) == len(jobs)
+    by_url = {job["Job_URL"]: job for job in jobs}
+    for card in cards:
+        job = by_url.get(card["Job_URL"])
+        if job is None:
+            continue
+        assert job["Job_Title"] == card["Job_Title"]
+        # Short descriptions are replaced by the one on the detail page
+        expected = detail_description if card in short else card["Job_Description"]
+        assert job["Job_Description"] == expected
+    # One listing request and one request per short card
+    assert len(FixtureHandler.requests_seen) == 1 + len(short)
+
+
+def test_second_scrape_revalidates_with_conditional_requests(scraper):
+    first = scraper.scrape()
+    assert scraper.cache.hits == 0
+    misses = scraper.cache.misses
+    assert all(status == 200 for _, _, status in FixtureHandler.requests_seen)
+
+    FixtureHandler.requests_seen = []
+    second = scraper.scrape()
+
+    assert second == first
+    assert FixtureHandler.requests_seen and all(status == 304 for _, _, status in FixtureHandler.requests_seen)
+    assert scraper.cache.hits == len(FixtureHandler.requests_seen)
+    assert scraper.cache.misses == misses
+
+
+def test_requests_to_one_host_are_rate_limited(scraper):
+    scraper.scrape()
+
+    arrivals = sorted(arrived for arrived, _, _ in FixtureHandler.requests_seen)
+    assert len(arrivals) > 2
+    gaps = [later - earlier for earlier, later in zip(arrivals, arrivals[1:])]
+    # Requests leave at least 1/rate apart; allow a little jitter on arrival
+    assert min(gaps) >= 0.8 / RATE_LIMIT
+    assert arrivals[-1] - arrivals[0] >= (len(arrivals) - 1) / RATE_LIMIT * 0.9
+
+
+def test_rate_limit_is_per_host():
+    limiter = HostRateLimiter(rate=2)
+    limiter.wait("http://127.0.0.1/a")
+    started = time.monotonic()
+    limiter.wait("http://localhost/a")  # Another host is not delayed
+    assert time.monotonic() - started < 0.1
+    limiter.wait("http://127.0.0.1/b")  # The same host waits for its next slot
+    assert time.monotonic() - started >= 0.4
@@ -0,0 +1,259 @@
+# backend/text_extraction.py
+# Resume text extraction (PDF, DOCX, TXT).
+# Kept separate from app.py so worker processes can import it without
+# initializing Flask or Firebase.
+# Uploads are parsed straight from memory; only very large files are spilled to disk.
+
+import contextlib
+import hashlib
+import io
+import logging
+import os
+import tempfile
+
+import docx2txt
+import PyPDF2
+
+from instrumentation import timed
+from resume_cache import resume_cache, sha256_bytes
+
+logger = logging.getLogger(__name__)
+
+# Uploads larger than this are rejected
+MAX_RESUME_BYTES = int(os.environ.get('MAX_RESUME_BYTES', 10 * 1024 * 1024))
+# Uploads larger than this are written to a temporary file instead of kept in memory
+RESUME_SPOOL_BYTES = int(os.environ.get('RESUME_SPOOL_BYTES', 2 * 1024 * 1024))
+
+# PDF budgets: stop after this many pages / characters (0 disables the limit)
+PDF_MAX_PAGES = int(os.environ.get('PDF_MAX_PAGES', 50))
+PDF_MAX_CHARS = int(os.environ.get('PDF_MAX_CHARS', 200000))
+# Give up when this many leading pages have no text layer (image-only scans)
+PDF_EMPTY_PAGE_LIMIT = int(os.environ.get('PDF_EMPTY_PAGE_LIMIT', 5))
+
+_READ_CHUNK_SIZE = 64 * 1024
+
+
+class ResumeTooLargeError(ValueError):
+    """
+    Raised when an uploaded resume exceeds MAX_RESUME_BYTES.
+    """
+
+
+class UploadedResume:
+    """
+    An uploaded resume held either in memory (`data`) or, for very large files,
+    in a temporary file on disk (`path`). Plain attributes only, so it can be
+    sent to worker processes.
+    """
+
+    def __init__(self, filename, data=None, path=None):
+        self.filename = filename
+        self.data = data
+        self.path = path
+
+    @property
+    def source(self):
+        """
+        What to pass to `extract_text`: the bytes, or the spill file path.
+        """
+        return self.data if self.data is not None else self.path
+
+    def cleanup(self):
+        """
+        Removes the spill file, if there is one.
+        """
+        if self.path and os.path.exists(self.path):
+            try:
+                os.remove(self.path)
+            except Exception as e:
+                logger.error("Error removing spilled upload %s: %s", self.path, e)
+        self.path = None
+
+
+def read_upload(stream, filename, max_bytes=MAX_RESUME_BYTES, spool_bytes=RESUME_SPOOL_BYTES, spool_dir=None):
+    """
+    Reads an upload stream in chunks, enforcing the size cap.
+
+    Args:
+        stream: A binary file-like object (e.g. werkzeug's FileStorage.stream).
+        filename (str): The (sanitized) upload filename, used for its extension.
+        max_bytes (int): Maximum accepted size.
+        spool_bytes (int): Above this size the upload is written to a temporary file.
+        spool_dir (str, optional): Directory for spill files (defaults to the system temp dir).
+
+    Returns:
+        UploadedResume: The upload, in memory or spilled to disk.
+
+    Raises:
+        ResumeTooLargeError: If the upload is larger than `max_bytes`.
+    """
+    buffer = io.BytesIO()
+    spill = None
+    total = 0
+    try:
+        while True:
+            chunk = stream.read(_READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            total += len(chunk)
+            if total > max_bytes:
+                raise ResumeTooLargeError(f"{filename} is larger than {max_bytes} bytes")
+            if spill is None and total > spool_bytes:
+                # Switch to a temporary file, keeping the extension for `extract_text`
+                spill = tempfile.NamedTemporaryFile(delete=False, suffix=_file_extension(filename), dir=spool_dir)
+                spill.write(buffer.getvalue())
+                buffer = None
+            if spill is not None:
+                spill.write(chunk)
+            else:
+                buffer.write(chunk)
+    except Exception:
+        if spill is not None:
+            spill.close()
+            os.remove(spill.name)
+        raise
+
+    if spill is not None:
+        spill.close()
+        return UploadedResume(filename, path=spill.name)
+    return UploadedResume(filename, data=buffer.getvalue())
+
+
+def _file_extension(filename):
+    return os.path.splitext(filename or "")[-1].lower()
+
+
+@timed('extraction')
+def extract_text(source, filename=None):
+    """
+    Extracts text from PDF, DOCX, or TXT files.
+
+    Args:
+        source: A file path, the file's bytes, or a binary file-like object.
+        filename (str, optional): Used to pick the format when `source` is not a path.
+    """
+    if isinstance(source, str):
+        filename = filename or source
+    name = filename or "<stream>"
+    extension = _file_extension(filename)
+
+    if extension == '.pdf':
+        try:
+            return extract_pdf_text(source)
+        except Exception as e:
+            logger.error("Error extracting text from PDF %s: %s", name, e)
+            return ""
+    elif extension == '.docx':
+        try:
+            # docx2txt opens the document with zipfile, which accepts paths and file-like objects
+            with _open_binary(source) as f:
+                return docx2txt.process(f)
+        except Exception as e:
+            logger.error("Error extracting text from DOCX %s: %s", name, e)
+            return ""
+    elif extension == '.txt':
+        try:
+            with _open_binary(source) as f:
+                text = f.read().decode('utf-8')
+            # Same newline handling as reading the file in text mode
+            return text.replace('\r\n', '\n').replace('\r', '\n')
+        except Exception as e:
+            logger.error("Error extracting text from TXT %s: %s", name, e)
+            return ""
+    return ""
+
+
+def iter_pdf_pages(source, max_pages=None):
+    """
+    Yields the text of a PDF one page at a time, so callers can stop early
+    without parsing the rest of the document.
+
+    Args:
+        source: A file path, the file's bytes, or a binary file-like object.
+        max_pages (int, optional): Stop after this many pages.
+    """
+    with _open_binary(source) as f:
+        reader = PyPDF2.PdfReader(f)
+        for page_number, page in enumerate(reader.pages):
+            if max_pages and page_number >= max_pages:
+                break
+            yield page.extract_text() or ""
+
+
+def extract_pdf_text(source, max_pages=PDF_MAX_PAGES, max_chars=PDF_MAX_CHARS, empty_page_limit=PDF_EMPTY_PAGE_LIMIT):
+    """
+    Extracts the text of a PDF page by page and joins the pieces once.
+    Extraction stops early when the page or character budget is used up, or
+    when the first `empty_page_limit` pages have no text (an image-only scan).
+    A budget of 0 disables that limit.
+    """
+    pieces = []
+    total_chars = 0
+    for page_number, page_text in enumerate(iter_pdf_pages(source, max_pages=max_pages), start=1):
+        if not page_text:
+            if total_chars == 0 and empty_page_limit and page_number >= empty_page_limit:
+                logger.warning("No text found in the first %s PDF pages. Treating it as an image-only PDF.", page_number)
+                break
+            continue
+        pieces.append(page_text)
+        total_chars += len(page_text)
+        if max_chars and total_chars >= max_chars:
+            logger.info("PDF text budget of %s characters reached after %s pages.", max_chars, page_number)
+            break
+
+    text = "".join(pieces)
+    return text[:max_chars] if max_chars else text
+
+
+def extract_text_cached(source, filename=None):
+    """
+    Same as `extract_text`, but looks the result up in the content-addressed
+    resume cache first (keyed by the SHA-256 of the file bytes and the format).
+    Paths and streams are hashed in chunks, so a spilled upload is never read into
+    memory as a whole; on a miss the original source is passed to `extract_text`.
+    """
+    if isinstance(source, str):
+        filename = filename or source
+    if not isinstance(source, (str, bytes, bytearray, memoryview)) and not source.seekable():
+        source = source.read()  # A stream that can't be rewound has to be read once for both steps
+
+    key = f"text:{_file_extension(filename)}:{_content_hash(source)}"
+    cached = resume_cache.get(key)
+    if cached is not None:
+        return cached["text"]
+
+    text = extract_text(source, filename)
+    if text:
+        resume_cache.put(key, {"text": text})
+    return text
+
+
+def _content_hash(source):
+    """
+    Returns the SHA-256 hex digest of a path, bytes or seekable stream source,
+    reading files in chunks. A stream is rewound to where it was afterwards.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return sha256_bytes(source)
+    digest = hashlib.sha256()
+    with _open_binary(source) as f:
+        start = f.tell()
+        for chunk in iter(lambda: f.read(_READ_CHUNK_SIZE), b''):
+            digest.update(chunk)
+        f.seek(start)
+    return digest.hexdigest()
+
+
+@contextlib.contextmanager
+def _open_binary(source):
+    """
+    Yields a binary stream for a path, bytes or file-like source.
+    Only files opened here are closed afterwards.
+    """
+    if isinstance(source, str):
+        with open(source, 'rb') as f:
+            yield f
+    elif isinstance(source, (bytes, bytearray, memoryview)):
+        yield io.BytesIO(source)
+    else:
+        yield source
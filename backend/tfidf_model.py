@@ -0,0 +1,304 @@
+# backend/tfidf_model.py
+# TF-IDF model fitted once on the job catalogue, used when the SentenceTransformer is
+# unavailable. Job vectors are kept as one sparse, L2-normalized CSR matrix; a request
+# only transforms the resume and takes a sparse matrix-vector product.
+# New or changed jobs are transformed with the existing vocabulary and IDF weights, and
+# the model is refitted on the whole catalogue once enough of it has changed or the fit
+# is older than TFIDF_REFIT_SECONDS. The model can be pickled to TFIDF_MODEL_PATH.
+# Only the catalogue goes into the model. Ad-hoc job lists are scored with
+# `pairwise_similarities`, a throwaway model fitted on the resume and those jobs, so
+# their scores don't depend on what earlier requests sent.
+# Matcher pool workers open the pickle read-only and reload it when the request process
+# saved a newer one, so they score catalogue jobs without fitting a model either.
+
+import hashlib
+import logging
+import os
+import pickle
+import threading
+import time
+
+import numpy as np
+
+from instrumentation import timed
+
+logger = logging.getLogger(__name__)
+
+# Optional pickle file for the fitted model (not persisted when empty)
+TFIDF_MODEL_PATH = os.environ.get('TFIDF_MODEL_PATH', '')
+# Refit when new/changed rows since the last fit exceed this fraction of the catalogue
+TFIDF_REFIT_RATIO = float(os.environ.get('TFIDF_REFIT_RATIO', 0.2))
+# Refit a model older than this on the next sync (0 disables time-based refits)
+TFIDF_REFIT_SECONDS = int(os.environ.get('TFIDF_REFIT_SECONDS', 24 * 60 * 60))
+# Bump this whenever the stored format changes, so old pickles are discarded
+TFIDF_MODEL_VERSION = 1
+
+
+def _text_hash(text):
+    return hashlib.sha256((text or "").encode('utf-8')).hexdigest()
+
+
+@timed('scoring')
+def pairwise_similarities(text, job_texts, stop_words='english'):
+    """
+    Cosine similarities between `text` and each job text under a TF-IDF model fitted
+    on just these texts and discarded afterwards (for job lists outside the catalogue).
+
+    Returns:
+        numpy.ndarray: One similarity per job text, in [0, 1].
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    job_texts = list(job_texts)
+    if not job_texts:
+        return np.zeros(0, dtype=np.float64)
+    # Handle empty documents for TF-IDF
+    corpus = [t if t.strip() else "empty document" for t in [text] + job_texts]
+    try:
+        matrix = TfidfVectorizer(stop_words=stop_words).fit_transform(corpus).tocsr()
+    except ValueError as e:
+        # e.g. every text consists only of stop words
+        logger.warning("Could not fit a TF-IDF model: %s", e)
+        return np.zeros(len(job_texts), dtype=np.float64)
+    # Rows are L2-normalized, so the dot product is the cosine similarity
+    return np.asarray((matrix[1:] @ matrix[0].T).todense()).ravel()
+
+
+class CatalogueTfidfModel:
+    """
+    TF-IDF vectors of a job catalogue, keyed like the embedding store
+    (Job_ID, or "text:<hash>" for texts without an ID).
+
+    Args:
+        path (str): Pickle file to load from and save to ('' keeps the model in memory only).
+        stop_words (str or list): Passed to TfidfVectorizer.
+        read_only (bool): Never save the model (matcher pool workers); see `has_rows`.
+    """
+
+    def __init__(self, path=TFIDF_MODEL_PATH, stop_words='english', read_only=False):
+        self.path = path
+        self.stop_words = stop_words
+        self.read_only = read_only
+        self._vectorizer = None
+        self._matrix = None        # (rows, vocabulary) CSR, L2-normalized rows
+        self._texts = []           # Text of each row (None for rows replaced since the last fit)
+        self._hashes = []
+        self._row_of = {}          # key -> row number
+        self._fitted_at = 0.0
+        self._changed_since_fit = 0
+        self._file_mtime = None    # mtime of the pickle this model was loaded from or saved to
+        self._lock = threading.RLock()
+        self.load()
+
+    def load(self):
+        """
+        Loads a pickled model. A missing, unreadable or outdated file starts empty.
+        """
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+            with open(self.path, 'rb') as f:
+                state = pickle.load(f)
+            if state.get("version") != TFIDF_MODEL_VERSION:
+                logger.warning("TF-IDF model at '%s' has an old format. Refitting it.", self.path)
+                return
+            with self._lock:
+                self._vectorizer = state["vectorizer"]
+                self._matrix = state["matrix"]
+                self._texts = state["texts"]
+                self._hashes = state["hashes"]
+                self._row_of = state["row_of"]
+                self._fitted_at = state["fitted_at"]
+                self._file_mtime = mtime
+            logger.info("TF-IDF model loaded from '%s' (%s jobs).", self.path, len(self._row_of))
+        except Exception as e:
+            logger.error("Error loading TF-IDF model from %s: %s. Starting with an empty model.", self.path, e)
+
+    def _reload_if_changed(self):
+        """
+        Reloads the model if another process saved the pickle since it was read.
+
+        Returns:
+            bool: Whether the model was reloaded.
+        """
+        if not self.path:
+            return False
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return False
+        if mtime == self._file_mtime:
+            return False
+        self.load()
+        return True
+
+    def save(self):
+        """
+        Pickles the model (temp file, then rename).
+        """
+        if not self.path or self.read_only or self._vectorizer is None:
+            return
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump({
+                    "version": TFIDF_MODEL_VERSION,
+                    "vectorizer": self._vectorizer,
+                    "matrix": self._matrix,
+                    "texts": self._texts,
+                    "hashes": self._hashes,
+                    "row_of": self._row_of,
+                    "fitted_at": self._fitted_at,
+                }, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.path)
+            self._file_mtime = os.stat(self.path).st_mtime_ns
+        except Exception as e:
+            logger.error("Error saving TF-IDF model to %s: %s", self.path, e)
+
+    def sync(self, keys, texts, prune=False):
+        """
+        Makes sure every (key, text) pair has an up-to-date row.
+        New and changed texts are transformed with the current vocabulary, or the
+        whole catalogue is refitted if too much has changed or the fit is too old.
+
+        Args:
+            keys (list of str): One key per text (Job_ID, or None to key by text hash).
+            texts (list of str): The (preprocessed) job texts.
+            prune (bool): Drop rows whose key is not in `keys` (forces a refit if any are dropped).
+
+        Returns:
+            list of str: The resolved keys, one per text.
+        """
+        hashes = [_text_hash(text) for text in texts]
+        keys = [key if key else f"text:{digest}" for key, digest in zip(keys, hashes)]
+
+        with self._lock:
+            missing = {}  # key -> (hash, text), de-duplicated
+            for key, digest, text in zip(keys, hashes, texts):
+                row = self._row_of.get(key)
+                if row is None or self._hashes[row] != digest:
+                    missing[key] = (digest, text)
+
+            pruned = False
+            if prune:
+                wanted = set(keys)
+                for key in [key for key in self._row_of if key not in wanted]:
+                    self._texts[self._row_of.pop(key)] = None
+                    pruned = True
+
+            if not missing and not pruned and not self._is_stale(0):
+                return keys
+
+            if self._vectorizer is None or pruned or self._is_stale(len(missing)):
+                self._refit(missing)
+            else:
+                self._append(missing)
+            self.save()
+        return keys
+
+    def _is_stale(self, n_missing):
+        if self._vectorizer is None:
+            return True
+        if TFIDF_REFIT_SECONDS and time.time() - self._fitted_at > TFIDF_REFIT_SECONDS:
+            return True
+        return self._changed_since_fit + n_missing > TFIDF_REFIT_RATIO * max(len(self._row_of), 1)
+
+    def _append(self, missing):
+        """
+        Transforms new/changed texts with the fitted vocabulary and adds them as new rows.
+        A changed key points at its new row; the old row is dropped at the next refit.
+        """
+        from scipy import sparse
+
+        missing_keys = list(missing)
+        new_rows = self._vectorizer.transform([missing[key][1] for key in missing_keys])
+        self._matrix = sparse.vstack([self._matrix, new_rows], format='csr')
+        for key in missing_keys:
+            old_row = self._row_of.get(key)
+            if old_row is not None:
+                self._texts[old_row] = None
+            self._row_of[key] = len(self._texts)
+            self._texts.append(missing[key][1])
+            self._hashes.append(missing[key][0])
+        self._changed_since_fit += len(missing_keys)
+        logger.info("TF-IDF model updated: %s job vectors added.", len(missing_keys))
+
+    def _refit(self, missing):
+        """
+        Fits a new vectorizer on the whole catalogue (stored rows plus `missing`).
+        """
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        catalogue = {key: (self._hashes[row], self._texts[row]) for key, row in self._row_of.items()}
+        catalogue.update(missing)
+        keys = list(catalogue)
+        # Handle empty documents for TF-IDF
+        texts = [catalogue[key][1] if catalogue[key][1].strip() else "empty document" for key in keys]
+
+        started = time.perf_counter()
+        vectorizer = TfidfVectorizer(stop_words=self.stop_words)
+        try:
+            matrix = vectorizer.fit_transform(texts).tocsr()
+        except ValueError as e:
+            # e.g. every text consists only of stop words
+            logger.warning("Could not fit the TF-IDF model: %s", e)
+            vectorizer, matrix = None, None
+
+        self._vectorizer = vectorizer
+        self._matrix = matrix
+        self._texts = [catalogue[key][1] for key in keys]
+        self._hashes = [catalogue[key][0] for key in keys]
+        self._row_of = {key: row for row, key in enumerate(keys)}
+        self._fitted_at = time.time()
+        self._changed_since_fit = 0
+        logger.info("TF-IDF model fitted on %d jobs in %.1f ms", len(keys), (time.perf_counter() - started) * 1000)
+
+    def refit(self):
+        """
+        Refits the model on the current catalogue now (e.g. from a scheduled task).
+        """
+        with self._lock:
+            self._refit({})
+            self.save()
+
+    def has_rows(self, keys, texts):
+        """
+        Whether every key has a row built from exactly this (preprocessed) text.
+        A read-only model first picks up a pickle saved since it was loaded.
+        """
+        hashes = [_text_hash(text) for text in texts]
+        with self._lock:
+            if self._rows_match(keys, hashes):
+                return True
+            return self.read_only and self._reload_if_changed() and self._rows_match(keys, hashes)
+
+    def _rows_match(self, keys, hashes):
+        rows = [self._row_of.get(key) for key in keys]
+        return all(row is not None and self._hashes[row] == digest for row, digest in zip(rows, hashes))
+
+    @timed('scoring')
+    def similarities(self, text, keys):
+        """
+        Returns the cosine similarity between `text` and the rows of `keys`
+        (as returned by `sync`). Only `text` is transformed.
+
+        Returns:
+            numpy.ndarray: One similarity per key, in [0, 1].
+        """
+        with self._lock:
+            if self._vectorizer is None or not keys:
+                return np.zeros(len(keys), dtype=np.float64)
+            query = self._vectorizer.transform([text if text.strip() else "empty document"])
+            rows = [self._row_of[key] for key in keys]
+            scores = self._matrix[rows] @ query.T
+        return np.asarray(scores.todense()).ravel()
+
+    def __contains__(self, key):
+        return key in self._row_of
+
+    def __len__(self):
+        return len(self._row_of)
@@ -0,0 +1,437 @@
+# backend/topjobs_scraper.py
+# Scraper engine for IT job listings on TopJobs.lk.
+# All requests go through one pooled requests.Session (kept-alive connections), detail
+# pages are fetched concurrently by a bounded thread pool, every host is rate limited,
+# and responses carrying an ETag or Last-Modified header are cached and revalidated
+# with conditional requests (a 304 reuses the cached body).
+# The base URL is configurable, so the scraper can be pointed at a local HTTP server
+# serving fixture HTML.
+# Pages are parsed with lxml and precompiled XPath selectors when lxml is installed,
+# otherwise with BeautifulSoup (html.parser) restricted by a SoupStrainer to the tags the
+# selectors look at. benchmarks/bench_scraper_parsing.py compares both with the old parser.
+
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urldefrag, urljoin, urlparse
+
+import requests
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+except ImportError:  # Optional dependency: fall back to BeautifulSoup's html.parser
+    lxml_html = None
+
+logger = logging.getLogger(__name__)
+
+TOPJOBS_BASE_URL = os.environ.get('TOPJOBS_BASE_URL', 'https://www.topjobs.lk/')
+# Detail pages fetched at the same time
+SCRAPER_MAX_WORKERS = int(os.environ.get('SCRAPER_MAX_WORKERS', 8))
+# Requests per second allowed to each host (0 disables the limit)
+SCRAPER_RATE_LIMIT = float(os.environ.get('SCRAPER_RATE_LIMIT', 4))
+SCRAPER_LISTING_TIMEOUT = float(os.environ.get('SCRAPER_LISTING_TIMEOUT', 15))
+SCRAPER_DETAIL_TIMEOUT = float(os.environ.get('SCRAPER_DETAIL_TIMEOUT', 5))
+# Most listing cards looked at per scrape (keeps the load on the site bounded)
+SCRAPER_MAX_CARDS = int(os.environ.get('SCRAPER_MAX_CARDS', 15))
+# 'lxml' (default when installed) or 'html.parser'
+SCRAPER_PARSER = os.environ.get('SCRAPER_PARSER', 'lxml' if lxml_html is not None else 'html.parser').lower()
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+IT_KEYWORDS = ['it', 'software', 'developer', 'engineer', 'programmer', 'analyst', 'data science', 'cybersecurity', 'network', 'cloud', 'devops', 'qa', 'ux', 'ui']
+
+
+class HostRateLimiter:
+    """
+    Spaces out requests to the same host to at most `rate` per second.
+    """
+
+    def __init__(self, rate=SCRAPER_RATE_LIMIT):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_allowed = {}  # host -> earliest time of the next request
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        if not self.interval:
+            return
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_allowed.get(host, now))
+            self._next_allowed[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class HttpCache:
+    """
+    In-memory cache of response bodies with their validators (ETag / Last-Modified).
+    """
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self._entries = {}  # url -> {"etag", "last_modified", "text"}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def conditional_headers(self, url):
+        with self._lock:
+            entry = self._entries.get(url)
+        if entry is None:
+            return {}
+        headers = {}
+        if entry["etag"]:
+            headers['If-None-Match'] = entry["etag"]
+        if entry["last_modified"]:
+            headers['If-Modified-Since'] = entry["last_modified"]
+        return headers
+
+    def get_text(self, url):
+        with self._lock:
+            entry = self._entries.get(url)
+            return entry["text"] if entry else None
+
+    def store(self, url, response):
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+        with self._lock:
+            if url not in self._entries and len(self._entries) >= self.max_entries:
+                self._entries.pop(next(iter(self._entries)))  # Drop the oldest entry
+            self._entries[url] = {"etag": etag, "last_modified": last_modified, "text": response.text}
+
+
+class TopJobsScraper:
+    """
+    Scrapes IT-related job listings from TopJobs.lk (or any site with the same markup).
+
+    Args:
+        base_url (str): Listing page to scrape.
+        max_workers (int): Concurrent detail page fetches.
+        rate_limit (float): Requests per second per host.
+        session (requests.Session, optional): Session to use (a pooled one is created otherwise).
+    """
+
+    def __init__(self, base_url=TOPJOBS_BASE_URL, max_workers=SCRAPER_MAX_WORKERS, rate_limit=SCRAPER_RATE_LIMIT, session=None):
+        self.base_url = base_url
+        self.max_workers = max(1, max_workers)
+        self.rate_limiter = HostRateLimiter(rate_limit)
+        self.cache = HttpCache()
+        self.session = session or self._make_session()
+
+    def _make_session(self):
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=self.max_workers)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers['User-Agent'] = USER_AGENT
+        return session
+
+    def fetch(self, url, timeout):
+        """
+        GETs `url` through the rate limiter and the HTTP cache.
+
+        Returns:
+            str: The response body.
+
+        Raises:
+            requests.exceptions.RequestException: On network errors or 4xx/5xx responses.
+        """
+        self.rate_limiter.wait(url)
+        response = self.session.get(url, headers=self.cache.conditional_headers(url), timeout=timeout)
+        if response.status_code == 304:
+            text = self.cache.get_text(url)
+            if text is not None:
+                self.cache.hits += 1
+                return text
+            # Cache entry was evicted meanwhile: fetch unconditionally
+            response = self.session.get(url, timeout=timeout)
+        response.raise_for_status() # Raise HTTPError for bad responses (4xx or 5xx)
+        self.cache.misses += 1
+        self.cache.store(url, response)
+        return response.text
+
+    def scrape(self, url=None):
+        """
+        Scrapes the listing page and the detail pages of cards with a short description.
+        NOTE: This is highly dependent on the website's HTML structure.
+        It may break if the website changes.
+
+        Returns:
+            list of dict: IT-related jobs (empty if the page could not be scraped).
+        """
+        url = url or self.base_url
+        started = time.perf_counter()
+        try:
+            html = self.fetch(url, SCRAPER_LISTING_TIMEOUT)
+            cards = parse_listing(html, url)
+            if not cards:
+                return []
+
+            # Detail pages are fetched concurrently; results keep the listing order
+            needs_detail = [card for card in cards if len(card["Job_Description"]) < 100 and card["Job_URL"].startswith('http')]
+            if needs_detail:
+                with ThreadPoolExecutor(max_workers=min(self.max_workers, len(needs_detail))) as executor:
+                    for card, detail in zip(needs_detail, executor.map(self._fetch_detail, needs_detail)):
+                        if detail is None:
+                            continue
+                        full_description, full_skills = detail
+                        if full_description:
+                            card["Job_Description"] = full_description
+                        if full_skills and card["Required_Skills"] == 'N/A': # Only update if not found previously
+                            card["Required_Skills"] = full_skills
+
+            jobs = [_to_job(card) for card in cards if _is_it_job(card)]
+        except requests.exceptions.RequestException as e:
+            logger.error("Error during web scraping (network/HTTP issue): %s", e)
+            return []
+        except Exception as e:
+            logger.error("An unexpected error occurred during scraping: %s", e)
+            return []
+        logger.info(
+            "Scraped %d IT jobs from %s in %.1f ms (%d detail pages, cache hits: %d)",
+            len(jobs), url, (time.perf_counter() - started) * 1000, len(needs_detail), self.cache.hits,
+        )
+        return jobs
+
+    def _fetch_detail(self, card):
+        try:
+            return parse_detail(self.fetch(card["Job_URL"], SCRAPER_DETAIL_TIMEOUT))
+        except Exception as detail_e:
+            logger.warning("Could not fetch full description for %s: %s", card["Job_URL"], detail_e)
+            return None
+
+    def close(self):
+        self.session.close()
+
+
+# --- IMPORTANT: These selectors are examples. You MUST inspect TopJobs.lk's HTML ---
+# Each selector matches elements whose class attribute contains one of the words
+# (case-insensitive), in document order, like the original BeautifulSoup lambdas.
+_CONTAINER_CLASS = 'job-list-container' # Hypothetical container class
+_CARD_WORDS = ('job-card',) # Generic search for "job-card"
+_BROAD_CARD_TAGS, _BROAD_CARD_WORDS = ('div', 'li', 'article'), ('job', 'listing', 'post')
+_TITLE_TAGS, _TITLE_WORDS = ('h2', 'h3', 'a'), ('title',)
+_COMPANY_TAGS, _COMPANY_WORDS = ('span', 'p', 'div'), ('company', 'employer')
+_DESCRIPTION_TAGS, _DESCRIPTION_WORDS = ('div', 'p'), ('description', 'summary')
+_SKILLS_TAGS, _SKILLS_WORDS = ('div', 'ul', 'p'), ('skills', 'requirements')
+_FULL_DESCRIPTION_WORDS = ('job-details-content', 'job-description-full')
+
+
+def _class_regex(words):
+    return re.compile('|'.join(re.escape(word) for word in words), re.IGNORECASE)
+
+
+def _class_xpath(tags, words, first=False):
+    lowered = "translate(@class, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')"
+    tag_test = " or ".join(f"self::{tag}" for tag in tags)
+    class_test = " or ".join(f"contains({lowered}, '{word}')" for word in words)
+    path = f".//*[{tag_test}][{class_test}]"
+    return etree.XPath(f"({path})[1]" if first else path, smart_strings=False)
+
+
+# Precompiled selectors for the BeautifulSoup path
+_SOUP_CARD = _class_regex(_CARD_WORDS)
+_SOUP_BROAD_CARD = _class_regex(_BROAD_CARD_WORDS)
+_SOUP_TITLE = _class_regex(_TITLE_WORDS)
+_SOUP_COMPANY = _class_regex(_COMPANY_WORDS)
+_SOUP_DESCRIPTION = _class_regex(_DESCRIPTION_WORDS)
+_SOUP_SKILLS = _class_regex(_SKILLS_WORDS)
+_SOUP_FULL_DESCRIPTION = _class_regex(_FULL_DESCRIPTION_WORDS)
+# Only the job container is built into a tree; the rest of the page is skipped while parsing
+_CONTAINER_STRAINER = SoupStrainer('div', class_=_CONTAINER_CLASS)
+_DETAIL_STRAINER = SoupStrainer(['div', 'ul', 'p'])
+
+# Precompiled selectors for the lxml path
+if lxml_html is not None:
+    _XPATH_CONTAINER = etree.XPath(f"(//div[contains(concat(' ', normalize-space(@class), ' '), ' {_CONTAINER_CLASS} ')])[1]")
+    _XPATH_CARDS = _class_xpath(('div',), _CARD_WORDS)
+    _XPATH_BROAD_CARDS = _class_xpath(_BROAD_CARD_TAGS, _BROAD_CARD_WORDS)
+    _XPATH_TITLE = _class_xpath(_TITLE_TAGS, _TITLE_WORDS, first=True)
+    _XPATH_COMPANY = _class_xpath(_COMPANY_TAGS, _COMPANY_WORDS, first=True)
+    _XPATH_DESCRIPTION = _class_xpath(_DESCRIPTION_TAGS, _DESCRIPTION_WORDS, first=True)
+    _XPATH_SKILLS = _class_xpath(_SKILLS_TAGS, _SKILLS_WORDS, first=True)
+    _XPATH_FULL_DESCRIPTION = _class_xpath(('div',), _FULL_DESCRIPTION_WORDS, first=True)
+    _XPATH_LINK = etree.XPath("(.//a[@href])[1]")
+    # Text nodes as BeautifulSoup's get_text() sees them (no script/style contents)
+    _XPATH_TEXT = etree.XPath(".//text()[not(parent::script) and not(parent::style)]", smart_strings=False)
+
+if SCRAPER_PARSER == 'lxml' and lxml_html is None:
+    logger.warning("SCRAPER_PARSER is 'lxml' but lxml is not installed. Using html.parser.")
+
+
+def parse_listing(html, url):
+    """
+    Extracts the job cards of a listing page.
+
+    Returns:
+        list of dict: Job_Title, Company_Name, Job_Description, Required_Skills and Job_URL per card.
+    """
+    if SCRAPER_PARSER == 'lxml' and lxml_html is not None:
+        try:
+            return _parse_listing_lxml(html, url)
+        except (ValueError, etree.ParserError) as e:  # e.g. an empty page or an encoding declaration
+            logger.debug("lxml could not parse %s (%s), using html.parser.", url, e)
+    return _parse_listing_soup(html, url)
+
+
+def parse_detail(html):
+    """
+    Extracts the full description and skills from a job detail page.
+
+    Returns:
+        tuple: (description or None, skills or None).
+    """
+    if SCRAPER_PARSER == 'lxml' and lxml_html is not None:
+        try:
+            root = lxml_html.document_fromstring(html)
+            full_desc_tag = _first(_XPATH_FULL_DESCRIPTION(root))
+            full_skills_tag = _first(_XPATH_SKILLS(root))
+            return (
+                _lxml_text(full_desc_tag, ' ') if full_desc_tag is not None else None,
+                _lxml_text(full_skills_tag, ', ') if full_skills_tag is not None else None,
+            )
+        except (ValueError, etree.ParserError) as e:
+            logger.debug("lxml could not parse a detail page (%s), using html.parser.", e)
+
+    detail_soup = BeautifulSoup(html, 'html.parser', parse_only=_DETAIL_STRAINER)
+    # Find a common container for job details on the detail page
+    full_desc_tag = detail_soup.find('div', class_=_SOUP_FULL_DESCRIPTION)
+    # Also try to find more skills on the detail page
+    full_skills_tag = detail_soup.find(_SKILLS_TAGS, class_=_SOUP_SKILLS)
+    description = full_desc_tag.get_text(separator=' ', strip=True) if full_desc_tag else None
+    skills = full_skills_tag.get_text(separator=', ', strip=True) if full_skills_tag else None
+    return description, skills
+
+
+def _parse_listing_lxml(html, url):
+    root = lxml_html.document_fromstring(html)
+    job_listings_container = _first(_XPATH_CONTAINER(root))
+    if job_listings_container is None:
+        job_listings_container = root # Fallback to entire page if container not found
+        logger.warning("Job listings container not found, searching entire page. This might be less accurate.")
+
+    job_cards = _XPATH_CARDS(job_listings_container)
+    if not job_cards:
+        logger.warning("No specific job cards found. Trying broader search for common job elements.")
+        job_cards = _XPATH_BROAD_CARDS(root)
+    if not job_cards:
+        logger.warning("Still no job cards found. Scraping might not be possible with current selectors.")
+        return []
+
+    cards = []
+    for card in job_cards[:SCRAPER_MAX_CARDS]: # Limit the number of cards for rate limiting
+        title_tag = _first(_XPATH_TITLE(card))
+        company_tag = _first(_XPATH_COMPANY(card))
+        description_tag = _first(_XPATH_DESCRIPTION(card))
+        skills_tag = _first(_XPATH_SKILLS(card))
+        link_tag = _first(_XPATH_LINK(card))
+        cards.append(_card(
+            url,
+            _lxml_text(title_tag) if title_tag is not None else None,
+            _lxml_text(company_tag) if company_tag is not None else None,
+            _lxml_text(description_tag, ' ') if description_tag is not None else None,
+            _lxml_text(skills_tag, ', ') if skills_tag is not None else None,
+            link_tag.get('href') if link_tag is not None else None,
+        ))
+    return cards
+
+
+def _parse_listing_soup(html, url):
+    # Parse only the job container; the whole page is parsed when it is missing or has no cards
+    soup = BeautifulSoup(html, 'html.parser', parse_only=_CONTAINER_STRAINER)
+    job_listings_container = soup.find('div', class_=_CONTAINER_CLASS)
+    job_cards = job_listings_container.find_all('div', class_=_SOUP_CARD) if job_listings_container else []
+    if not job_cards:
+        soup = BeautifulSoup(html, 'html.parser')
+        if not job_listings_container:
+            logger.warning("Job listings container not found, searching entire page. This might be less accurate.")
+            job_cards = soup.find_all('div', class_=_SOUP_CARD)
+
+    if not job_cards:
+        logger.warning("No specific job cards found. Trying broader search for common job elements.")
+        job_cards = soup.find_all(_BROAD_CARD_TAGS, class_=_SOUP_BROAD_CARD)
+    if not job_cards:
+        logger.warning("Still no job cards found. Scraping might not be possible with current selectors.")
+        return []
+
+    cards = []
+    for card in job_cards[:SCRAPER_MAX_CARDS]: # Limit the number of cards for rate limiting
+        title_tag = card.find(_TITLE_TAGS, class_=_SOUP_TITLE)
+        company_tag = card.find(_COMPANY_TAGS, class_=_SOUP_COMPANY)
+        description_tag = card.find(_DESCRIPTION_TAGS, class_=_SOUP_DESCRIPTION)
+        skills_tag = card.find(_SKILLS_TAGS, class_=_SOUP_SKILLS)
+        link_tag = card.find('a', href=True)
+        cards.append(_card(
+            url,
+            title_tag.get_text(strip=True) if title_tag else None,
+            company_tag.get_text(strip=True) if company_tag else None,
+            description_tag.get_text(separator=' ', strip=True) if description_tag else None,
+            skills_tag.get_text(separator=', ', strip=True) if skills_tag else None,
+            link_tag['href'] if link_tag else None,
+        ))
+    return cards
+
+
+def _card(url, job_title, company_name, job_description, required_skills, href):
+    """
+    Builds one card dict, filling in the defaults for fields that were not found.
+    """
+    job_url = url # Default to base URL if no link found
+    if href is not None:
+        job_url = href
+        if not job_url.startswith('http'): # Make sure URL is absolute
+            job_url = urljoin(url, job_url) # Construct full URL
+    return {
+        "Job_Title": job_title if job_title is not None else 'N/A',
+        "Company_Name": company_name if company_name is not None else 'N/A',
+        "Job_Description": job_description if job_description is not None else 'No description available.',
+        "Required_Skills": required_skills if required_skills is not None else 'N/A',
+        "Job_URL": job_url,
+    }
+
+
+def _first(elements):
+    return elements[0] if elements else None
+
+
+def _lxml_text(element, separator=''):
+    """
+    Same as BeautifulSoup's get_text(separator, strip=True) for an lxml element.
+    """
+    return separator.join(text.strip() for text in _XPATH_TEXT(element) if text.strip())
+
+
+def stable_job_id(job_url):
+    """
+    Returns a Job_ID derived from the job URL that is the same in every process
+    (unlike the built-in `hash`, which is randomized per process).
+    """
+    url = urldefrag(job_url)[0].strip()
+    return f"topjobs_{hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]}"
+
+
+def _is_it_job(card):
+    # Filter for IT-related jobs (basic keyword check on title/description/skills)
+    combined_job_text_for_filter = (card["Job_Title"] + " " + card["Job_Description"] + " " + card["Required_Skills"]).lower()
+    return any(keyword in combined_job_text_for_filter for keyword in IT_KEYWORDS)
+
+
+def _to_job(card):
+    return {
+        "Job_ID": stable_job_id(card["Job_URL"]), # Stable unique ID based on URL
+        "Job_Title": card["Job_Title"],
+        "Company_Name": card["Company_Name"],
+        "Job_Description": card["Job_Description"],
+        "Required_Skills": card["Required_Skills"], # Include extracted skills
+        "Job_URL": card["Job_URL"],
+        "Source": "TopJobs.lk"
+    }
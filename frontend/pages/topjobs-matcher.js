@@ -11,6 +11,10 @@ import MatchingKeywords from '../components/MatchingKeywords';
 import { useRouter } from 'next/router';
 import '../lib/firebase'; // Ensure Firebase is initialized
 
+// While the backend reports a scrape in progress, ask again this often (up to the attempt limit)
+const SCRAPE_POLL_INTERVAL_MS = 3000;
+const SCRAPE_POLL_MAX_ATTEMPTS = 40;
+
 export default function TopJobsMatcher() {
   // Removed 'resumes' state as it's no longer directly used; 'selectedResumeFile' holds the file.
   const [message, setMessage] = useState('');
@@ -97,14 +101,28 @@ export default function TopJobsMatcher() {
     setMatchedResults({}); // Clear previous matches
 
     try {
-      const response = await axios.get('http://localhost:5000/api/scrape-topjobs');
-      if (response.data && response.data.jobs) {
+      // The backend answers straight away; while "refreshing" is true a scrape is still
+      // running in the background, so keep polling until it has finished.
+      for (let attempt = 1; ; attempt++) {
+        const response = await axios.get('http://localhost:5000/api/scrape-topjobs');
+        const jobs = response.data?.jobs || [];
         // Add a showKeywords property to each job for local UI state management
-        const jobsWithUIState = response.data.jobs.map(job => ({ ...job, showKeywords: false }));
-        setScrapedJobs(jobsWithUIState);
-        setMessage(`✅ Found ${response.data.jobs.length} jobs from TopJobs.lk.`);
-      } else {
-        setMessage('No jobs found or an error occurred during scraping.');
+        setScrapedJobs(jobs.map(job => ({ ...job, showKeywords: false })));
+
+        if (!response.data?.refreshing) {
+          setMessage(jobs.length > 0
+            ? `✅ Found ${jobs.length} jobs from TopJobs.lk.`
+            : 'No jobs found or an error occurred during scraping.');
+          break;
+        }
+        if (attempt >= SCRAPE_POLL_MAX_ATTEMPTS) {
+          setMessage('⏳ TopJobs.lk is still being scraped. Please try again in a few minutes.');
+          break;
+        }
+        setMessage(jobs.length > 0
+          ? `🔄 Showing ${jobs.length} jobs while TopJobs.lk is being refreshed...`
+          : '🔄 TopJobs.lk is being scraped. Jobs will appear here shortly...');
+        await new Promise(resolve => setTimeout(resolve, SCRAPE_POLL_INTERVAL_MS));
       }
     } catch (error) {
       console.error('Error scraping TopJobs:', error);
@@ -138,7 +156,7 @@ export default function TopJobsMatcher() {
       // Send extracted resume text and scraped jobs to the backend for matching
       const response = await axios.post('http://localhost:5000/api/get_all_matched_jobs', {
         resume_text: extractedResumeText,
-        jobList: scrapedJobs, // Pass the scraped jobs to the backend
+        scraped_job_ids: scrapedJobs.map(job => job.Job_ID), // Scraped jobs are stored by the backend
       });
 
       if (response.data && response.data.results) {